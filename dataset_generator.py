@@ -9,6 +9,8 @@ import requests
 from tqdm import tqdm
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from src.rate_limiter import get_limiter, estimate_request_tokens
+
 # Get API key from environment variable
 MISTRAL_API_KEY = os.environ.get("MISTRAL_API_KEY")
 if not MISTRAL_API_KEY:
@@ -18,6 +20,7 @@ if not MISTRAL_API_KEY:
 TOTAL_SAMPLES = 600
 SAMPLES_PER_CLASS = 200
 OUTPUT_FILE = "interview_qa_dataset.csv"
+MAX_WORKERS = int(os.environ.get("DATASET_MAX_WORKERS", "8"))
 
 # Define topics to cover in the interview questions
 TOPICS = [
@@ -32,7 +35,8 @@ TOPICS = [
 ]
 
 # Mistral API configuration
-MISTRAL_API_URL = "https://api.mistral.ai/v1/chat/completions"
+# Override to point dataset generation at an OpenAI-compatible stand-in (see src/standin_server.py)
+MISTRAL_API_URL = os.environ.get("MISTRAL_API_URL", "https://api.mistral.ai/v1/chat/completions")
 MODEL = "mistral-large-latest"
 
 def generate_prompt_for_question(topic):
@@ -141,19 +145,32 @@ def call_mistral_api(prompt, max_tokens=500):
     base_delay = 2  # Base delay in seconds
     max_delay = 60  # Maximum delay in seconds
     
+    # Requests and tokens are paced by the process-wide limiter shared with the app
+    limiter = get_limiter()
+    estimated_tokens = estimate_request_tokens(data["messages"], max_tokens)
+    
     for attempt in range(retries):
         try:
+            limiter.acquire(estimated_tokens)
             response = requests.post(MISTRAL_API_URL, headers=headers, json=data, timeout=30)
             
-            # Handle rate limiting (429) or server errors (5xx)
-            if response.status_code == 429 or (response.status_code >= 500 and response.status_code < 600):
+            # Rate limited: the limiter pauses every worker and slows down
+            if response.status_code == 429:
+                limiter.report_throttled(response.headers.get("Retry-After"))
+                print("Rate limited (status 429). Waiting for the rate limiter...")
+                continue
+            
+            # Handle server errors (5xx)
+            if response.status_code >= 500 and response.status_code < 600:
                 wait_time = min(base_delay * (2 ** attempt) + random.uniform(0, 1), max_delay)
-                print(f"Rate limited or server error (status {response.status_code}). Waiting {wait_time:.2f}s...")
+                print(f"Server error (status {response.status_code}). Waiting {wait_time:.2f}s...")
                 time.sleep(wait_time)
                 continue
                 
             response.raise_for_status()
-            content = response.json()["choices"][0]["message"]["content"].strip()
+            body = response.json()
+            limiter.record_usage(estimated_tokens, (body.get("usage") or {}).get("total_tokens"))
+            content = body["choices"][0]["message"]["content"].strip()
             return content
             
         except requests.exceptions.Timeout:
@@ -255,8 +272,9 @@ def main():
     checkpoint_interval = 25
     checkpoint_file = "dataset_checkpoint.csv"
     
-    # Use ThreadPoolExecutor to parallelize API calls with reduced concurrency
-    with ThreadPoolExecutor(max_workers=3) as executor:
+    # Use ThreadPoolExecutor to parallelize API calls; the shared rate limiter
+    # keeps the workers within the provider's request and token budgets
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
         futures = []
         
         # Submit jobs to the executor
@@ -285,9 +303,6 @@ def main():
             except Exception as e:
                 print(f"Error processing result: {str(e)}")
                 failed_attempts.append((topic, quality))
-                
-            # Add a small delay between processing results to reduce API pressure
-            time.sleep(0.2)
     
     # Write to CSV
     print(f"Writing {len(dataset)} samples to {OUTPUT_FILE}...")
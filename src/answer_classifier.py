@@ -0,0 +1,252 @@
+"""
+Local answer-quality classifier (fine-tuned DistilBERT).
+
+Rates an answer "excellent", "adequate" or "insufficient" on CPU in a
+fraction of the time a GenAI evaluation takes. The model is the checkpoint
+written by encoder_model/src/train_classifier.py; it is loaded on first use
+(or by preload() in the background) and shared by every session in the
+process. torch and transformers are optional: without them, or without a
+checkpoint, the classifier is simply unavailable and callers get None.
+
+Two backends run the same checkpoint: eager PyTorch in fp32, and an int8
+dynamically quantized ONNX export of it (see classifier_export.py) under
+onnxruntime, which is several times faster on CPU-only hosts. By default the
+ONNX model is used when it has been exported and onnxruntime is installed.
+
+predict() goes through a process-wide InferenceQueue, so answers submitted
+by concurrent sessions are classified together in micro-batches rather than
+as competing single-answer forward passes.
+"""
+import os
+import threading
+
+try:
+    from . import inference_queue
+except ImportError:
+    import inference_queue
+
+ENABLED = os.getenv("ANSWER_CLASSIFIER_ENABLED", "1") != "0"
+CHECKPOINT_PATH = os.getenv(
+    "ANSWER_CLASSIFIER_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "encoder_model", "src", "checkpoint")
+)
+# "onnx", "torch", or "auto" for ONNX when its model and runtime are both there
+BACKEND = os.getenv("ANSWER_CLASSIFIER_BACKEND", "auto")
+ONNX_MODEL_PATH = os.getenv("ANSWER_CLASSIFIER_ONNX_PATH", os.path.join(CHECKPOINT_PATH, "model.int8.onnx"))
+ONNX_THREADS = int(os.getenv("ANSWER_CLASSIFIER_ONNX_THREADS", "0"))  # 0 lets onnxruntime decide
+BATCHING_ENABLED = os.getenv("ANSWER_CLASSIFIER_BATCHING", "1") != "0"
+BATCH_SIZE = int(os.getenv("ANSWER_CLASSIFIER_BATCH_SIZE", "16"))
+BATCH_WAIT_MS = float(os.getenv("ANSWER_CLASSIFIER_BATCH_WAIT_MS", "10"))
+# The checkpoint was trained on DistilBERT's full context
+MAX_LENGTH = 512
+# train_classifier.py numbers the labels in sorted order
+DEFAULT_LABELS = ["adequate", "excellent", "insufficient"]
+
+_lock = threading.Lock()
+_classifier = None
+_load_error = None
+_preload_thread = None
+_queue = None
+
+
+def format_input(answer, question=None):
+    """The text the classifier was trained on: the question followed by the answer."""
+    return f"Question: {question or ''} Answer: {answer or ''}"
+
+
+def load_labels(checkpoint_path):
+    """Reads the label names, in index order, from a checkpoint's label_map.txt."""
+    path = os.path.join(checkpoint_path, "label_map.txt")
+    if not os.path.exists(path):
+        return list(DEFAULT_LABELS)
+    indexed = {}
+    with open(path, "r") as f:
+        for line in f:
+            if line.strip():
+                label, index = line.rstrip("\n").split("\t")
+                indexed[int(index)] = label
+    return [indexed[index] for index in sorted(indexed)]
+
+
+class TorchClassifier:
+    """The fine-tuned checkpoint run in eager PyTorch."""
+
+    def __init__(self, checkpoint_path=None):
+        import torch
+        from transformers import DistilBertTokenizer, DistilBertForSequenceClassification
+
+        checkpoint_path = checkpoint_path or CHECKPOINT_PATH
+        self._torch = torch
+        self.tokenizer = DistilBertTokenizer.from_pretrained(checkpoint_path)
+        self.model = DistilBertForSequenceClassification.from_pretrained(checkpoint_path)
+        self.model.eval()
+        self.labels = load_labels(checkpoint_path)
+
+    def predict(self, texts):
+        """Returns the label of each text, classifying them as one batch."""
+        if not texts:
+            return []
+        inputs = self.tokenizer(
+            list(texts), truncation=True, padding=True, max_length=MAX_LENGTH, return_tensors="pt"
+        )
+        with self._torch.no_grad():
+            logits = self.model(**inputs).logits
+        return [self.labels[index] for index in logits.argmax(dim=1).tolist()]
+
+
+class OnnxClassifier:
+    """The checkpoint's ONNX export (usually int8 quantized) run with onnxruntime."""
+
+    def __init__(self, model_path=None, checkpoint_path=None):
+        import onnxruntime
+        from transformers import DistilBertTokenizerFast
+
+        checkpoint_path = checkpoint_path or CHECKPOINT_PATH
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if ONNX_THREADS:
+            options.intra_op_num_threads = ONNX_THREADS
+        self.session = onnxruntime.InferenceSession(
+            model_path or ONNX_MODEL_PATH, options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = [model_input.name for model_input in self.session.get_inputs()]
+        self.tokenizer = DistilBertTokenizerFast.from_pretrained(checkpoint_path)
+        self.labels = load_labels(checkpoint_path)
+
+    def predict(self, texts):
+        """Returns the label of each text, classifying them as one batch."""
+        if not texts:
+            return []
+        encoded = self.tokenizer(
+            list(texts), truncation=True, padding=True, max_length=MAX_LENGTH, return_tensors="np"
+        )
+        inputs = {name: encoded[name].astype("int64") for name in self.input_names}
+        logits = self.session.run(None, inputs)[0]
+        return [self.labels[index] for index in logits.argmax(axis=1).tolist()]
+
+
+def _onnx_runtime_installed():
+    try:
+        import onnxruntime  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def load_classifier(backend=None):
+    """
+    Loads the checkpoint with the given backend ("onnx", "torch" or "auto", default BACKEND).
+
+    Raises:
+        ImportError, OSError: If the backend's dependencies or model files are missing.
+    """
+    backend = backend or BACKEND
+    if backend == "auto":
+        backend = "onnx" if os.path.exists(ONNX_MODEL_PATH) and _onnx_runtime_installed() else "torch"
+    if backend == "onnx":
+        return OnnxClassifier(ONNX_MODEL_PATH, CHECKPOINT_PATH)
+    if backend == "torch":
+        return TorchClassifier(CHECKPOINT_PATH)
+    raise ValueError(f"Unknown answer classifier backend: {backend}")
+
+
+def get_classifier(wait=True):
+    """
+    Returns the process-wide classifier, loading it on first use.
+
+    Args:
+        wait (bool): If False and the classifier is not loaded yet, start
+                     loading it in the background and return None at once.
+
+    Returns:
+        TorchClassifier or OnnxClassifier: The classifier, or None if it is disabled or could not be loaded.
+    """
+    global _classifier, _load_error
+    if not ENABLED:
+        return None
+    if _classifier is not None:
+        return _classifier
+    if not wait:
+        preload()
+        return None
+    with _lock:
+        if _classifier is None and _load_error is None:
+            try:
+                _classifier = load_classifier()
+            except Exception as e:
+                # Remembered so a missing dependency or checkpoint is not retried on every answer
+                _load_error = e
+                print(f"[AnswerClassifier] Warning: could not load the {BACKEND} classifier from {CHECKPOINT_PATH}: {e}")
+        return _classifier
+
+
+def preload():
+    """Starts loading the classifier in the background so the first answer does not wait for it."""
+    global _preload_thread
+    with _lock:
+        if not ENABLED or _classifier is not None or _load_error is not None or _preload_thread is not None:
+            return
+        _preload_thread = threading.Thread(target=get_classifier, name="answer-classifier-load", daemon=True)
+        _preload_thread.start()
+
+
+def _get_queue(classifier):
+    global _queue
+    with _lock:
+        if _queue is None:
+            _queue = inference_queue.InferenceQueue(
+                classifier.predict, BATCH_SIZE, BATCH_WAIT_MS / 1000, name="answer-classifier-batch"
+            )
+        return _queue
+
+
+def is_available():
+    """True if the classifier is loaded or can be loaded."""
+    return get_classifier() is not None
+
+
+def predict(texts, wait=True):
+    """
+    Classifies texts (see format_input).
+
+    With batching enabled the texts join the shared micro-batching queue and
+    may be classified together with other sessions' answers.
+
+    Args:
+        wait (bool): Whether to wait for the classifier if it is still loading.
+
+    Returns:
+        list: A label per text, or None if the classifier is unavailable or failed.
+    """
+    classifier = get_classifier(wait)
+    if classifier is None:
+        return None
+    try:
+        if BATCHING_ENABLED:
+            return _get_queue(classifier).predict(texts)
+        return classifier.predict(texts)
+    except Exception as e:
+        print(f"[AnswerClassifier] Error during classification: {e}")
+        return None
+
+
+def get_batching_stats():
+    """Returns the micro-batching queue's request and batch counts."""
+    with _lock:
+        batch_queue = _queue
+    if batch_queue is None:
+        return {"requests": 0, "batches": 0, "largest_batch": 0, "average_batch": 0.0}
+    return batch_queue.stats()
+
+
+def reset():
+    """Forgets the loaded classifier (and any load error) so the next use loads it again."""
+    global _classifier, _load_error, _preload_thread, _queue
+    with _lock:
+        batch_queue = _queue
+        _classifier = None
+        _load_error = None
+        _preload_thread = None
+        _queue = None
+    if batch_queue is not None:
+        batch_queue.close()
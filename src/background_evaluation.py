@@ -0,0 +1,104 @@
+"""
+Background evaluation of interview answers.
+
+Submitting an answer queues its evaluation on a shared thread pool and the
+candidate moves straight on to the next question, instead of waiting for an
+LLM round trip per answer. Feedback for earlier answers fills in as the
+evaluations finish; only the results page, which needs every score, waits,
+and then only for the evaluations still outstanding.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+try:
+    from . import evaluation_module
+except ImportError:
+    import evaluation_module
+
+ENABLED = os.getenv("BACKGROUND_EVALUATION_ENABLED", "1") != "0"
+MAX_WORKERS = int(os.getenv("BACKGROUND_EVALUATION_WORKERS", "4"))
+
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="background-evaluation")
+
+
+def _evaluate(question, response, config):
+    try:
+        return evaluation_module.evaluate_response(question, response, config)
+    except Exception as e:
+        print(f"Warning: background evaluation failed: {e}")
+        return dict(evaluation_module.CALL_FAILED_FEEDBACK)
+
+
+class BackgroundEvaluations:
+    """One interview's queued evaluations, by question index; keep one per session."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._futures = {}
+
+    def submit(self, index, question, response, config):
+        """
+        Queues the evaluation of the answer to question number index.
+
+        Returns:
+            concurrent.futures.Future: Resolves to the feedback dict.
+        """
+        future = _executor.submit(_evaluate, question, response, dict(config or {}))
+        with self._lock:
+            previous = self._futures.get(index)
+            self._futures[index] = future
+        if previous is not None:
+            previous.cancel()  # The answer was resubmitted
+        return future
+
+    def pending(self):
+        """Returns the indexes of the evaluations still running or queued, in order."""
+        with self._lock:
+            return sorted(index for index, future in self._futures.items() if not future.done())
+
+    def is_pending(self, index):
+        """True if the evaluation for question number index has not finished yet."""
+        with self._lock:
+            future = self._futures.get(index)
+        return future is not None and not future.done()
+
+    def collect(self, feedback):
+        """
+        Copies finished evaluations into feedback, a list indexed like the questions.
+
+        Returns:
+            int: Number of feedback entries filled in.
+        """
+        with self._lock:
+            finished = {index: future for index, future in self._futures.items() if future.done()}
+            for index in finished:
+                del self._futures[index]
+        filled = 0
+        for index, future in finished.items():
+            if future.cancelled():
+                continue
+            while len(feedback) <= index:
+                feedback.append(None)
+            feedback[index] = future.result()
+            filled += 1
+        return filled
+
+    def wait(self, timeout=None):
+        """
+        Waits for the outstanding evaluations.
+
+        Returns:
+            bool: True if none are left outstanding.
+        """
+        with self._lock:
+            futures = list(self._futures.values())
+        _, not_done = wait(futures, timeout=timeout)
+        return not not_done
+
+    def cancel(self):
+        """Drops evaluations that have not started yet."""
+        with self._lock:
+            futures, self._futures = list(self._futures.values()), {}
+        for future in futures:
+            future.cancel()
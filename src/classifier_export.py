@@ -0,0 +1,177 @@
+"""
+ONNX export and benchmark of the local answer classifier.
+
+Exports the fine-tuned DistilBERT checkpoint to ONNX and quantizes its
+weights to int8 (dynamic quantization: activations stay float and are
+quantized on the fly, so no calibration data is needed). answer_classifier
+then serves the quantized model with onnxruntime. The benchmark compares
+the PyTorch fp32 and ONNX int8 backends on single-answer latency, batched
+throughput and accuracy over a labelled test set.
+
+    python src/classifier_export.py export
+    python src/classifier_export.py benchmark --test-data encoder_model/src/test_data.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+try:
+    from . import answer_classifier
+except ImportError:
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    if current_dir not in sys.path:
+        sys.path.insert(0, current_dir)
+    import answer_classifier
+
+TEST_DATA_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "encoder_model", "src", "test_data.json"
+)
+BENCHMARK_BATCH_SIZE = 16
+ONNX_OPSET = 14
+
+
+def export_onnx(checkpoint_path=None, output_path=None, quantize=True):
+    """
+    Exports the checkpoint to ONNX, with dynamic batch and sequence axes.
+
+    Args:
+        checkpoint_path (str): Fine-tuned checkpoint directory (default answer_classifier.CHECKPOINT_PATH).
+        output_path (str): Where to write the model (default answer_classifier.ONNX_MODEL_PATH).
+        quantize (bool): Quantize the weights to int8; otherwise the fp32 export is kept.
+
+    Returns:
+        str: Path of the written model.
+    """
+    import torch
+    from transformers import DistilBertTokenizer, DistilBertForSequenceClassification
+
+    checkpoint_path = checkpoint_path or answer_classifier.CHECKPOINT_PATH
+    output_path = output_path or answer_classifier.ONNX_MODEL_PATH
+    tokenizer = DistilBertTokenizer.from_pretrained(checkpoint_path)
+    model = DistilBertForSequenceClassification.from_pretrained(checkpoint_path)
+    model.eval()
+
+    sample = tokenizer(
+        [answer_classifier.format_input("An example answer.", "An example question?")], return_tensors="pt"
+    )
+    fp32_path = output_path + ".fp32.onnx" if quantize else output_path
+    dynamic_axes = {"input_ids": {0: "batch", 1: "sequence"}, "attention_mask": {0: "batch", 1: "sequence"},
+                    "logits": {0: "batch"}}
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (sample["input_ids"], sample["attention_mask"]),
+            fp32_path,
+            input_names=["input_ids", "attention_mask"],
+            output_names=["logits"],
+            dynamic_axes=dynamic_axes,
+            opset_version=ONNX_OPSET,
+        )
+    if quantize:
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+
+        quantize_dynamic(fp32_path, output_path, weight_type=QuantType.QInt8)
+        os.remove(fp32_path)
+    return output_path
+
+
+def load_samples(path=TEST_DATA_PATH):
+    """Reads the labelled samples (question, answer, quality) the classifier is evaluated on."""
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def benchmark_classifier(classifier, samples, batch_size=BENCHMARK_BATCH_SIZE, latency_samples=50):
+    """
+    Measures one classifier on labelled samples.
+
+    Latency is one answer per predict call, as on submit; throughput and
+    accuracy come from classifying every sample in batches of batch_size.
+
+    Returns:
+        dict: p50_ms and p95_ms latency, throughput in answers per second, and accuracy.
+    """
+    texts = [answer_classifier.format_input(sample["answer"], sample["question"]) for sample in samples]
+    if not texts:
+        raise ValueError("No samples to benchmark")
+    classifier.predict(texts[:1])  # Warm-up; the first call pays for lazy initialisation
+
+    latencies = []
+    for text in texts[:latency_samples]:
+        start = time.perf_counter()
+        classifier.predict([text])
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+
+    predictions = []
+    start = time.perf_counter()
+    for begin in range(0, len(texts), batch_size):
+        predictions.extend(classifier.predict(texts[begin:begin + batch_size]))
+    elapsed = time.perf_counter() - start
+
+    correct = sum(1 for sample, label in zip(samples, predictions) if sample["quality"] == label)
+    return {
+        "p50_ms": latencies[len(latencies) // 2],
+        "p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        "throughput": len(texts) / elapsed if elapsed > 0 else float("inf"),
+        "accuracy": correct / len(samples),
+    }
+
+
+def benchmark(samples, backends=("torch", "onnx"), batch_size=BENCHMARK_BATCH_SIZE):
+    """
+    Benchmarks each backend that can be loaded.
+
+    Returns:
+        dict: Backend name -> benchmark_classifier results, or the error that stopped it loading.
+    """
+    results = {}
+    for backend in backends:
+        try:
+            classifier = answer_classifier.load_classifier(backend)
+        except Exception as e:
+            results[backend] = {"error": str(e)}
+            continue
+        results[backend] = benchmark_classifier(classifier, samples, batch_size)
+    return results
+
+
+def format_results(results):
+    """Formats benchmark results as a table, one backend per row."""
+    lines = [f"{'backend':<8} {'p50 ms':>8} {'p95 ms':>8} {'answers/s':>10} {'accuracy':>9}"]
+    for backend, result in results.items():
+        if "error" in result:
+            lines.append(f"{backend:<8} unavailable: {result['error']}")
+        else:
+            lines.append(f"{backend:<8} {result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} "
+                         f"{result['throughput']:>10.1f} {result['accuracy']:>9.3f}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export and benchmark the local answer classifier.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="Export the checkpoint to (quantized) ONNX")
+    export_parser.add_argument("--checkpoint", default=answer_classifier.CHECKPOINT_PATH, help="Fine-tuned checkpoint directory")
+    export_parser.add_argument("--output", default=answer_classifier.ONNX_MODEL_PATH, help="ONNX model to write")
+    export_parser.add_argument("--no-quantize", action="store_true", help="Keep fp32 weights")
+
+    benchmark_parser = subparsers.add_parser("benchmark", help="Compare PyTorch fp32 with ONNX int8")
+    benchmark_parser.add_argument("--test-data", default=TEST_DATA_PATH, help="Labelled samples in JSON")
+    benchmark_parser.add_argument("--batch-size", type=int, default=BENCHMARK_BATCH_SIZE, help="Batch size for throughput")
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        path = export_onnx(args.checkpoint, args.output, quantize=not args.no_quantize)
+        print(f"Wrote {path} ({os.path.getsize(path) / 1e6:.1f} MB)")
+        return path
+    results = benchmark(load_samples(args.test_data), batch_size=args.batch_size)
+    print(format_results(results))
+    return results
+
+
+if __name__ == '__main__':
+    main()
@@ -172,6 +172,51 @@ def get_user_interviews(user_id):
     
     return interviews
 
+def get_user_question_texts(user_id):
+    """Get the text of every question a user has been asked, oldest first."""
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    cursor.execute(
+        """
+        SELECT q.question_text
+        FROM questions q
+        JOIN interviews i ON q.interview_id = i.id
+        WHERE i.user_id = ?
+        ORDER BY q.id
+        """,
+        (user_id,)
+    )
+    questions = [row[0] for row in cursor.fetchall()]
+    conn.close()
+    
+    return questions
+
+def get_interview_config_counts(since=None):
+    """Count interviews per job role, difficulty and job description, most frequent first.
+
+    Args:
+        since (str): Only count interviews created at or after this ISO timestamp.
+    """
+    conn = sqlite3.connect(DB_PATH)
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+    
+    cursor.execute(
+        """
+        SELECT job_role, difficulty, job_description, COUNT(*) AS count, MAX(created_at) AS last_used
+        FROM interviews
+        WHERE job_role IS NOT NULL AND (? IS NULL OR created_at >= ?)
+        GROUP BY job_role, difficulty, job_description
+        ORDER BY count DESC, last_used DESC
+        """,
+        (since, since)
+    )
+    configs = [dict(row) for row in cursor.fetchall()]
+    conn.close()
+    
+    return configs
+
 def get_interview_details(interview_id):
     """Get complete details of an interview including questions, responses, and feedback."""
     conn = sqlite3.connect(DB_PATH)
@@ -216,5 +261,41 @@ def get_interview_details(interview_id):
         "feedback": feedback
     }
 
+def update_interview_feedback(interview_id, feedback, overall_score=None):
+    """Replace the stored feedback of an interview's answers, e.g. after re-scoring them.
+
+    Args:
+        feedback (list): Feedback per question, in question order; None leaves an answer's feedback as it is.
+        overall_score (float): New overall score, if given.
+    """
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    try:
+        cursor.execute(
+            "SELECT id FROM questions WHERE interview_id = ? ORDER BY order_num",
+            (interview_id,)
+        )
+        question_ids = [row[0] for row in cursor.fetchall()]
+        for question_id, item in zip(question_ids, feedback):
+            if item is not None:
+                cursor.execute(
+                    "UPDATE responses SET feedback = ? WHERE question_id = ?",
+                    (json.dumps(item), question_id)
+                )
+        if overall_score is not None:
+            cursor.execute(
+                "UPDATE interviews SET overall_score = ? WHERE id = ?",
+                (overall_score, interview_id)
+            )
+        conn.commit()
+        return True
+    except Exception as e:
+        conn.rollback()
+        print(f"Error updating interview feedback: {e}")
+        return False
+    finally:
+        conn.close()
+
 # Initialize the database when the module is imported
 init_db()
@@ -4,16 +4,21 @@ Module for evaluating interview responses.
 import json
 import os
 import sys
-# import torch
 
 # Fix imports to work whether the file is imported as a module or run directly
 try:
     # Try relative import (when imported as part of package)
-    from .genai_client import generate_text
+    from .genai_client import generate_text, stream_text
+    from .json_stream import IncrementalJSONParser
+    from .prompt_budget import compact_response, enforce_prompt_budget, share_budget, compact_text, RESPONSE_TOKENS
+    from . import llm_metrics
+    from .jd_analysis import summarize_job_description
+    from . import answer_classifier
 except ImportError:
     # Fallback to direct import (when run as script)
     import genai_client
     generate_text = genai_client.generate_text
+    stream_text = genai_client.stream_text
     # If that fails, try to import from the same directory
     if 'genai_client' not in sys.modules:
         # Add the parent directory to sys.path if needed
@@ -23,46 +28,141 @@ except ImportError:
         # Try again with direct import
         import genai_client
         generate_text = genai_client.generate_text
+        stream_text = genai_client.stream_text
+    from json_stream import IncrementalJSONParser
+    from prompt_budget import compact_response, enforce_prompt_budget, share_budget, compact_text, RESPONSE_TOKENS
+    import llm_metrics
+    from jd_analysis import summarize_job_description
+    import answer_classifier
 
-# # --- Encoder-based Classifier Integration ---
-# try:
-#     from transformers import DistilBertTokenizer, DistilBertForSequenceClassification
-#     MODEL_PATH = os.path.join(os.path.dirname(__file__), "encoder_finetune", "checkpoint")
-#     _tokenizer = DistilBertTokenizer.from_pretrained(MODEL_PATH)
-#     _model = DistilBertForSequenceClassification.from_pretrained(MODEL_PATH)
-#     _model.eval()
-#     _label_map = {0: "Needs Improvement", 1: "Adequate", 2: "Excellent"}
-# except Exception as e:
-#     _tokenizer = None
-#     _model = None
-#     _label_map = {0: "Needs Improvement", 1: "Adequate", 2: "Excellent"}
-#     print(f"[EncoderClassifier] Warning: Could not load model/tokenizer: {e}")
-
-# def classify_answer_quality(answer: str) -> str:
-#     """
-#     Classifies the quality of an interview answer using a fine-tuned DistilBERT model.
-
-#     Args:
-#         answer (str): The user's answer to classify.
-
-#     Returns:
-#         str: One of "Excellent", "Adequate", or "Needs Improvement".
-#     """
-#     if not answer or not isinstance(answer, str) or not answer.strip():
-#         return "Needs Improvement"
-#     if _model is None or _tokenizer is None:
-#         return "Adequate"  # fallback if model not loaded
-
-#     try:
-#         inputs = _tokenizer(answer, return_tensors="pt", truncation=True, padding=True, max_length=256)
-#         with torch.no_grad():
-#             outputs = _model(**inputs)
-#             logits = outputs.logits
-#             pred = torch.argmax(logits, dim=1).item()
-#         return _label_map.get(pred, "Adequate")
-#     except Exception as e:
-#         print(f"[EncoderClassifier] Error during classification: {e}")
-#         return "Adequate"
+# --- Encoder-based Classifier Integration ---
+# Score given to an answer from the local classifier's verdict when no GenAI
+# feedback is available, and the advice shown with it
+QUALITY_SCORES = {"excellent": 9, "adequate": 6, "insufficient": 3}
+QUALITY_ADVICE = {
+    "excellent": "Keep answers this complete and well structured.",
+    "adequate": "Add concrete examples, trade-offs and detail to make the answer stand out.",
+    "insufficient": "Answer the question directly and explain your reasoning with a concrete example.",
+}
+
+def _is_blank(answer):
+    """True for a missing, non-text or whitespace-only answer."""
+    return not answer or not isinstance(answer, str) or not answer.strip()
+
+def classify_answer_quality(answer, question=None, wait=True):
+    """
+    Classifies the quality of an interview answer using a fine-tuned DistilBERT model.
+
+    Runs locally on CPU and is much faster than a GenAI evaluation, so it can
+    be shown as soon as an answer is submitted.
+
+    Args:
+        answer (str): The user's answer to classify.
+        question (str): The question it answers; the classifier was trained on both.
+        wait (bool): Whether to wait for the model if it is still loading.
+
+    Returns:
+        str: One of "excellent", "adequate" or "insufficient", or None if the
+             classifier is unavailable. A blank answer is "insufficient" by rule,
+             without running the classifier.
+    """
+    if _is_blank(answer):
+        return "insufficient"
+    labels = answer_classifier.predict([answer_classifier.format_input(answer, question)], wait)
+    return labels[0] if labels else None
+
+def preload_classifier():
+    """Starts loading the answer classifier in the background."""
+    answer_classifier.preload()
+
+CALL_FAILED_FEEDBACK = {
+    "score": "N/A (GenAI call failed)",
+    "strengths": "Failed to get feedback from GenAI.",
+    "areas_for_improvement": "Failed to get feedback from GenAI.",
+    "sample_answer": "Failed to get feedback from GenAI."
+}
+
+PARSING_ERROR_FEEDBACK = {
+    "score": "N/A (GenAI parsing error)",
+    "strengths": "Could not parse GenAI feedback.",
+    "areas_for_improvement": "Could not parse GenAI feedback.",
+    "sample_answer": "Could not parse GenAI feedback."
+}
+
+# Blank answers are scored by rule, without GenAI or the classifier
+NO_ANSWER_FEEDBACK = {
+    "score": 1,
+    "quality": "insufficient",
+    "quality_source": "rule",
+    "strengths": "No answer was submitted, so it was rated 'insufficient' by rule rather than evaluated.",
+    "areas_for_improvement": QUALITY_ADVICE["insufficient"],
+    "sample_answer": "N/A (no answer submitted)"
+}
+
+# Most answers scored by one batched evaluation call; longer lists are split
+MAX_BATCH_SIZE = int(os.getenv("GENAI_EVALUATE_BATCH_SIZE", "10"))
+
+def _fallback_feedback(question, response, placeholder=CALL_FAILED_FEEDBACK):
+    """
+    Feedback for when GenAI gave none: the local classifier's verdict as the
+    score, or placeholder alone if the classifier is unavailable too. Blank
+    answers get NO_ANSWER_FEEDBACK without running the classifier.
+    """
+    if _is_blank(response):
+        return dict(NO_ANSWER_FEEDBACK)
+    feedback = dict(placeholder)
+    quality = classify_answer_quality(response, question)
+    if quality in QUALITY_SCORES:
+        feedback["score"] = QUALITY_SCORES[quality]
+        feedback["quality"] = quality
+        feedback["quality_source"] = "classifier"
+        feedback["strengths"] = f"Rated '{quality}' by the local answer classifier; detailed feedback could not be generated."
+        feedback["areas_for_improvement"] = QUALITY_ADVICE[quality]
+    return feedback
+
+def is_fallback_feedback(feedback):
+    """True if feedback stands in for a GenAI evaluation that failed (a classifier verdict or a placeholder)."""
+    return bool(feedback) and (
+        feedback.get("quality_source") == "classifier"
+        or feedback.get("score") in (CALL_FAILED_FEEDBACK["score"], PARSING_ERROR_FEEDBACK["score"])
+    )
+
+def _build_evaluation_messages(question, response, config):
+    """Builds the prompt messages used to evaluate a single response."""
+    prompt_system = "You are an expert interviewer providing feedback on a candidate's answer. " \
+                    "Evaluate the response based on clarity, relevance, completeness, and conciseness. " \
+                    "Provide specific strengths and areas for improvement. " \
+                    "Suggest a concise sample answer that would be considered strong for the given role. " \
+                    "Return your feedback strictly in JSON format with keys: " \
+                    "'score' (integer 1-10), 'strengths' (string), 'areas_for_improvement' (string), 'sample_answer' (string)."
+
+    # The job description goes in as its cached one-line analysis, not the pasted text
+    role_context = summarize_job_description(config.get('job_description'))
+    prompt_user = f"Interview Question: '{question}'\n" \
+                  f"Candidate's Role: {config.get('job_role', 'Not specified')}\n" \
+                  + (f"Role Requirements: {role_context}\n" if role_context else "") + \
+                  f"Candidate's Response: '{compact_response(response)}'\n\n" \
+                  f"Please provide your evaluation in the specified JSON format."
+
+    return enforce_prompt_budget([
+        {"role": "system", "content": prompt_system},
+        {"role": "user", "content": prompt_user}
+    ], "evaluate")
+
+def _complete_feedback(feedback):
+    """Ensures all expected keys are present, even if GenAI missed some."""
+    feedback.setdefault("score", "N/A (GenAI error)")
+    feedback.setdefault("strengths", "N/A (GenAI error)")
+    feedback.setdefault("areas_for_improvement", "N/A (GenAI error)")
+    feedback.setdefault("sample_answer", "N/A (GenAI error)")
+    return feedback
+
+def _is_json_object(text):
+    """Whether a response parses to a JSON object; only such responses are cached."""
+    try:
+        return isinstance(json.loads(text), dict)
+    except (TypeError, json.JSONDecodeError):
+        return False
 
 def parse_feedback_from_text(text_feedback):
     """
@@ -82,6 +182,8 @@ def evaluate_response(question, response, config):
     """
     Evaluates a user's response to an interview question using GenAI.
 
+    A blank response gets NO_ANSWER_FEEDBACK without calling GenAI.
+
     Args:
         question (str): The interview question asked.
         response (str): The user's response.
@@ -91,55 +193,198 @@ def evaluate_response(question, response, config):
         dict: A dictionary containing evaluation feedback, 
               e.g., {"score": 8, "strengths": "...", "areas_for_improvement": "...", "sample_answer": "..."}
     """
+    if _is_blank(response):
+        return dict(NO_ANSWER_FEEDBACK)
+
     print("\n--- Evaluating Response (GenAI) ---")
     print(f"Question: {question}")
     print(f"Your Response: {response[:100]}...") # Print a snippet
 
-    # --- GenAI Integration ---
-    prompt_system = "You are an expert interviewer providing feedback on a candidate's answer. " \
-                    "Evaluate the response based on clarity, relevance, completeness, and conciseness. " \
-                    "Provide specific strengths and areas for improvement. " \
-                    "Suggest a concise sample answer that would be considered strong for the given role. " \
-                    "Return your feedback strictly in JSON format with keys: " \
-                    "'score' (integer 1-10), 'strengths' (string), 'areas_for_improvement' (string), 'sample_answer' (string)."
-
-    prompt_user = f"Interview Question: '{question}'\n" \
-                  f"Candidate's Role: {config.get('job_role', 'Not specified')}\n" \
-                  f"Candidate's Response: '{response}'\n\n" \
-                  f"Please provide your evaluation in the specified JSON format."
-
-    prompt_messages = [
-        {"role": "system", "content": prompt_system},
-        {"role": "user", "content": prompt_user}
-    ]
+    prompt_messages = _build_evaluation_messages(question, response, config)
     
-    generated_feedback_text = generate_text(prompt_messages)
+    generated_feedback_text = generate_text(prompt_messages, call_site="evaluate", validate=_is_json_object)
     
     if generated_feedback_text:
         parsed_feedback = parse_feedback_from_text(generated_feedback_text)
         if parsed_feedback:
-            feedback = parsed_feedback
-            # Ensure all expected keys are present, even if GenAI missed some
-            feedback.setdefault("score", "N/A (GenAI error)")
-            feedback.setdefault("strengths", "N/A (GenAI error)")
-            feedback.setdefault("areas_for_improvement", "N/A (GenAI error)")
-            feedback.setdefault("sample_answer", "N/A (GenAI error)")
+            feedback = _complete_feedback(parsed_feedback)
         else:
             # Parsing failed, use placeholder
-            feedback = {
-                "score": "N/A (GenAI parsing error)",
-                "strengths": "Could not parse GenAI feedback.",
-                "areas_for_improvement": "Could not parse GenAI feedback.",
-                "sample_answer": "Could not parse GenAI feedback."
-            }
+            llm_metrics.record_parse_failure("evaluate")
+            feedback = _fallback_feedback(question, response, PARSING_ERROR_FEEDBACK)
     else:
-        # GenAI call failed, use placeholder
-        feedback = {
-            "score": "N/A (GenAI call failed)",
-            "strengths": "Failed to get feedback from GenAI.",
-            "areas_for_improvement": "Failed to get feedback from GenAI.",
-            "sample_answer": "Failed to get feedback from GenAI."
-        }
+        # GenAI call failed: score with the local classifier if it is available
+        feedback = _fallback_feedback(question, response)
+
+    print("Evaluation complete.")
+    return feedback
+
+def stream_evaluation(question, response, config):
+    """
+    Evaluates a user's response while streaming the feedback as it is generated.
+
+    Fields are yielded as soon as they are complete, so 'score' and 'strengths'
+    can be shown before the long 'sample_answer' has finished. A string field
+    that is still arriving is included with the text received so far.
+
+    Args:
+        question (str): The interview question asked.
+        response (str): The user's response.
+        config (dict): Interview configuration.
+
+    Yields:
+        dict: The feedback gathered so far. The last dictionary yielded is the
+              complete feedback, in the same shape evaluate_response returns.
+    """
+    if _is_blank(response):
+        yield dict(NO_ANSWER_FEEDBACK)
+        return
+
+    print("\n--- Evaluating Response (GenAI, streaming) ---")
+    print(f"Question: {question}")
+
+    prompt_messages = _build_evaluation_messages(question, response, config)
+    parser = IncrementalJSONParser()
+    feedback = {}
+    received_text = ""
+
+    for delta in stream_text(prompt_messages, call_site="evaluate", validate=_is_json_object):
+        received_text += delta
+        completed = parser.feed(delta)
+        feedback.update(completed)
+        snapshot = dict(feedback)
+        partial = parser.partial()
+        if partial:
+            snapshot[partial[0]] = partial[1]
+        if completed or partial:
+            yield snapshot
+
+    if not received_text:
+        final_feedback = _fallback_feedback(question, response)
+    elif feedback:
+        final_feedback = _complete_feedback(feedback)
+    else:
+        parsed_feedback = parse_feedback_from_text(received_text)
+        if parsed_feedback:
+            final_feedback = _complete_feedback(parsed_feedback)
+        else:
+            llm_metrics.record_parse_failure("evaluate")
+            final_feedback = _fallback_feedback(question, response, PARSING_ERROR_FEEDBACK)
+
+    print("Evaluation complete.")
+    yield final_feedback
+
+def _build_batch_evaluation_messages(items, config):
+    """Builds the prompt messages used to evaluate several (question, response) pairs at once."""
+    prompt_system = "You are an expert interviewer providing feedback on a candidate's answers. " \
+                    "Evaluate each response based on clarity, relevance, completeness, and conciseness. " \
+                    "Provide specific strengths and areas for improvement. " \
+                    "Suggest a concise sample answer that would be considered strong for the given role. " \
+                    "Return your feedback strictly as a JSON array with one object per answer, in the order given, " \
+                    "each with keys: 'index' (the answer number), 'score' (integer 1-10), 'strengths' (string), " \
+                    "'areas_for_improvement' (string), 'sample_answer' (string)."
+
+    role_context = summarize_job_description(config.get('job_description'))
+    prompt_user = f"Candidate's Role: {config.get('job_role', 'Not specified')}\n" \
+                  + (f"Role Requirements: {role_context}\n" if role_context else "") + "\n"
+    closing = "Please provide your evaluations in the specified JSON format."
+
+    # Answers share what is left of the budget after the instructions
+    per_answer_tokens = share_budget("evaluate_batch", prompt_system + prompt_user + closing, len(items))
+    for number, (question, response) in enumerate(items, start=1):
+        prompt_user += f"Answer {number}:\nInterview Question: '{question}'\n" \
+                       f"Candidate's Response: '{compact_response(response or '', min(per_answer_tokens, RESPONSE_TOKENS))}'\n\n"
+    prompt_user += closing
+
+    return enforce_prompt_budget([
+        {"role": "system", "content": prompt_system},
+        {"role": "user", "content": prompt_user}
+    ], "evaluate_batch")
+
+def parse_batch_feedback_from_text(text_feedback, count):
+    """
+    Parses a batched evaluation (expected JSON array) from GenAI.
+
+    Returns:
+        list: count entries, each a feedback dict or None where that answer's
+              feedback is missing or malformed; None if nothing could be parsed.
+    """
+    if not text_feedback:
+        return None
+    text = text_feedback.strip()
+    if text.startswith("```"):
+        # Tolerate a markdown code fence around the JSON
+        text = text.split("\n", 1)[-1].rsplit("```", 1)[0]
+    try:
+        items = json.loads(text)
+    except json.JSONDecodeError as e:
+        print(f"Error parsing batched feedback JSON from GenAI: {e}")
+        return None
+    if isinstance(items, dict):
+        items = next((value for value in items.values() if isinstance(value, list)), None)
+    if not isinstance(items, list):
+        return None
+
+    feedback = [None] * count
+    for position, item in enumerate(items):
+        if not isinstance(item, dict):
+            continue
+        index = item.pop("index", None)
+        try:
+            index = int(index) - 1 if index is not None else position
+        except (TypeError, ValueError):
+            index = position
+        if 0 <= index < count and feedback[index] is None:
+            feedback[index] = _complete_feedback(item)
+    return feedback
+
+def _batch_validator(count):
+    """Accepts a batched evaluation for caching only if every answer's feedback parsed."""
+    def validate(text):
+        feedback = parse_batch_feedback_from_text(text, count)
+        return feedback is not None and None not in feedback
+    return validate
+
+def evaluate_responses(questions, responses, config):
+    """
+    Evaluates several responses with one GenAI call per MAX_BATCH_SIZE answers.
+
+    Answers the batched call returned no usable feedback for are evaluated
+    one by one with evaluate_response.
+
+    Args:
+        questions (list): The interview questions asked.
+        responses (list): The user's responses, in the same order.
+        config (dict): Interview configuration.
+
+    Returns:
+        list: One feedback dict per question, in the shape evaluate_response
+              returns; None for questions without a response.
+    """
+    print(f"\n--- Evaluating {len(questions)} Responses (GenAI, batched) ---")
+    feedback = [None] * len(questions)
+    answered = [i for i, response in enumerate(responses[:len(questions)]) if not _is_blank(response)]
+
+    for start in range(0, len(answered), MAX_BATCH_SIZE):
+        batch = answered[start:start + MAX_BATCH_SIZE]
+        prompt_messages = _build_batch_evaluation_messages(
+            [(questions[i], responses[i]) for i in batch], config
+        )
+        generated_text = generate_text(
+            prompt_messages, call_site="evaluate_batch", validate=_batch_validator(len(batch))
+        )
+        if not generated_text:
+            # The client has already retried; evaluating one by one would only fail N more times
+            for i in batch:
+                feedback[i] = _fallback_feedback(questions[i], responses[i])
+            continue
+
+        batch_feedback = parse_batch_feedback_from_text(generated_text, len(batch))
+        if batch_feedback is None:
+            llm_metrics.record_parse_failure("evaluate_batch")
+            batch_feedback = [None] * len(batch)
+        for i, item in zip(batch, batch_feedback):
+            feedback[i] = item if item is not None else evaluate_response(questions[i], responses[i], config)
 
     print("Evaluation complete.")
     return feedback
@@ -194,14 +439,19 @@ def generate_overall_performance(questions, responses, feedback, interview_confi
         "'improvement_areas' (list of areas to work on), and 'preparation_tips' (specific tips for their next interview)."
     )
     
+    role_context = summarize_job_description(interview_config.get('job_description'))
     prompt_user = (
         f"Job Role: {interview_config.get('job_role')}\n"
+        + (f"Role Requirements: {role_context}\n" if role_context else "") +
         f"Interview Difficulty: {interview_config.get('difficulty')}\n"
         f"Average Score: {avg_score:.1f}/10\n\n"
         "Interview Questions and Responses:\n"
     )
     
-    # Add questions, responses, and feedback summaries to the prompt
+    # Add questions, responses, and feedback summaries to the prompt, sharing
+    # the remaining token budget between the answered questions
+    answered = sum(1 for r in responses if r)
+    per_answer_tokens = share_budget("overall", prompt_system + prompt_user, answered)
     for i, (q, r) in enumerate(zip(questions, responses)):
         if r:  # Only include questions that were answered
             fb_summary = ""
@@ -209,16 +459,18 @@ def generate_overall_performance(questions, responses, feedback, interview_confi
                 fb = feedback[i]
                 fb_summary = f"[Score: {fb.get('score', 'N/A')}/10, Strengths: {fb.get('strengths', 'N/A')}, Areas for improvement: {fb.get('areas_for_improvement', 'N/A')}]"
             
+            r = compact_response(r, per_answer_tokens * 2 // 3)
+            fb_summary = compact_text(fb_summary, per_answer_tokens // 3)
             prompt_user += f"Q{i+1}: {q}\nResponse: {r}\nFeedback: {fb_summary}\n\n"
     
     prompt_user += "Please provide an overall performance analysis in the specified JSON format."
     
-    prompt_messages = [
+    prompt_messages = enforce_prompt_budget([
         {"role": "system", "content": prompt_system},
         {"role": "user", "content": prompt_user}
-    ]
+    ], "overall")
     
-    generated_text = generate_text(prompt_messages)
+    generated_text = generate_text(prompt_messages, call_site="overall", validate=_is_json_object)
     
     try:
         # Try to parse as JSON
@@ -238,6 +490,7 @@ def generate_overall_performance(questions, responses, feedback, interview_confi
             }
     except json.JSONDecodeError:
         # If it's not valid JSON, create a dict with the raw text and placeholders
+        llm_metrics.record_parse_failure("overall")
         overall_analysis = {
             "overall_analysis": generated_text if generated_text else "Failed to generate analysis.",
             "key_strengths": ["Error parsing analysis output."],
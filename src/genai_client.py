@@ -1,71 +1,764 @@
 """
-Client for interacting with the Mistral AI API.
+Client for interacting with GenAI chat completion APIs.
+
+The API behind each call is chosen by llm_providers (Mistral by default);
+this module owns the pooled transport, caching, rate limiting and resilience
+shared by every provider.
 """
 import os
-import requests
 import json
+import time
+import asyncio
+import threading
+import weakref
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+try:
+    from . import llm_cache
+    from . import rate_limiter
+    from . import llm_providers
+    from . import llm_metrics
+    from .singleflight import SingleFlight
+    from .resilience import CircuitBreaker, LatencyTracker, hedged_call
+except ImportError:
+    import llm_cache
+    import rate_limiter
+    import llm_providers
+    import llm_metrics
+    from singleflight import SingleFlight
+    from resilience import CircuitBreaker, LatencyTracker, hedged_call
+
+# Connection pool and timeout settings for the shared HTTP client
+POOL_SIZE = int(os.getenv("GENAI_POOL_SIZE", "10"))
+CONNECT_TIMEOUT = float(os.getenv("GENAI_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT = float(os.getenv("GENAI_READ_TIMEOUT", "60"))
+KEEPALIVE_EXPIRY = float(os.getenv("GENAI_KEEPALIVE_EXPIRY", "30"))
+
+# How many times a request rejected with 429 is retried once the rate limiter allows it
+THROTTLE_RETRIES = int(os.getenv("GENAI_THROTTLE_RETRIES", "2"))
+
+# Hedging: a duplicate request is fired once a call has run longer than this
+# percentile of recent latencies (0 disables hedging)
+HEDGE_PERCENTILE = float(os.getenv("GENAI_HEDGE_PERCENTILE", "95"))
+# Threads for duplicate requests only; the primary runs on the caller's thread
+HEDGE_WORKERS = int(os.getenv("GENAI_HEDGE_WORKERS", "4"))
+HEDGE_MIN_SAMPLES = int(os.getenv("GENAI_HEDGE_MIN_SAMPLES", "20"))
+# Circuit breaker: consecutive failures before failing fast, and seconds before a retry
+BREAKER_FAILURES = int(os.getenv("GENAI_BREAKER_FAILURES", "5"))
+BREAKER_RESET_SECONDS = float(os.getenv("GENAI_BREAKER_RESET_SECONDS", "30"))
+
+# HTTP/2 needs the optional 'h2' package; fall back to HTTP/1.1 keep-alive without it
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_http_client = None
+_client_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_pool_stats = {"requests": 0, "new_connections": 0}
+
+# Identical requests issued concurrently (e.g. from several Streamlit sessions)
+# share a single upstream call
+_inflight = SingleFlight()
+
+# Latency windows and circuit breakers are kept per provider, so one failing
+# API does not trip calls routed to another
+_latencies = {}
+_breakers = {}
+_hedge_executor = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix="genai-hedge")
+_hedge_stats = {"hedged": 0, "hedge_wins": 0}
+
+
+def _build_http_client(pool_size, connect_timeout, read_timeout):
+    """Creates an httpx client with a bounded keep-alive connection pool."""
+    limits = httpx.Limits(
+        max_connections=pool_size,
+        max_keepalive_connections=pool_size,
+        keepalive_expiry=KEEPALIVE_EXPIRY,
+    )
+    transport = httpx.HTTPTransport(http2=HTTP2_AVAILABLE, limits=limits)
+    timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+    return httpx.Client(transport=transport, timeout=timeout)
 
-# Load the API key from environment variable
-MISTRAL_API_KEY = os.getenv("MISTRAL_API_KEY")
-API_URL = "https://api.mistral.ai/v1/chat/completions"
 
-def generate_text(prompt_messages, model="mistral-tiny"):
+def get_http_client():
     """
-    Generates text using the Mistral API.
+    Returns the process-wide pooled HTTP client, creating it on first use.
+
+    Returns:
+        httpx.Client: The shared client used for all GenAI calls.
+    """
+    global _http_client
+    if _http_client is None:
+        with _client_lock:
+            if _http_client is None:
+                _http_client = _build_http_client(POOL_SIZE, CONNECT_TIMEOUT, READ_TIMEOUT)
+    return _http_client
+
+
+def configure_http_client(pool_size=None, connect_timeout=None, read_timeout=None):
+    """
+    Rebuilds the shared HTTP client with new pool and timeout settings.
+
+    Args:
+        pool_size (int): Maximum number of pooled connections.
+        connect_timeout (float): Seconds to wait for a connection to be established.
+        read_timeout (float): Seconds to wait for response data.
+    """
+    global POOL_SIZE, CONNECT_TIMEOUT, READ_TIMEOUT, _http_client
+    with _client_lock:
+        if pool_size is not None:
+            POOL_SIZE = pool_size
+        if connect_timeout is not None:
+            CONNECT_TIMEOUT = connect_timeout
+        if read_timeout is not None:
+            READ_TIMEOUT = read_timeout
+        old_client = _http_client
+        _http_client = _build_http_client(POOL_SIZE, CONNECT_TIMEOUT, READ_TIMEOUT)
+    if old_client is not None:
+        old_client.close()
+
+
+def close_http_client():
+    """Closes the shared HTTP client and releases its pooled connections."""
+    global _http_client
+    with _client_lock:
+        old_client = _http_client
+        _http_client = None
+    if old_client is not None:
+        old_client.close()
+
+
+def _trace_connections(event_name, info):
+    """httpcore trace hook that counts newly opened connections."""
+    if event_name == "connection.connect_tcp.complete":
+        with _stats_lock:
+            _pool_stats["new_connections"] += 1
+
+
+async def _atrace_connections(event_name, info):
+    """Async variant of _trace_connections for httpx.AsyncClient requests."""
+    _trace_connections(event_name, info)
+
+
+def get_pool_stats():
+    """
+    Reports connection reuse for the shared HTTP client.
+
+    Returns:
+        dict: Request and connection counters plus the current pool occupancy.
+    """
+    with _stats_lock:
+        requests_sent = _pool_stats["requests"]
+        new_connections = _pool_stats["new_connections"]
+
+    open_connections = 0
+    idle_connections = 0
+    client = _http_client
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    if pool is not None:
+        connections = list(pool.connections)
+        open_connections = len(connections)
+        idle_connections = sum(1 for conn in connections if conn.is_idle())
+
+    reused = max(requests_sent - new_connections, 0)
+    return {
+        "requests": requests_sent,
+        "new_connections": new_connections,
+        "reused_connections": reused,
+        "reuse_ratio": reused / requests_sent if requests_sent else 0.0,
+        "open_connections": open_connections,
+        "idle_connections": idle_connections,
+        "pool_size": POOL_SIZE,
+        "http2": HTTP2_AVAILABLE,
+    }
+
+
+def reset_pool_stats():
+    """Resets the request and connection counters."""
+    with _stats_lock:
+        _pool_stats["requests"] = 0
+        _pool_stats["new_connections"] = 0
+
+
+def _report_http_error(provider, e):
+    """Prints diagnostics for a failed API call."""
+    if isinstance(e, httpx.TimeoutException):
+        print(f"Timed out calling {provider.label} API: {e!r}")
+        return
+    print(f"Error calling {provider.label} API: {e}")
+    if isinstance(e, httpx.HTTPStatusError):
+        try:
+            print(f"Response content: {e.response.json()}")
+        except json.JSONDecodeError:
+            print(f"Response content: {e.response.text}")
+
+
+def _extract_content(provider, data):
+    """Returns the generated text from a response body, or None."""
+    content = provider.extract_content(data)
+    if content is None:
+        print(f"Error: No choices found in {provider.label} API response.")
+        print("Response data:", data)
+    return content
+
+
+def _error_kind(e):
+    """Metrics label for a failed request."""
+    if isinstance(e, httpx.TimeoutException):
+        return "timeout"
+    if isinstance(e, httpx.HTTPStatusError):
+        return f"http_{e.response.status_code}"
+    if isinstance(e, httpx.HTTPError):
+        return "transport"
+    return "unexpected"
+
+
+def _check_configured(provider, call_site=None):
+    """Returns False (after reporting it) when the provider's API key is missing."""
+    if provider.is_configured():
+        return True
+    print(f"Error: {provider.api_key_env} environment variable not set.")
+    llm_metrics.record_error(call_site, "config")
+    return False
+
+
+def _limiter_for(provider):
+    """Returns the shared rate limiter for a provider, or None if it has no budget."""
+    if not provider.requests_per_minute:
+        return None
+    return rate_limiter.get_limiter(provider.name, provider.requests_per_minute, provider.tokens_per_minute)
+
+
+def _breaker_for(provider):
+    """Returns the circuit breaker guarding a provider, creating it on first use."""
+    with _stats_lock:
+        breaker = _breakers.get(provider.name)
+        if breaker is None:
+            breaker = _breakers[provider.name] = CircuitBreaker(BREAKER_FAILURES, BREAKER_RESET_SECONDS)
+    return breaker
+
+
+def _latency_for(provider):
+    """Returns the latency tracker for a provider, creating it on first use."""
+    with _stats_lock:
+        latency = _latencies.get(provider.name)
+        if latency is None:
+            latency = _latencies[provider.name] = LatencyTracker()
+    return latency
+
+
+def get_coalescing_stats():
+    """
+    Reports how many generate_text calls were coalesced into an in-flight request.
+
+    Returns:
+        dict: Executed upstream calls, coalesced calls and calls currently in flight.
+    """
+    return _inflight.stats()
+
+
+def _cache_key_for(provider, prompt_messages, model, call_site, params=None):
+    """Returns (cache key, ttl) for a request, or (None, 0) when it should not be cached."""
+    ttl = llm_cache.ttl_for(call_site)
+    if not llm_cache.ENABLED or ttl <= 0:
+        return None, 0
+    return llm_cache.make_key(model, prompt_messages, dict(params or {}, provider=provider.name)), ttl
+
+
+def _cache_get(cache_key):
+    """Reads from the response cache, treating cache failures as misses."""
+    if cache_key is None:
+        return None
+    try:
+        return llm_cache.get(cache_key)
+    except Exception as e:
+        print(f"Warning: GenAI response cache lookup failed: {e}")
+        return None
+
+
+def _cache_put(cache_key, text, ttl, call_site, validate=None):
+    """
+    Writes to the response cache, ignoring cache failures.
+
+    A response validate rejects (e.g. truncated or unparseable JSON) is not
+    cached, so the next identical request reaches the API again instead of
+    replaying the bad response until the entry expires.
+    """
+    if cache_key is None or text is None:
+        return
+    if validate is not None:
+        try:
+            valid = validate(text)
+        except Exception:
+            valid = False
+        if not valid:
+            return
+    try:
+        llm_cache.put(cache_key, text, ttl, call_site=call_site)
+    except Exception as e:
+        print(f"Warning: GenAI response cache write failed: {e}")
+
+
+def _finish_response(provider, data, call_site):
+    """Records a response's token usage and returns its generated text (None if empty)."""
+    llm_metrics.record_tokens(call_site, *provider.token_counts(data))
+    content = _extract_content(provider, data)
+    if content is None:
+        llm_metrics.record_error(call_site, "empty_response")
+    return content
+
+
+def _send_completion(provider, prompt_messages, model, call_site=None):
+    """Sends one completion request over the pooled client."""
+    if not _check_configured(provider, call_site):
+        return None
+
+    url, headers, payload = provider.build_request(prompt_messages, model)
+    limiter = _limiter_for(provider)
+    estimated_tokens = rate_limiter.estimate_request_tokens(prompt_messages)
+
+    try:
+        for attempt in range(THROTTLE_RETRIES + 1):
+            if limiter:
+                limiter.acquire(estimated_tokens)
+            with _stats_lock:
+                _pool_stats["requests"] += 1
+            response = get_http_client().post(
+                url, headers=headers, json=payload,
+                extensions={"trace": _trace_connections}
+            )
+            if response.status_code == 429:
+                llm_metrics.record_error(call_site, "throttled")
+                if limiter:
+                    limiter.report_throttled(response.headers.get("Retry-After"))
+                if attempt < THROTTLE_RETRIES:
+                    print(f"{provider.label} API rate limit hit (429); retrying when the limiter allows.")
+                    continue
+            response.raise_for_status()  # Raises an HTTPStatusError for bad responses (4XX or 5XX)
+            data = response.json()
+            if limiter:
+                limiter.record_usage(estimated_tokens, provider.usage_tokens(data))
+            return _finish_response(provider, data, call_site)
+    except httpx.HTTPError as e:
+        _report_http_error(provider, e)
+        llm_metrics.record_error(call_site, _error_kind(e))
+        return None
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
+        llm_metrics.record_error(call_site, _error_kind(e))
+        return None
+
+
+def _hedge_delay(provider):
+    """Seconds to wait before hedging, or None while hedging is off or latency data is thin."""
+    latency = _latency_for(provider)
+    if HEDGE_PERCENTILE <= 0 or latency.count() < HEDGE_MIN_SAMPLES:
+        return None
+    return latency.percentile(HEDGE_PERCENTILE)
+
+
+def _timed_send(provider, prompt_messages, model, call_site=None):
+    """Sends a completion request and records its latency when it succeeds."""
+    start = time.monotonic()
+    generated = _send_completion(provider, prompt_messages, model, call_site)
+    if generated is not None:
+        _latency_for(provider).record(time.monotonic() - start)
+    return generated
+
+
+def _protected_send(provider, prompt_messages, model, call_site=None):
+    """
+    Sends a completion request behind the provider's circuit breaker, hedging slow calls.
+
+    Returns None without calling the API while the circuit is open, so callers
+    drop straight to their fallbacks.
+    """
+    breaker = _breaker_for(provider)
+    if not breaker.allow_request():
+        print(f"Circuit breaker open: skipping {provider.label} API call.")
+        llm_metrics.record_error(call_site, "breaker_open")
+        return None
+
+    generated, hedged, hedge_won = hedged_call(
+        lambda: _timed_send(provider, prompt_messages, model, call_site), _hedge_executor, _hedge_delay(provider)
+    )
+    if hedged:
+        with _stats_lock:
+            _hedge_stats["hedged"] += 1
+            _hedge_stats["hedge_wins"] += int(hedge_won)
+
+    if generated is None:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+    return generated
+
+
+def get_resilience_stats(provider=None):
+    """
+    Reports hedging activity, circuit breaker state and recent latency percentiles.
+
+    Args:
+        provider (str or LLMProvider): Provider whose breaker and latencies to
+                                       report; defaults to the default provider.
+
+    Returns:
+        dict: Hedge counters, breaker state and p50/p95/p99 latency in seconds.
+    """
+    provider, _ = llm_providers.resolve_route(provider=provider)
+    with _stats_lock:
+        stats = dict(_hedge_stats)
+    latency = _latency_for(provider)
+    stats["provider"] = provider.name
+    stats["breaker"] = _breaker_for(provider).stats()
+    stats["latency_samples"] = latency.count()
+    for pct in (50, 95, 99):
+        stats[f"latency_p{pct}"] = latency.percentile(pct)
+    return stats
+
+
+def generate_text(prompt_messages, model=None, call_site=None, provider=None, validate=None):
+    """
+    Generates text using the provider routed for the call site.
+
+    Identical requests are answered from the persistent response cache while
+    the entry is fresh; see llm_cache for the per-call-site TTLs. Identical
+    requests (same provider, model and messages, with or without a call site)
+    that arrive while one is already in flight wait for it and share its
+    result instead of calling the API again.
+    Calls slower than the recent latency percentile are hedged with a
+    duplicate request, and after repeated failures the circuit breaker makes
+    calls return None immediately until the API recovers.
 
     Args:
         prompt_messages (list): A list of message objects (e.g., [{"role": "user", "content": "Hello"}]).
-        model (str): The Mistral model to use (e.g., "mistral-tiny", "mistral-small").
+        model (str): The model to use (e.g., "mistral-tiny", "mistral-small"); defaults to the route's model.
+        call_site (str): Label of the caller (e.g., "question_gen", "evaluate"), used to pick the
+                         provider route and the cache TTL.
+        provider (str or LLMProvider): Provider to use instead of the call site's route.
+        validate (callable): Returns whether a response is usable (e.g. parses); only
+                             responses it accepts are cached.
 
     Returns:
         str: The generated text content from the API response, or None if an error occurs.
     """
-    if not MISTRAL_API_KEY:
-        print("Error: MISTRAL_API_KEY environment variable not set.")
-        return None
+    start = time.monotonic()
+    provider, model = llm_providers.resolve_route(call_site, provider, model)
+    cache_key, ttl = _cache_key_for(provider, prompt_messages, model, call_site)
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        llm_metrics.record_call(call_site, provider.name, time.monotonic() - start, "cached")
+        return cached
 
-    headers = {
-        "Authorization": f"Bearer {MISTRAL_API_KEY}",
-        "Content-Type": "application/json",
-        "Accept": "application/json",
-    }
-    payload = {
-        "model": model,
-        "messages": prompt_messages
-    }
+    def _generate():
+        result = _protected_send(provider, prompt_messages, model, call_site)
+        _cache_put(cache_key, result, ttl, call_site, validate)
+        return result
+
+    flight_key = cache_key or llm_cache.make_key(model, prompt_messages, {"provider": provider.name})
+    generated = _inflight.do(flight_key, _generate)
+
+    outcome = "error" if generated is None else "ok"
+    llm_metrics.record_call(call_site, provider.name, time.monotonic() - start, outcome)
+    return generated
+
+
+def _stream_completion(provider, prompt_messages, model, received, call_site=None):
+    """
+    Streams one completion request, yielding text deltas.
+
+    Each delta is also appended to received so the caller can assemble the
+    full text.
+
+    Returns:
+        bool: True once the stream has completed without errors.
+    """
+    if not _check_configured(provider, call_site):
+        return False
+
+    url, headers, payload = provider.build_request(prompt_messages, model, stream=True)
+    limiter = _limiter_for(provider)
+    estimated_tokens = rate_limiter.estimate_request_tokens(prompt_messages)
 
     try:
-        response = requests.post(API_URL, headers=headers, json=payload)
-        response.raise_for_status()  # Raises an HTTPError for bad responses (4XX or 5XX)
-        data = response.json()
-        if data.get('choices') and len(data['choices']) > 0:
-            return data['choices'][0]['message']['content']
+        if limiter:
+            limiter.acquire(estimated_tokens)
+        with _stats_lock:
+            _pool_stats["requests"] += 1
+        with get_http_client().stream(
+            "POST", url, headers=headers, json=payload,
+            extensions={"trace": _trace_connections}
+        ) as response:
+            if response.status_code == 429:
+                llm_metrics.record_error(call_site, "throttled")
+                if limiter:
+                    limiter.report_throttled(response.headers.get("Retry-After"))
+            if response.is_error:
+                response.read()  # Load the error body so it can be reported
+            response.raise_for_status()
+            usage_event = {}
+            for line in response.iter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                event = json.loads(data)
+                if provider.usage_tokens(event) is not None:
+                    usage_event = event  # Usage, when reported, arrives with the final chunk
+                delta = provider.extract_delta(event)
+                if delta:
+                    received.append(delta)
+                    yield delta
+        if limiter:
+            limiter.record_usage(estimated_tokens, provider.usage_tokens(usage_event))
+        llm_metrics.record_tokens(call_site, *provider.token_counts(usage_event))
+        return True
+    except httpx.HTTPError as e:
+        _report_http_error(provider, e)
+        llm_metrics.record_error(call_site, _error_kind(e))
+    except json.JSONDecodeError as e:
+        print(f"Error decoding {provider.label} stream chunk: {e}")
+        llm_metrics.record_error(call_site, "stream_decode")
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
+        llm_metrics.record_error(call_site, _error_kind(e))
+    return False
+
+
+def stream_text(prompt_messages, model=None, call_site=None, provider=None, validate=None):
+    """
+    Streams generated text from the routed provider as server-sent events.
+
+    A cached response is yielded as a single delta; a freshly streamed one is
+    cached once the stream completes, if validate accepts it.
+
+    Args:
+        prompt_messages (list): A list of message objects.
+        model (str): The model to use; defaults to the route's model.
+        call_site (str): Label of the caller, used to pick the provider route and the cache TTL.
+        provider (str or LLMProvider): Provider to use instead of the call site's route.
+        validate (callable): Returns whether the full response is usable; only those are cached.
+
+    Yields:
+        str: Text deltas in the order they are produced. Nothing further is
+             yielded once an error occurs.
+    """
+    start = time.monotonic()
+    provider, model = llm_providers.resolve_route(call_site, provider, model)
+    cache_key, ttl = _cache_key_for(provider, prompt_messages, model, call_site)
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        llm_metrics.record_call(call_site, provider.name, time.monotonic() - start, "cached")
+        yield cached
+        return
+
+    breaker = _breaker_for(provider)
+    if not breaker.allow_request():
+        print(f"Circuit breaker open: skipping {provider.label} API call.")
+        llm_metrics.record_error(call_site, "breaker_open")
+        llm_metrics.record_call(call_site, provider.name, time.monotonic() - start, "error")
+        return
+
+    received = []
+    completed = False
+    try:
+        completed = yield from _stream_completion(provider, prompt_messages, model, received, call_site)
+    finally:
+        # A stream the consumer closed early still counts as a working API
+        if completed or received:
+            breaker.record_success()
         else:
-            print("Error: No choices found in Mistral API response.")
-            print("Response data:", data)
-            return None
-    except requests.exceptions.RequestException as e:
-        print(f"Error calling Mistral API: {e}")
-        if hasattr(e, 'response') and e.response is not None:
-            try:
-                print(f"Response content: {e.response.json()}")
-            except json.JSONDecodeError:
-                print(f"Response content: {e.response.text}")
+            breaker.record_failure()
+        outcome = "ok" if completed or received else "error"
+        llm_metrics.record_call(call_site, provider.name, time.monotonic() - start, outcome)
+    if completed and received:
+        _cache_put(cache_key, "".join(received), ttl, call_site, validate)
+
+
+# --- Async client ---
+# httpx.AsyncClient and asyncio.Semaphore are bound to the event loop that first
+# uses them, so the shared instances are kept per loop.
+MAX_CONCURRENCY = int(os.getenv("GENAI_MAX_CONCURRENCY", "8"))
+
+_async_state = weakref.WeakKeyDictionary()
+
+
+def _get_async_state():
+    """Returns the (client, semaphore) pair for the running event loop."""
+    loop = asyncio.get_running_loop()
+    state = _async_state.get(loop)
+    if state is None:
+        limits = httpx.Limits(
+            max_connections=POOL_SIZE,
+            max_keepalive_connections=POOL_SIZE,
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        )
+        client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=limits,
+            timeout=httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT),
+        )
+        state = (client, asyncio.Semaphore(MAX_CONCURRENCY))
+        _async_state[loop] = state
+    return state
+
+
+def get_async_http_client():
+    """
+    Returns the shared async HTTP client for the running event loop.
+
+    Returns:
+        httpx.AsyncClient: The pooled client used by agenerate_text.
+    """
+    return _get_async_state()[0]
+
+
+def get_concurrency_semaphore():
+    """
+    Returns the global concurrency limit for the running event loop.
+
+    Returns:
+        asyncio.Semaphore: Semaphore allowing MAX_CONCURRENCY requests in flight.
+    """
+    return _get_async_state()[1]
+
+
+async def aclose_http_client():
+    """Closes the async HTTP client bound to the running event loop."""
+    state = _async_state.pop(asyncio.get_running_loop(), None)
+    if state is not None:
+        await state[0].aclose()
+
+
+async def _asend_completion(provider, prompt_messages, model, client, semaphore, call_site=None):
+    """Sends one completion request over an async client."""
+    if not _check_configured(provider, call_site):
+        return None
+
+    client = client or get_async_http_client()
+    semaphore = semaphore or get_concurrency_semaphore()
+    url, headers, payload = provider.build_request(prompt_messages, model)
+    limiter = _limiter_for(provider)
+    estimated_tokens = rate_limiter.estimate_request_tokens(prompt_messages)
+
+    try:
+        for attempt in range(THROTTLE_RETRIES + 1):
+            if limiter:
+                await limiter.aacquire(estimated_tokens)
+            async with semaphore:
+                with _stats_lock:
+                    _pool_stats["requests"] += 1
+                response = await client.post(
+                    url, headers=headers, json=payload,
+                    extensions={"trace": _atrace_connections}
+                )
+            if response.status_code == 429:
+                llm_metrics.record_error(call_site, "throttled")
+                if limiter:
+                    limiter.report_throttled(response.headers.get("Retry-After"))
+                if attempt < THROTTLE_RETRIES:
+                    continue
+            response.raise_for_status()
+            data = response.json()
+            if limiter:
+                limiter.record_usage(estimated_tokens, provider.usage_tokens(data))
+            return _finish_response(provider, data, call_site)
+    except httpx.HTTPError as e:
+        _report_http_error(provider, e)
+        llm_metrics.record_error(call_site, _error_kind(e))
         return None
     except Exception as e:
         print(f"An unexpected error occurred: {e}")
+        llm_metrics.record_error(call_site, _error_kind(e))
+        return None
+
+
+async def agenerate_text(prompt_messages, model=None, client=None, semaphore=None, call_site=None, provider=None,
+                         validate=None):
+    """
+    Asynchronously generates text using the provider routed for the call site.
+
+    Args:
+        prompt_messages (list): A list of message objects.
+        model (str): The model to use; defaults to the route's model.
+        client (httpx.AsyncClient): Client to send the request with; defaults to the shared one.
+        semaphore (asyncio.Semaphore): Concurrency limit to respect; defaults to the global one.
+        call_site (str): Label of the caller, used to pick the provider route and the cache TTL.
+        provider (str or LLMProvider): Provider to use instead of the call site's route.
+        validate (callable): Returns whether a response is usable; only those are cached.
+
+    Returns:
+        str: The generated text content from the API response, or None if an error occurs.
+    """
+    start = time.monotonic()
+    provider, model = llm_providers.resolve_route(call_site, provider, model)
+    cache_key, ttl = _cache_key_for(provider, prompt_messages, model, call_site)
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        llm_metrics.record_call(call_site, provider.name, time.monotonic() - start, "cached")
+        return cached
+
+    breaker = _breaker_for(provider)
+    if not breaker.allow_request():
+        print(f"Circuit breaker open: skipping {provider.label} API call.")
+        llm_metrics.record_error(call_site, "breaker_open")
+        llm_metrics.record_call(call_site, provider.name, time.monotonic() - start, "error")
         return None
 
+    generated = None
+    try:
+        generated = await _asend_completion(provider, prompt_messages, model, client, semaphore, call_site)
+    finally:
+        # A cancelled task must still settle the breaker, or a half-open trial never ends
+        if generated is None:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+    _cache_put(cache_key, generated, ttl, call_site, validate)
+    llm_metrics.record_call(call_site, provider.name, time.monotonic() - start,
+                            "error" if generated is None else "ok")
+    return generated
+
+
+async def agenerate_many(list_of_messages, model=None, client=None, semaphore=None, call_site=None, provider=None,
+                         validate=None):
+    """
+    Fans out several generation requests concurrently.
+
+    Args:
+        list_of_messages (list): One prompt message list per request.
+        model (str): The model to use for every request; defaults to the route's model.
+        client (httpx.AsyncClient): Optional shared client.
+        semaphore (asyncio.Semaphore): Optional concurrency limit.
+        call_site (str): Label of the caller, used to pick the provider route and the cache TTL.
+        provider (str or LLMProvider): Provider to use instead of the call site's route.
+        validate (callable): Returns whether a response is usable; only those are cached.
+
+    Returns:
+        list: Generated texts (or None for failed calls) in the same order as the input.
+    """
+    tasks = [
+        agenerate_text(messages, model=model, client=client, semaphore=semaphore,
+                       call_site=call_site, provider=provider, validate=validate)
+        for messages in list_of_messages
+    ]
+    return list(await asyncio.gather(*tasks))
+
 if __name__ == '__main__':
     # Example usage:
-    if MISTRAL_API_KEY:
-        print("Testing GenAI Client...")
+    default_provider = llm_providers.get_provider()
+    if default_provider.is_configured():
+        print(f"Testing GenAI Client against {default_provider.label}...")
         test_prompt = [{"role": "user", "content": "What is the capital of France?"}]
         generated_content = generate_text(test_prompt)
         if generated_content:
-            print("Mistral's Response:")
+            print(f"{default_provider.label}'s Response:")
             print(generated_content)
+            print("Pool stats:", get_pool_stats())
         else:
-            print("Failed to get a response from Mistral.")
+            print(f"Failed to get a response from {default_provider.label}.")
     else:
-        print("MISTRAL_API_KEY not set. Cannot run example.")
+        print(f"{default_provider.api_key_env} not set. Cannot run example.")
@@ -0,0 +1,129 @@
+"""
+Micro-batching queue for model inference.
+
+Concurrent Streamlit sessions each classify one answer at a time; run as
+separate forward passes they compete for the same CPU cores. The queue
+collects requests from every session on one worker thread and runs them as
+micro-batches: a batch closes when it reaches max_batch_size or when
+max_wait seconds have passed since its first request, so a lone request is
+delayed by at most max_wait. Each caller gets a future for its own result.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+_STOP = object()
+
+
+class InferenceQueue:
+    """Batches calls to predict_fn, which maps a list of inputs to a list of results."""
+
+    def __init__(self, predict_fn, max_batch_size=16, max_wait=0.01, name="inference-queue"):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait
+        self.name = name
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._closed = False
+        self._stats = {"requests": 0, "batches": 0, "largest_batch": 0}
+
+    def submit(self, item):
+        """
+        Queues one input.
+
+        Returns:
+            concurrent.futures.Future: Resolves to predict_fn's result for the input,
+                                       or raises whatever predict_fn raised for its batch.
+        """
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(f"{self.name} is closed")
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            self._queue.put((item, future))
+        return future
+
+    def submit_many(self, items):
+        """Queues several inputs; returns their futures in order."""
+        return [self.submit(item) for item in items]
+
+    def predict(self, items, timeout=None):
+        """Queues inputs and waits for their results, in order."""
+        return [future.result(timeout) for future in self.submit_many(items)]
+
+    def _next_batch(self):
+        """Blocks for a first request, then gathers more until the batch is full or the wait is over."""
+        first = self._queue.get()
+        if first is _STOP:
+            return None, True
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                # Past the deadline, requests already waiting still join without delaying the batch
+                request = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is _STOP:
+                return batch, True
+            batch.append(request)
+        return batch, False
+
+    def _run_batch(self, batch):
+        # Requests whose callers cancelled them while queued are dropped
+        batch = [(item, future) for item, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        with self._lock:
+            self._stats["requests"] += len(batch)
+            self._stats["batches"] += 1
+            self._stats["largest_batch"] = max(self._stats["largest_batch"], len(batch))
+        try:
+            results = self.predict_fn([item for item, _ in batch])
+            if results is None or len(results) != len(batch):
+                raise RuntimeError(f"{self.name}: expected {len(batch)} results, got {results!r}")
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch, stopping = self._next_batch()
+            if batch:
+                self._run_batch(batch)
+        # Anything queued after close() will never run
+        while True:
+            try:
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is not _STOP and request[1].set_running_or_notify_cancel():
+                request[1].set_exception(RuntimeError(f"{self.name} is closed"))
+
+    def stats(self):
+        """Requests served, batches run, and the average and largest batch size."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["average_batch"] = stats["requests"] / stats["batches"] if stats["batches"] else 0.0
+        return stats
+
+    def close(self, timeout=None):
+        """Finishes the batches already queued and stops the worker thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join(timeout)
@@ -0,0 +1,243 @@
+"""
+Job description analysis: skills, seniority and interview topics.
+
+A pasted job description is reduced once to a small structured analysis,
+cached by a hash of its normalized text. Prompts then carry a one-line
+summary of it instead of the description itself, so a long description
+costs almost nothing in each of an interview's evaluation calls.
+
+Topics map onto the TOPICS taxonomy of dataset_generator.py, the same one
+the local question dataset was generated from.
+"""
+import re
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
+
+try:
+    from .prompt_budget import extract_key_sentences
+except ImportError:
+    from prompt_budget import extract_key_sentences
+
+MAX_ENTRIES = 256
+MAX_SKILLS = 8
+MAX_TOPICS = 5
+# Budget for the description's most informative sentences, kept for question generation
+HIGHLIGHT_TOKENS = 60
+
+# Canonical skill name -> patterns that mention it
+SKILLS = {
+    "Python": r"python", "Java": r"java(?!script)", "JavaScript": r"javascript|js", "TypeScript": r"typescript",
+    "Go": r"golang", "Rust": r"rust", "C++": r"c\+\+", "C#": r"c#|\.net", "Kotlin": r"kotlin", "Swift": r"swift",
+    "Ruby": r"ruby|rails", "PHP": r"php", "Scala": r"scala", "SQL": r"sql", "PostgreSQL": r"postgres(?:ql)?",
+    "MySQL": r"mysql", "MongoDB": r"mongo(?:db)?", "Redis": r"redis", "Kafka": r"kafka", "Spark": r"spark",
+    "AWS": r"aws|amazon web services", "Azure": r"azure", "GCP": r"gcp|google cloud", "Docker": r"docker",
+    "Kubernetes": r"kubernetes|k8s", "Terraform": r"terraform", "React": r"react(?:\.js|js)?", "Angular": r"angular",
+    "Vue": r"vue(?:\.js)?", "Node.js": r"node(?:\.js|js)", "Django": r"django", "Flask": r"flask",
+    "Spring": r"spring(?: boot)?", "GraphQL": r"graphql", "REST": r"rest(?:ful)?(?= api| services)",
+    "gRPC": r"grpc", "Linux": r"linux", "Git": r"git", "Jenkins": r"jenkins", "PyTorch": r"pytorch",
+    "TensorFlow": r"tensorflow", "scikit-learn": r"scikit-learn|sklearn", "Pandas": r"pandas",
+}
+_SKILL_PATTERNS = {name: re.compile(rf"(?<![\w+#.])(?:{pattern})(?![\w+#])", re.IGNORECASE)
+                   for name, pattern in SKILLS.items()}
+
+# Keep the keys in sync with TOPICS in dataset_generator.py
+TOPIC_KEYWORDS = {
+    "Data Structures": ["data structure", "hash map", "linked list", "tree", "graph"],
+    "Algorithms": ["algorithm", "complexity", "sorting", "leetcode"],
+    "Object-Oriented Programming": ["object-oriented", "object oriented", "oop", "java", "c#"],
+    "System Design": ["system design", "distributed", "scalab", "architecture", "high availability"],
+    "Databases": ["database", "sql", "postgres", "mysql", "mongo", "redis", "nosql", "data model"],
+    "Operating Systems": ["operating system", "linux", "kernel", "unix"],
+    "Networking": ["network", "tcp", "http", "dns", "load balanc"],
+    "Web Development": ["web", "html", "css", "browser"],
+    "Front-end Frameworks": ["front-end", "frontend", "react", "angular", "vue"],
+    "Back-end Development": ["back-end", "backend", "server-side", "node", "django", "flask", "spring"],
+    "Cloud Computing": ["cloud", "aws", "azure", "gcp", "serverless"],
+    "DevOps": ["devops", "docker", "kubernetes", "terraform", "infrastructure", "observability", "monitoring"],
+    "Microservices": ["microservice", "service mesh", "event-driven", "kafka"],
+    "Security": ["security", "oauth", "encryption", "owasp", "authentication", "vulnerab"],
+    "Testing": ["test", "tdd", "qa", "quality assurance"],
+    "CI/CD": ["ci/cd", "continuous integration", "continuous delivery", "continuous deployment", "jenkins",
+              "github actions", "deployment pipeline"],
+    "Version Control": ["git", "version control", "code review"],
+    "Agile Methodologies": ["agile", "scrum", "kanban", "sprint"],
+    "API Design": ["api", "rest", "graphql", "grpc", "endpoint"],
+    "Concurrency": ["concurren", "multithread", "multi-thread", "async", "thread"],
+    "Parallel Programming": ["parallel", "cuda", "gpu", "mpi", "spark"],
+    "Memory Management": ["memory management", "garbage collect", "c++", "rust", "memory leak"],
+    "Design Patterns": ["design pattern", "solid principles", "clean code"],
+    "Problem Solving": ["problem solving", "problem-solving", "analytical"],
+    "Debugging": ["debug", "troubleshoot", "root cause", "incident"],
+    "Performance Optimization": ["performance", "latency", "optimiz", "profiling", "throughput"],
+    "Mobile Development": ["mobile", "ios", "android", "swift", "kotlin", "react native"],
+    "Machine Learning Basics": ["machine learning", "deep learning", "ml ", "pytorch", "tensorflow", "scikit",
+                                "model training"],
+    "Ethics in Software Engineering": ["ethic", "privacy", "responsible ai", "gdpr", "accessibility"],
+}
+
+# Keywords match at the start of a word, so "scalab" covers "scalable" and "scalability"
+_TOPIC_PATTERNS = {
+    topic: re.compile("|".join(rf"(?<![a-z0-9]){re.escape(keyword)}" for keyword in keywords))
+    for topic, keywords in TOPIC_KEYWORDS.items()
+}
+
+# Checked in order: an explicit title word beats years of experience
+_SENIORITY_TITLES = [
+    ("intern", re.compile(r"\bintern(ship)?\b", re.IGNORECASE)),
+    ("principal", re.compile(r"\b(principal|staff|distinguished)\b", re.IGNORECASE)),
+    ("lead", re.compile(r"\b(tech lead|team lead|lead (engineer|developer|architect)|engineering manager|head of)\b",
+                        re.IGNORECASE)),
+    ("senior", re.compile(r"\b(senior|sr\.?)\b", re.IGNORECASE)),
+    ("junior", re.compile(r"\b(junior|jr\.?|entry[- ]level|new grad(uate)?)\b", re.IGNORECASE)),
+    ("mid-level", re.compile(r"\b(mid[- ]level|intermediate)\b", re.IGNORECASE)),
+]
+_YEARS = re.compile(r"(\d{1,2})\s*\+?\s*(?:-\s*\d{1,2}\s*)?(?:years|yrs)", re.IGNORECASE)
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def normalize_description(job_description):
+    """Lower-cases a job description and collapses its whitespace."""
+    return " ".join((job_description or "").lower().split())
+
+
+def description_hash(job_description):
+    """Hashes the normalized text of a job description."""
+    return hashlib.sha256(normalize_description(job_description).encode("utf-8")).hexdigest()
+
+
+def extract_skills(job_description):
+    """Returns the known skills a job description mentions, most mentioned first."""
+    counts = {}
+    for name, pattern in _SKILL_PATTERNS.items():
+        hits = len(pattern.findall(job_description or ""))
+        if hits:
+            counts[name] = hits
+    return sorted(counts, key=lambda name: -counts[name])[:MAX_SKILLS]
+
+
+def extract_seniority(job_description):
+    """
+    Infers the seniority a job description asks for.
+
+    Returns:
+        tuple: (seniority level or None, years of experience asked for or None).
+    """
+    text = job_description or ""
+    years = [int(match) for match in _YEARS.findall(text)]
+    min_years = min(years) if years else None
+    for level, pattern in _SENIORITY_TITLES:
+        if pattern.search(text):
+            return level, min_years
+    if min_years is None:
+        return None, None
+    if min_years <= 1:
+        return "junior", min_years
+    if min_years <= 4:
+        return "mid-level", min_years
+    if min_years <= 7:
+        return "senior", min_years
+    return "principal", min_years
+
+
+def map_topics(job_description):
+    """Returns the TOPIC_KEYWORDS topics a job description covers, most relevant first."""
+    text = normalize_description(job_description)
+    scores = {}
+    for topic, pattern in _TOPIC_PATTERNS.items():
+        score = len(pattern.findall(text))
+        if score:
+            scores[topic] = score
+    return sorted(scores, key=lambda topic: -scores[topic])[:MAX_TOPICS]
+
+
+def _analyze(job_description):
+    seniority, years = extract_seniority(job_description)
+    return {
+        "skills": extract_skills(job_description),
+        "seniority": seniority,
+        "years": years,
+        "topics": map_topics(job_description),
+        "highlights": extract_key_sentences(job_description, HIGHLIGHT_TOKENS),
+    }
+
+
+def analyze_job_description(job_description):
+    """
+    Analyzes a job description, reusing the cached analysis of the same text.
+
+    Args:
+        job_description (str): The pasted job description.
+
+    Returns:
+        dict: 'skills' (list), 'seniority' (str or None), 'years' (int or None),
+              'topics' (list of TOPICS entries) and 'highlights' (its key
+              sentences, str); None for an empty description.
+    """
+    if not normalize_description(job_description):
+        return None
+    key = description_hash(job_description)
+    with _lock:
+        analysis = _cache.get(key)
+        if analysis is not None:
+            _cache.move_to_end(key)
+            _stats["hits"] += 1
+            return copy.deepcopy(analysis)
+        _stats["misses"] += 1
+
+    analysis = _analyze(job_description)
+    with _lock:
+        _cache[key] = analysis
+        while len(_cache) > MAX_ENTRIES:
+            _cache.popitem(last=False)
+    return copy.deepcopy(analysis)
+
+
+def summarize_job_description(job_description, highlights=False):
+    """
+    Compact one-line summary of a job description for prompts.
+
+    Args:
+        job_description (str): The pasted job description.
+        highlights (bool): Also include its key sentences, for prompts that need
+                           the domain detail (question generation).
+
+    Returns:
+        str: e.g. "Seniority: senior (5+ years). Skills: Python, AWS. Topics:
+             Cloud Computing, Databases." or "" when nothing was recognized.
+    """
+    analysis = analyze_job_description(job_description)
+    if not analysis:
+        return ""
+    parts = []
+    if analysis["seniority"]:
+        years = f" ({analysis['years']}+ years)" if analysis["years"] is not None else ""
+        parts.append(f"Seniority: {analysis['seniority']}{years}.")
+    if analysis["skills"]:
+        parts.append(f"Skills: {', '.join(analysis['skills'])}.")
+    if analysis["topics"]:
+        parts.append(f"Topics: {', '.join(analysis['topics'])}.")
+    if highlights and analysis["highlights"]:
+        parts.append(f"Highlights: {analysis['highlights']}")
+    return " ".join(parts)
+
+
+def get_analysis_stats():
+    """
+    Returns:
+        dict: Cache hits and misses, and the number of cached analyses.
+    """
+    with _lock:
+        return dict(_stats, entries=len(_cache))
+
+
+def clear_analysis_cache():
+    """Drops every cached analysis and resets the counters."""
+    with _lock:
+        _cache.clear()
+        for name in _stats:
+            _stats[name] = 0
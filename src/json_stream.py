@@ -0,0 +1,105 @@
+"""
+Incremental JSON parsing for streamed LLM output.
+"""
+import json
+import re
+
+# Matches an object member whose string value is still being streamed, e.g. '"sample_answer": "Fir'
+_PARTIAL_STRING_MEMBER = re.compile(r'^\s*"((?:[^"\\]|\\.)*)"\s*:\s*"((?:[^"\\]|\\.)*)\\?$', re.DOTALL)
+
+
+class IncrementalJSONParser:
+    """
+    Parses a top-level JSON object or array as text arrives in chunks.
+
+    Each completed member is reported as soon as its closing delimiter is seen:
+    (key, value) pairs for an object and (index, value) pairs for an array.
+    Text before the opening bracket (e.g. a markdown code fence) is ignored.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._container = None
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._member_start = None
+        self._index = 0
+        self.done = False
+
+    def feed(self, chunk):
+        """
+        Adds a chunk of text and returns the members completed by it.
+
+        Args:
+            chunk (str): The next piece of streamed text.
+
+        Returns:
+            list: (key or index, value) tuples for every newly completed member.
+        """
+        completed = []
+        if self.done or not chunk:
+            return completed
+        self._buffer += chunk
+
+        while self._pos < len(self._buffer) and not self.done:
+            char = self._buffer[self._pos]
+            if self._container is None:
+                if char in "{[":
+                    self._container = char
+                    self._depth = 1
+                    self._member_start = self._pos + 1
+            elif self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._close_member(self._pos, completed)
+                    self.done = True
+            elif char == "," and self._depth == 1:
+                self._close_member(self._pos, completed)
+                self._member_start = self._pos + 1
+            self._pos += 1
+        return completed
+
+    def _close_member(self, end, completed):
+        """Decodes the member text between the last delimiter and end."""
+        text = self._buffer[self._member_start:end].strip()
+        if not text:
+            return
+        try:
+            if self._container == "{":
+                member = json.loads("{" + text + "}")
+                completed.extend(member.items())
+            else:
+                completed.append((self._index, json.loads(text)))
+                self._index += 1
+        except json.JSONDecodeError:
+            pass
+
+    def partial(self):
+        """
+        Returns the object member whose string value is still arriving.
+
+        Returns:
+            tuple: (key, text so far), or None if no string value is in progress.
+        """
+        if self._container != "{" or self.done or self._member_start is None:
+            return None
+        match = _PARTIAL_STRING_MEMBER.match(self._buffer[self._member_start:])
+        if not match:
+            return None
+        try:
+            return json.loads(f'"{match.group(1)}"'), json.loads(f'"{match.group(2)}"')
+        except json.JSONDecodeError:
+            return None
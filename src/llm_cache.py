@@ -0,0 +1,192 @@
+"""
+Persistent, content-addressed cache for GenAI responses.
+
+Entries live in a local SQLite file keyed by a hash of the model, prompt
+messages and generation parameters. Each entry carries an expiry time taken
+from its call site's TTL, and the least recently used entries are evicted
+once the cache holds more than MAX_ENTRIES.
+"""
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+CACHE_PATH = os.getenv(
+    "GENAI_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "llm_cache.db")
+)
+ENABLED = os.getenv("GENAI_CACHE_ENABLED", "1") != "0"
+MAX_ENTRIES = int(os.getenv("GENAI_CACHE_MAX_ENTRIES", "2000"))
+DEFAULT_TTL = float(os.getenv("GENAI_CACHE_TTL", "3600"))
+
+# Seconds an entry stays fresh, per call site. A TTL of 0 disables caching for that site.
+CALL_SITE_TTLS = {
+    "question_gen": 24 * 3600,
+    "evaluate": 3600,
+    "evaluate_batch": 3600,
+    "overall": 3600,
+    # Bank refills and pool refreshes must get new questions, not a replay of the last batch
+    "question_bank": 0,
+    "question_pool": 0,
+    # Adaptive follow-ups list the questions already asked, so each prompt is new anyway
+    "question_adaptive": 0,
+    # Replacements for questions a user was already asked must not repeat the cached answer
+    "question_dedup": 0,
+}
+
+_lock = threading.Lock()
+_initialized_path = None
+_stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0, "writes": 0}
+
+
+def _connect():
+    """Opens a connection to the cache database, creating its table on first use."""
+    global _initialized_path
+    conn = sqlite3.connect(CACHE_PATH, timeout=5)
+    if _initialized_path != CACHE_PATH:
+        conn.execute('''
+        CREATE TABLE IF NOT EXISTS llm_cache (
+            cache_key TEXT PRIMARY KEY,
+            call_site TEXT,
+            response TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            last_access REAL NOT NULL,
+            expires_at REAL NOT NULL
+        )
+        ''')
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache (last_access)")
+        conn.commit()
+        _initialized_path = CACHE_PATH
+    return conn
+
+
+def _count(name, amount=1):
+    with _lock:
+        _stats[name] += amount
+
+
+def make_key(model, messages, params=None):
+    """
+    Builds the content address for a generation request.
+
+    Args:
+        model (str): The model name.
+        messages (list): The prompt messages.
+        params (dict): Any other generation parameters sent with the request.
+
+    Returns:
+        str: A SHA-256 hex digest identifying the request.
+    """
+    material = json.dumps(
+        {"model": model, "messages": messages, "params": params or {}},
+        sort_keys=True, ensure_ascii=False
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def ttl_for(call_site):
+    """
+    Returns the TTL in seconds for a call site, falling back to DEFAULT_TTL.
+
+    Calls without a call site are never cached.
+    """
+    if call_site is None:
+        return 0
+    return CALL_SITE_TTLS.get(call_site, DEFAULT_TTL)
+
+
+def get(cache_key):
+    """
+    Looks up a cached response and marks it as recently used.
+
+    Args:
+        cache_key (str): Key from make_key().
+
+    Returns:
+        str: The cached response, or None on a miss or expired entry.
+    """
+    now = time.time()
+    conn = _connect()
+    try:
+        row = conn.execute(
+            "SELECT response, expires_at FROM llm_cache WHERE cache_key = ?", (cache_key,)
+        ).fetchone()
+        if row is None:
+            _count("misses")
+            return None
+        if row[1] <= now:
+            conn.execute("DELETE FROM llm_cache WHERE cache_key = ?", (cache_key,))
+            conn.commit()
+            _count("expired")
+            _count("misses")
+            return None
+        conn.execute("UPDATE llm_cache SET last_access = ? WHERE cache_key = ?", (now, cache_key))
+        conn.commit()
+        _count("hits")
+        return row[0]
+    finally:
+        conn.close()
+
+
+def put(cache_key, response, ttl, call_site=None):
+    """
+    Stores a response and evicts the least recently used entries beyond MAX_ENTRIES.
+
+    Args:
+        cache_key (str): Key from make_key().
+        response (str): The generated text to cache.
+        ttl (float): Seconds the entry stays fresh.
+        call_site (str): Label of the caller, kept for inspection.
+    """
+    now = time.time()
+    conn = _connect()
+    try:
+        conn.execute(
+            "INSERT OR REPLACE INTO llm_cache (cache_key, call_site, response, created_at, last_access, expires_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (cache_key, call_site, response, now, now, now + ttl)
+        )
+        cursor = conn.execute(
+            "DELETE FROM llm_cache WHERE cache_key IN ("
+            "SELECT cache_key FROM llm_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+            (MAX_ENTRIES,)
+        )
+        conn.commit()
+        _count("writes")
+        if cursor.rowcount > 0:
+            _count("evictions", cursor.rowcount)
+    finally:
+        conn.close()
+
+
+def clear_cache():
+    """Removes every cached response."""
+    conn = _connect()
+    try:
+        conn.execute("DELETE FROM llm_cache")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def get_cache_stats():
+    """
+    Reports cache effectiveness since startup (or the last reset).
+
+    Returns:
+        dict: Hit, miss, expiry, eviction and write counters plus the hit rate.
+    """
+    with _lock:
+        stats = dict(_stats)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+    return stats
+
+
+def reset_cache_stats():
+    """Resets the cache counters."""
+    with _lock:
+        for name in _stats:
+            _stats[name] = 0
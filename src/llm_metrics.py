@@ -0,0 +1,309 @@
+"""
+Metrics for GenAI calls, labelled by call site (question_gen, evaluate, overall, ...).
+
+Records a latency histogram, call outcomes, prompt and completion tokens
+(from the API's usage field), errors by kind and response parse failures.
+The metrics can be rendered in the Prometheus text format or as JSON,
+served over HTTP, or dumped to a file periodically.
+
+    GENAI_METRICS_PORT=9464    serve /metrics (Prometheus) and /metrics.json
+    GENAI_METRICS_DUMP=path    write metrics to path (".json" for JSON, else Prometheus text)
+    GENAI_METRICS_DUMP_INTERVAL=60
+"""
+import os
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Histogram bucket upper bounds, in seconds
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0)
+UNLABELLED = "unlabelled"
+
+
+class _Histogram:
+    """Cumulative-bucket latency histogram in the Prometheus style."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # The last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """Returns [(upper bound, cumulative count)], ending with ("+Inf", count)."""
+        total = 0
+        result = []
+        for bound, count in zip(list(self.buckets) + ["+Inf"], self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def quantile(self, q):
+        """Estimates a quantile as the upper bound of the bucket that contains it."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        for bound, total in self.cumulative():
+            if total >= rank:
+                return bound
+        return "+Inf"
+
+
+class LLMMetrics:
+    """Thread-safe store of GenAI call metrics."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self._buckets = buckets
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._latency = {}        # call_site -> _Histogram
+            self._requests = {}       # (call_site, provider, outcome) -> count
+            self._tokens = {}         # (call_site, kind) -> count
+            self._errors = {}         # (call_site, kind) -> count
+            self._parse_failures = {}  # call_site -> count
+
+    def record_call(self, call_site, provider, seconds, outcome):
+        """
+        Records one generation call as seen by its caller.
+
+        Args:
+            call_site (str): Label of the caller; None is recorded as "unlabelled".
+            provider (str): Name of the provider that served the call.
+            seconds (float): Wall time of the call.
+            outcome (str): "ok", "cached" or "error".
+        """
+        call_site = call_site or UNLABELLED
+        with self._lock:
+            histogram = self._latency.get(call_site)
+            if histogram is None:
+                histogram = self._latency[call_site] = _Histogram(self._buckets)
+            histogram.observe(seconds)
+            key = (call_site, provider, outcome)
+            self._requests[key] = self._requests.get(key, 0) + 1
+
+    def record_tokens(self, call_site, prompt_tokens, completion_tokens):
+        """Adds the tokens reported in a response's usage field."""
+        call_site = call_site or UNLABELLED
+        with self._lock:
+            for kind, tokens in (("prompt", prompt_tokens), ("completion", completion_tokens)):
+                if tokens:
+                    key = (call_site, kind)
+                    self._tokens[key] = self._tokens.get(key, 0) + tokens
+
+    def record_error(self, call_site, kind):
+        """Counts a failed upstream attempt, e.g. kind "timeout", "http_500" or "breaker_open"."""
+        key = (call_site or UNLABELLED, kind)
+        with self._lock:
+            self._errors[key] = self._errors.get(key, 0) + 1
+
+    def record_parse_failure(self, call_site):
+        """Counts a response that came back but could not be parsed, wasting the call."""
+        call_site = call_site or UNLABELLED
+        with self._lock:
+            self._parse_failures[call_site] = self._parse_failures.get(call_site, 0) + 1
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: Metrics per call site, suitable for JSON.
+        """
+        with self._lock:
+            call_sites = (set(self._latency) | {k[0] for k in self._requests} | {k[0] for k in self._tokens}
+                          | {k[0] for k in self._errors} | set(self._parse_failures))
+            result = {}
+            for call_site in sorted(call_sites):
+                histogram = self._latency.get(call_site)
+                result[call_site] = {
+                    "requests": {
+                        f"{provider}:{outcome}": count
+                        for (site, provider, outcome), count in sorted(self._requests.items()) if site == call_site
+                    },
+                    "latency": {
+                        "count": histogram.count if histogram else 0,
+                        "sum": histogram.sum if histogram else 0.0,
+                        "p50": histogram.quantile(0.5) if histogram else None,
+                        "p95": histogram.quantile(0.95) if histogram else None,
+                        "buckets": {str(bound): total for bound, total in histogram.cumulative()} if histogram else {},
+                    },
+                    "tokens": {kind: count for (site, kind), count in sorted(self._tokens.items()) if site == call_site},
+                    "errors": {kind: count for (site, kind), count in sorted(self._errors.items()) if site == call_site},
+                    "parse_failures": self._parse_failures.get(call_site, 0),
+                }
+            return result
+
+    def to_prometheus(self):
+        """
+        Returns:
+            str: The metrics in the Prometheus text exposition format.
+        """
+        lines = []
+        with self._lock:
+            lines.append("# HELP genai_request_duration_seconds Latency of GenAI calls as seen by the caller.")
+            lines.append("# TYPE genai_request_duration_seconds histogram")
+            for call_site, histogram in sorted(self._latency.items()):
+                for bound, total in histogram.cumulative():
+                    lines.append(f'genai_request_duration_seconds_bucket{{call_site="{call_site}",le="{bound}"}} {total}')
+                lines.append(f'genai_request_duration_seconds_sum{{call_site="{call_site}"}} {histogram.sum}')
+                lines.append(f'genai_request_duration_seconds_count{{call_site="{call_site}"}} {histogram.count}')
+
+            lines.append("# HELP genai_requests_total GenAI calls by outcome.")
+            lines.append("# TYPE genai_requests_total counter")
+            for (call_site, provider, outcome), count in sorted(self._requests.items()):
+                lines.append(
+                    f'genai_requests_total{{call_site="{call_site}",provider="{provider}",outcome="{outcome}"}} {count}'
+                )
+
+            lines.append("# HELP genai_tokens_total Tokens reported by the API's usage field.")
+            lines.append("# TYPE genai_tokens_total counter")
+            for (call_site, kind), count in sorted(self._tokens.items()):
+                lines.append(f'genai_tokens_total{{call_site="{call_site}",kind="{kind}"}} {count}')
+
+            lines.append("# HELP genai_errors_total Failed GenAI call attempts by kind.")
+            lines.append("# TYPE genai_errors_total counter")
+            for (call_site, kind), count in sorted(self._errors.items()):
+                lines.append(f'genai_errors_total{{call_site="{call_site}",kind="{kind}"}} {count}')
+
+            lines.append("# HELP genai_parse_failures_total GenAI responses that could not be parsed.")
+            lines.append("# TYPE genai_parse_failures_total counter")
+            for call_site, count in sorted(self._parse_failures.items()):
+                lines.append(f'genai_parse_failures_total{{call_site="{call_site}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=2)
+
+
+_metrics = LLMMetrics()
+
+
+def get_metrics():
+    """Returns the process-wide metrics store."""
+    return _metrics
+
+
+def record_call(call_site, provider, seconds, outcome):
+    _metrics.record_call(call_site, provider, seconds, outcome)
+
+
+def record_tokens(call_site, prompt_tokens, completion_tokens):
+    _metrics.record_tokens(call_site, prompt_tokens, completion_tokens)
+
+
+def record_error(call_site, kind):
+    _metrics.record_error(call_site, kind)
+
+
+def record_parse_failure(call_site):
+    _metrics.record_parse_failure(call_site)
+
+
+def export_prometheus():
+    return _metrics.to_prometheus()
+
+
+def export_json():
+    return _metrics.to_json()
+
+
+def reset_metrics():
+    _metrics.reset()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/metrics":
+            body, content_type = export_prometheus(), "text/plain; version=0.0.4"
+        elif self.path == "/metrics.json":
+            body, content_type = export_json(), "application/json"
+        else:
+            self.send_error(404)
+            return
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port, host="127.0.0.1"):
+    """
+    Serves /metrics (Prometheus text) and /metrics.json on a background thread.
+
+    Returns:
+        ThreadingHTTPServer: The running server; call shutdown() to stop it.
+    """
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True, name="genai-metrics").start()
+    return server
+
+
+def dump_metrics(path):
+    """Writes the metrics to path: JSON for a .json file, Prometheus text otherwise."""
+    body = export_json() if path.endswith(".json") else export_prometheus()
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(body)
+    os.replace(tmp_path, path)
+
+
+def start_metrics_dump(path, interval=60.0):
+    """
+    Dumps the metrics to path every interval seconds on a background thread.
+
+    Returns:
+        threading.Event: Set it to stop dumping.
+    """
+    stop = threading.Event()
+
+    def _loop():
+        while not stop.wait(interval):
+            try:
+                dump_metrics(path)
+            except OSError as e:
+                print(f"Warning: could not write GenAI metrics to {path}: {e}")
+
+    threading.Thread(target=_loop, daemon=True, name="genai-metrics-dump").start()
+    return stop
+
+
+_exporters_started = False
+_exporters_lock = threading.Lock()
+
+
+def start_exporters_from_env():
+    """
+    Starts the exporters configured by GENAI_METRICS_PORT and GENAI_METRICS_DUMP.
+
+    Safe to call on every Streamlit rerun: exporters start once per process.
+    """
+    global _exporters_started
+    with _exporters_lock:
+        if _exporters_started:
+            return
+        _exporters_started = True
+        port = os.getenv("GENAI_METRICS_PORT")
+        if port:
+            try:
+                start_metrics_server(int(port), os.getenv("GENAI_METRICS_HOST", "127.0.0.1"))
+            except OSError as e:
+                print(f"Warning: could not start GenAI metrics server on port {port}: {e}")
+        path = os.getenv("GENAI_METRICS_DUMP")
+        if path:
+            start_metrics_dump(path, float(os.getenv("GENAI_METRICS_DUMP_INTERVAL", "60")))
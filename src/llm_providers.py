@@ -0,0 +1,261 @@
+"""
+LLM provider backends for genai_client.
+
+Each provider knows how to turn chat messages into an HTTP request for its
+API and how to read generated text, streamed deltas and token usage back out
+of the response. genai_client owns the transport (pooling, caching, rate
+limiting, hedging), so providers stay small and side-effect free.
+
+Providers are picked per call site: GENAI_PROVIDER sets the default and
+GENAI_ROUTES overrides it, e.g.
+    GENAI_ROUTES="question_gen=mistral:mistral-small-latest,evaluate=google:gemini-2.0-flash"
+"""
+import os
+import threading
+
+
+class LLMProvider:
+    """Base class describing one chat-completion HTTP API."""
+
+    name = None
+    label = None
+    api_key_env = None
+    requires_api_key = True
+    default_base_url = None
+    default_model = None
+
+    def __init__(self, api_key=None, base_url=None, default_model=None,
+                 requests_per_minute=None, tokens_per_minute=None):
+        self.api_key = api_key if api_key is not None else (os.getenv(self.api_key_env) if self.api_key_env else None)
+        self.base_url = (base_url or self.default_base_url).rstrip("/")
+        self.model = default_model or self.default_model
+        # Client-side budgets for the shared rate limiter; None means unlimited
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+
+    def is_configured(self):
+        """Returns False when a required API key is missing."""
+        return bool(self.api_key) or not self.requires_api_key
+
+    def build_request(self, prompt_messages, model, stream=False):
+        """
+        Builds a request for the provider's API.
+
+        Returns:
+            tuple: (url, headers, payload) for an HTTP POST with a JSON body.
+        """
+        raise NotImplementedError
+
+    def extract_content(self, data):
+        """Returns the generated text from a response body, or None if there is none."""
+        raise NotImplementedError
+
+    def extract_delta(self, event):
+        """Returns the text delta carried by one decoded server-sent event, or None."""
+        raise NotImplementedError
+
+    def usage_tokens(self, data):
+        """Returns the total tokens billed for a response, or None if not reported."""
+        return None
+
+    def token_counts(self, data):
+        """Returns (prompt tokens, completion tokens) from a response's usage, None where not reported."""
+        return None, None
+
+
+class OpenAICompatibleProvider(LLMProvider):
+    """Any server implementing the OpenAI /chat/completions API (OpenAI, vLLM, the local stand-in, ...)."""
+
+    name = "openai"
+    label = "OpenAI-compatible"
+    api_key_env = "OPENAI_API_KEY"
+    requires_api_key = False
+    default_base_url = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
+    default_model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+
+    def build_request(self, prompt_messages, model, stream=False):
+        headers = {
+            "Content-Type": "application/json",
+            "Accept": "text/event-stream" if stream else "application/json",
+        }
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        payload = {
+            "model": model,
+            "messages": prompt_messages
+        }
+        if stream:
+            payload["stream"] = True
+        return f"{self.base_url}/chat/completions", headers, payload
+
+    def extract_content(self, data):
+        if data.get('choices') and len(data['choices']) > 0:
+            return data['choices'][0]['message']['content']
+        return None
+
+    def extract_delta(self, event):
+        choices = event.get("choices") or [{}]
+        return (choices[0].get("delta") or {}).get("content")
+
+    def usage_tokens(self, data):
+        usage = data.get("usage") or {}
+        return usage.get("total_tokens")
+
+    def token_counts(self, data):
+        usage = data.get("usage") or {}
+        return usage.get("prompt_tokens"), usage.get("completion_tokens")
+
+
+class MistralProvider(OpenAICompatibleProvider):
+    """Mistral AI's chat completions API."""
+
+    name = "mistral"
+    label = "Mistral"
+    api_key_env = "MISTRAL_API_KEY"
+    requires_api_key = True
+    default_base_url = "https://api.mistral.ai/v1"
+    default_model = "mistral-tiny"
+
+    def __init__(self, api_key=None, base_url=None, default_model=None,
+                 requests_per_minute=None, tokens_per_minute=None):
+        super().__init__(
+            api_key=api_key,
+            base_url=base_url,
+            default_model=default_model,
+            requests_per_minute=requests_per_minute or float(os.getenv("MISTRAL_RPM", "60")),
+            tokens_per_minute=tokens_per_minute or float(os.getenv("MISTRAL_TPM", "500000")),
+        )
+
+
+class GoogleGenAIProvider(LLMProvider):
+    """Google's Gemini API (generativelanguage.googleapis.com)."""
+
+    name = "google"
+    label = "Google GenAI"
+    api_key_env = "GOOGLE_API_KEY"
+    requires_api_key = True
+    default_base_url = "https://generativelanguage.googleapis.com/v1beta"
+    default_model = os.getenv("GOOGLE_MODEL", "gemini-2.0-flash")
+
+    def build_request(self, prompt_messages, model, stream=False):
+        headers = {
+            "Content-Type": "application/json",
+            "x-goog-api-key": self.api_key or "",
+        }
+        system_parts = []
+        contents = []
+        for message in prompt_messages:
+            if message["role"] == "system":
+                system_parts.append({"text": message["content"]})
+            else:
+                role = "model" if message["role"] == "assistant" else "user"
+                contents.append({"role": role, "parts": [{"text": message["content"]}]})
+        payload = {"contents": contents}
+        if system_parts:
+            payload["systemInstruction"] = {"parts": system_parts}
+
+        method = "streamGenerateContent?alt=sse" if stream else "generateContent"
+        return f"{self.base_url}/models/{model}:{method}", headers, payload
+
+    def _candidate_text(self, data):
+        candidates = data.get("candidates") or []
+        if not candidates:
+            return None
+        parts = (candidates[0].get("content") or {}).get("parts") or []
+        return "".join(part.get("text", "") for part in parts)
+
+    def extract_content(self, data):
+        return self._candidate_text(data)
+
+    def extract_delta(self, event):
+        return self._candidate_text(event)
+
+    def usage_tokens(self, data):
+        usage = data.get("usageMetadata") or {}
+        return usage.get("totalTokenCount")
+
+    def token_counts(self, data):
+        usage = data.get("usageMetadata") or {}
+        return usage.get("promptTokenCount"), usage.get("candidatesTokenCount")
+
+
+PROVIDER_CLASSES = {
+    MistralProvider.name: MistralProvider,
+    OpenAICompatibleProvider.name: OpenAICompatibleProvider,
+    GoogleGenAIProvider.name: GoogleGenAIProvider,
+}
+
+DEFAULT_PROVIDER = os.getenv("GENAI_PROVIDER", MistralProvider.name)
+
+_providers = {}
+_providers_lock = threading.Lock()
+
+
+def parse_routes(spec):
+    """
+    Parses a GENAI_ROUTES value into a routing table.
+
+    Args:
+        spec (str): Comma-separated 'call_site=provider[:model]' entries.
+
+    Returns:
+        dict: call_site -> (provider name, model or None).
+    """
+    routes = {}
+    for entry in (spec or "").split(","):
+        if "=" not in entry:
+            continue
+        call_site, target = (part.strip() for part in entry.split("=", 1))
+        provider_name, _, model = target.partition(":")
+        routes[call_site] = (provider_name.strip(), model.strip() or None)
+    return routes
+
+
+CALL_SITE_ROUTES = parse_routes(os.getenv("GENAI_ROUTES", ""))
+
+
+def register_provider(provider):
+    """Registers (or replaces) the provider instance used for provider.name."""
+    with _providers_lock:
+        _providers[provider.name] = provider
+    return provider
+
+
+def get_provider(name=None):
+    """
+    Returns the provider instance registered under name, creating it on first use.
+
+    Args:
+        name (str): Provider name; defaults to GENAI_PROVIDER.
+
+    Returns:
+        LLMProvider: The provider instance.
+    """
+    name = name or DEFAULT_PROVIDER
+    with _providers_lock:
+        provider = _providers.get(name)
+        if provider is None:
+            if name not in PROVIDER_CLASSES:
+                raise ValueError(f"Unknown LLM provider '{name}'. Known providers: {', '.join(PROVIDER_CLASSES)}")
+            provider = PROVIDER_CLASSES[name]()
+            _providers[name] = provider
+    return provider
+
+
+def resolve_route(call_site=None, provider=None, model=None):
+    """
+    Picks the provider and model for a call.
+
+    Explicit arguments win over the call site's route, which wins over the
+    default provider and its default model. A route's model only applies
+    when the route's provider is used.
+
+    Returns:
+        tuple: (LLMProvider, model name).
+    """
+    route_model = None
+    if provider is None:
+        provider, route_model = CALL_SITE_ROUTES.get(call_site, (None, None))
+    if provider is None or isinstance(provider, str):
+        provider = get_provider(provider)
+    return provider, model or route_model or provider.model
@@ -0,0 +1,169 @@
+"""
+Token budgets for GenAI prompts.
+
+User-supplied text (pasted multi-page job descriptions, long answers) is
+compacted to a per-field budget before it goes into a prompt, and every
+finished prompt is held to its call site's overall budget. Prompt size drives
+both upstream latency and cost, so nothing is sent unbounded.
+"""
+import os
+import re
+
+try:
+    from .rate_limiter import estimate_tokens
+except ImportError:
+    from rate_limiter import estimate_tokens
+
+# Per-field budgets, in estimated tokens
+JOB_DESCRIPTION_TOKENS = int(os.getenv("GENAI_JD_TOKENS", "400"))
+RESPONSE_TOKENS = int(os.getenv("GENAI_RESPONSE_TOKENS", "600"))
+# Smallest share a single answer gets when the overall prompt is split between answers
+MIN_FIELD_TOKENS = 60
+
+# Whole-prompt budgets per call site
+PROMPT_BUDGETS = {
+    "question_gen": int(os.getenv("GENAI_QUESTION_GEN_BUDGET", "800")),
+    "evaluate": int(os.getenv("GENAI_EVALUATE_BUDGET", "1200")),
+    "evaluate_batch": int(os.getenv("GENAI_EVALUATE_BATCH_BUDGET", "4000")),
+    "overall": int(os.getenv("GENAI_OVERALL_BUDGET", "3000")),
+}
+
+TRUNCATION_MARKER = " [...]"
+
+# Sentences mentioning these are the ones worth keeping from a job description
+_KEY_TERMS = re.compile(
+    r"\b(require|must|experience|responsib|skill|knowledge|proficien|familiar|years?|degree|"
+    r"you will|you'll|looking for|qualif|expert|strong|build|design|develop|own)",
+    re.IGNORECASE,
+)
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?;])\s+|\n+")
+_WORD = re.compile(r"[A-Za-z][A-Za-z+#.\-]{2,}")
+
+
+def truncate_text(text, max_tokens):
+    """Keeps the start of text, cut at a word boundary, within max_tokens."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    limit = max(0, max_tokens * 4 - len(TRUNCATION_MARKER))
+    cut = text[:limit]
+    if " " in cut:
+        cut = cut.rsplit(" ", 1)[0]
+    return cut.rstrip() + TRUNCATION_MARKER
+
+
+def extract_key_sentences(text, max_tokens):
+    """
+    Keeps the most informative sentences of text within max_tokens.
+
+    Sentences are scored by requirement-style wording and by how many of the
+    text's recurring terms they contain; the best ones are kept in their
+    original order.
+    """
+    sentences = [s.strip(" \t-*•") for s in _SENTENCE_SPLIT.split(text)]
+    sentences = [s for s in sentences if s]
+    if not sentences:
+        return ""
+
+    counts = {}
+    for word in _WORD.findall(text.lower()):
+        counts[word] = counts.get(word, 0) + 1
+
+    def score(sentence):
+        words = set(_WORD.findall(sentence.lower()))
+        recurring = sum(1 for word in words if counts.get(word, 0) > 1)
+        return 3 * len(_KEY_TERMS.findall(sentence)) + recurring / (1 + len(words)) ** 0.5
+
+    ranked = sorted(range(len(sentences)), key=lambda i: score(sentences[i]), reverse=True)
+    kept = set()
+    used = 0
+    for i in ranked:
+        cost = estimate_tokens(sentences[i]) + 1
+        if used + cost > max_tokens:
+            continue
+        kept.add(i)
+        used += cost
+
+    if not kept:
+        return truncate_text(sentences[ranked[0]], max_tokens)
+    return " ".join(sentences[i] for i in sorted(kept))
+
+
+def compact_text(text, max_tokens, strategy="truncate"):
+    """
+    Compacts text to fit within max_tokens, returning it unchanged if it already fits.
+
+    Args:
+        text (str): The text to compact.
+        max_tokens (int): Token budget for the text.
+        strategy (str): "truncate" keeps the beginning (for answers, where order
+                        matters); "key_sentences" keeps the most informative
+                        sentences (for job descriptions).
+
+    Returns:
+        str: The compacted text.
+    """
+    if not text or estimate_tokens(text) <= max_tokens:
+        return text
+    if strategy == "key_sentences":
+        return extract_key_sentences(text, max_tokens)
+    return truncate_text(text, max_tokens)
+
+
+def compact_job_description(job_description, max_tokens=None):
+    """Compacts a job description to its key sentences within JOB_DESCRIPTION_TOKENS."""
+    return compact_text(job_description, max_tokens or JOB_DESCRIPTION_TOKENS, strategy="key_sentences")
+
+
+def compact_response(response, max_tokens=None):
+    """Trims a candidate response to RESPONSE_TOKENS."""
+    return compact_text(response, max_tokens or RESPONSE_TOKENS)
+
+
+def messages_tokens(prompt_messages):
+    """Estimates the prompt tokens of a list of chat messages."""
+    return sum(estimate_tokens(m.get("content", "")) for m in prompt_messages)
+
+
+def share_budget(call_site, fixed_text, parts):
+    """
+    Splits what is left of a call site's budget, after fixed_text, between parts.
+
+    Returns:
+        int: Tokens available per part, never below MIN_FIELD_TOKENS.
+    """
+    remaining = PROMPT_BUDGETS[call_site] - estimate_tokens(fixed_text)
+    return max(MIN_FIELD_TOKENS, remaining // max(parts, 1))
+
+
+def enforce_prompt_budget(prompt_messages, call_site):
+    """
+    Ensures a prompt fits its call site's budget.
+
+    Per-field compaction normally keeps prompts within budget; if it is still
+    over (e.g. a very long role or question), the longest user message is
+    truncated by the excess. System messages carry the output format and are
+    never cut.
+
+    Args:
+        prompt_messages (list): The prompt messages; not modified.
+        call_site (str): Key into PROMPT_BUDGETS.
+
+    Returns:
+        list: Messages within budget (the same list if it already fits).
+    """
+    budget = PROMPT_BUDGETS.get(call_site)
+    total = messages_tokens(prompt_messages)
+    if budget is None or total <= budget:
+        return prompt_messages
+
+    user_indexes = [i for i, m in enumerate(prompt_messages) if m.get("role") == "user"]
+    if not user_indexes:
+        return prompt_messages
+    longest = max(user_indexes, key=lambda i: len(prompt_messages[i].get("content", "")))
+    content = prompt_messages[longest]["content"]
+    allowed = max(MIN_FIELD_TOKENS, estimate_tokens(content) - (total - budget))
+    print(f"Prompt for '{call_site}' is ~{total} tokens (budget {budget}); trimming it.")
+
+    fitted = [dict(m) for m in prompt_messages]
+    fitted[longest]["content"] = truncate_text(content, allowed)
+    return fitted
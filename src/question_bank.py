@@ -0,0 +1,248 @@
+"""
+Bank of pre-generated interview questions, bucketed by role, difficulty and job description.
+
+Buckets live in the application's SQLite database, keyed by the normalized
+job role, difficulty and a fingerprint of the job description. Serving takes
+questions out of a bucket, so every interview gets fresh ones, and whenever a
+bucket drops below LOW_WATERMARK a background worker tops it back up to
+TARGET_SIZE. For popular roles, generating questions then costs a single
+SQLite query instead of a full LLM call.
+"""
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from . import database
+except ImportError:
+    import database
+
+ENABLED = os.getenv("QUESTION_BANK_ENABLED", "1") != "0"
+DB_PATH = os.getenv("QUESTION_BANK_DB_PATH", database.DB_PATH)
+
+# Refill a bucket once it holds fewer than LOW_WATERMARK questions, up to TARGET_SIZE
+TARGET_SIZE = int(os.getenv("QUESTION_BANK_TARGET_SIZE", "20"))
+LOW_WATERMARK = int(os.getenv("QUESTION_BANK_LOW_WATERMARK", "10"))
+# Questions requested from the LLM per refill call, and calls allowed per refill
+REFILL_BATCH = 10
+MAX_REFILL_CALLS = 4
+
+_refill_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="question-bank-refill")
+_pending_refills = set()
+_lock = threading.Lock()
+_initialized_path = None
+_stats = {"hits": 0, "misses": 0, "refills": 0, "refilled_questions": 0}
+
+
+def _connect():
+    """Opens a connection to the bank's database, creating its table on first use."""
+    global _initialized_path
+    conn = sqlite3.connect(DB_PATH, timeout=10)
+    if _initialized_path != DB_PATH:
+        conn.execute('''
+        CREATE TABLE IF NOT EXISTS question_bank (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            bucket_key TEXT NOT NULL,
+            job_role TEXT NOT NULL,
+            difficulty TEXT NOT NULL,
+            jd_fingerprint TEXT NOT NULL,
+            question_text TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            UNIQUE (bucket_key, question_text)
+        )
+        ''')
+        conn.commit()
+        _initialized_path = DB_PATH
+    return conn
+
+
+def _count_stat(name, amount=1):
+    with _lock:
+        _stats[name] += amount
+
+
+def normalize_text(text):
+    """Lower-cases text and collapses whitespace."""
+    return " ".join((text or "").lower().split())
+
+
+def jd_words(job_description):
+    """Returns the set of lower-cased words in a job description."""
+    return set(re.findall(r"[a-z0-9+#]+", (job_description or "").lower()))
+
+
+def jd_fingerprint(job_description):
+    """
+    Fingerprints a job description by its set of words.
+
+    Reformatting, reordering or repeating the same text gives the same
+    fingerprint; an empty description gives "".
+    """
+    words = jd_words(job_description)
+    if not words:
+        return ""
+    return hashlib.sha256(" ".join(sorted(words)).encode("utf-8")).hexdigest()[:16]
+
+
+def bucket_key(config):
+    """
+    Returns the bucket key for an interview configuration.
+
+    Args:
+        config (dict): Interview configuration with job_role, difficulty and job_description.
+
+    Returns:
+        str: "role|difficulty|jd fingerprint".
+    """
+    return "|".join((
+        normalize_text(config.get("job_role")),
+        normalize_text(config.get("difficulty")),
+        jd_fingerprint(config.get("job_description")),
+    ))
+
+
+def count_questions(config):
+    """Returns how many questions are banked for config."""
+    conn = _connect()
+    try:
+        return conn.execute(
+            "SELECT COUNT(*) FROM question_bank WHERE bucket_key = ?", (bucket_key(config),)
+        ).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def add_questions(config, questions):
+    """
+    Banks questions for config, ignoring ones the bucket already holds.
+
+    Returns:
+        int: Number of questions added.
+    """
+    key = bucket_key(config)
+    now = time.time()
+    rows = [
+        (key, normalize_text(config.get("job_role")), normalize_text(config.get("difficulty")),
+         jd_fingerprint(config.get("job_description")), question.strip(), now)
+        for question in questions if question and question.strip()
+    ]
+    conn = _connect()
+    try:
+        before = conn.total_changes
+        conn.executemany(
+            "INSERT OR IGNORE INTO question_bank "
+            "(bucket_key, job_role, difficulty, jd_fingerprint, question_text, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+            rows
+        )
+        conn.commit()
+        return conn.total_changes - before
+    finally:
+        conn.close()
+
+
+def take_questions(config, num_questions):
+    """
+    Removes and returns num_questions banked questions for config, oldest first.
+
+    Nothing is taken unless the bucket holds enough for the whole request.
+
+    Returns:
+        list: The questions, or [] if the bucket is short.
+    """
+    conn = _connect()
+    conn.isolation_level = None  # Explicit transaction so concurrent sessions never share a question
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        rows = conn.execute(
+            "SELECT id, question_text FROM question_bank WHERE bucket_key = ? ORDER BY id LIMIT ?",
+            (bucket_key(config), num_questions)
+        ).fetchall()
+        if len(rows) < num_questions:
+            conn.execute("ROLLBACK")
+            _count_stat("misses")
+            return []
+        conn.executemany("DELETE FROM question_bank WHERE id = ?", [(row[0],) for row in rows])
+        conn.execute("COMMIT")
+        _count_stat("hits")
+        return [row[1] for row in rows]
+    finally:
+        conn.close()
+
+
+def clear_bank():
+    """Removes every banked question."""
+    conn = _connect()
+    try:
+        conn.execute("DELETE FROM question_bank")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _refill(config, generate_fn):
+    """Generates questions for config until its bucket reaches TARGET_SIZE."""
+    key = bucket_key(config)
+    try:
+        for _ in range(MAX_REFILL_CALLS):
+            if count_questions(config) >= TARGET_SIZE:
+                break
+            added = add_questions(config, generate_fn(config, REFILL_BATCH) or [])
+            _count_stat("refilled_questions", added)
+            if not added:
+                break  # The LLM is failing or only repeating itself; try again on a later refill
+    except Exception as e:
+        print(f"Warning: question bank refill failed for '{key}': {e}")
+    finally:
+        with _lock:
+            _pending_refills.discard(key)
+
+
+def schedule_refill(config, generate_fn):
+    """
+    Refills config's bucket in the background, unless a refill for it is already running.
+
+    Args:
+        config (dict): Interview configuration identifying the bucket.
+        generate_fn (callable): generate_fn(config, n) returning a list of new questions.
+
+    Returns:
+        concurrent.futures.Future: The refill job, or None if one was already pending.
+    """
+    key = bucket_key(config)
+    with _lock:
+        if key in _pending_refills:
+            return None
+        _pending_refills.add(key)
+        _stats["refills"] += 1
+    return _refill_executor.submit(_refill, dict(config), generate_fn)
+
+
+def refill_if_low(config, generate_fn):
+    """Schedules a refill when config's bucket holds fewer than LOW_WATERMARK questions."""
+    if count_questions(config) < LOW_WATERMARK:
+        return schedule_refill(config, generate_fn)
+    return None
+
+
+def get_bank_stats():
+    """
+    Returns:
+        dict: Requests served from the bank (hits), requests it could not
+              serve (misses), refills started and questions they added.
+    """
+    with _lock:
+        stats = dict(_stats)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+    return stats
+
+
+def reset_bank_stats():
+    """Resets the bank counters."""
+    with _lock:
+        for name in _stats:
+            _stats[name] = 0
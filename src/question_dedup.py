@@ -0,0 +1,298 @@
+"""
+Per-user index of questions already asked, for spotting repeats and near-repeats.
+
+Each user's past questions are loaded once from the questions table and
+kept in memory as normalized-text hashes (exact repeats) and MinHash
+signatures of word shingles, bucketed with locality-sensitive hashing
+(near-repeats such as rewordings). A lookup only compares against the few
+past questions that share an LSH bucket, so it stays fast for users with
+thousands of past questions.
+
+Questions generated for a user are checked against their index; repeats are
+replaced by newly generated questions where possible, and only kept when no
+replacement could be found.
+"""
+import os
+import re
+import hashlib
+import threading
+
+import numpy as np
+
+try:
+    from . import database
+except ImportError:
+    import database
+
+ENABLED = os.getenv("QUESTION_DEDUP_ENABLED", "1") != "0"
+# Shingle Jaccard similarity at or above which two questions count as the same
+SIMILARITY_THRESHOLD = 0.5
+SHINGLE_SIZE = 2
+# MinHash signature length = BANDS * ROWS_PER_BAND; with 32 bands of 2 rows a
+# pair at the threshold shares a bucket with probability ~0.9999
+BANDS = 32
+ROWS_PER_BAND = 2
+NUM_PERMUTATIONS = BANDS * ROWS_PER_BAND
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.RandomState(20240521)
+_A = _rng.randint(1, _PRIME, size=NUM_PERMUTATIONS).astype(np.uint64)
+_B = _rng.randint(0, _PRIME, size=NUM_PERMUTATIONS).astype(np.uint64)
+
+# Questions hashed per vectorized MinHash batch when building an index
+BATCH_SIZE = 512
+
+_WORD = re.compile(r"[a-z0-9+#]+")
+# Words that carry no meaning in an interview question
+_FILLER = frozenset("""
+a an the and or of to in on for with about can could would you your me us please how what why when which
+is are do does did be it its this that these those tell describe explain give example walk through
+""".split())
+
+
+def normalize_question(question):
+    """Lower-cases a question and keeps only its meaningful words."""
+    return " ".join(word for word in _WORD.findall((question or "").lower()) if word not in _FILLER)
+
+
+def question_hash(question):
+    """Hash of a question's normalized text; rewordings of filler words give the same hash."""
+    return hashlib.sha1(normalize_question(question).encode("utf-8")).hexdigest()
+
+
+def _shingles_of(normalized):
+    words = normalized.split()
+    size = SHINGLE_SIZE if len(words) >= SHINGLE_SIZE else 1
+    # Python's string hash is only stable within a process, which is all an in-memory index needs
+    return {hash(tuple(words[i:i + size])) % _PRIME for i in range(len(words) - size + 1)}
+
+
+def shingles(question):
+    """Returns the set of hashed word shingles of a question (single words for very short ones)."""
+    return _shingles_of(normalize_question(question))
+
+
+def minhash(shingle_set):
+    """Returns the MinHash signature (NUM_PERMUTATIONS values) of a set of shingle hashes."""
+    if not shingle_set:
+        return np.full(NUM_PERMUTATIONS, _PRIME, dtype=np.uint64)
+    values = np.fromiter(shingle_set, dtype=np.uint64, count=len(shingle_set))
+    return ((_A[:, None] * values[None, :] + _B[:, None]) % _PRIME).min(axis=1)
+
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class QuestionIndex:
+    """Exact and near-duplicate lookups against a set of questions."""
+
+    def __init__(self, questions=()):
+        self._lock = threading.Lock()
+        self._hashes = set()
+        self._shingles = []   # Shingle set per indexed question
+        self._buckets = {}    # (band, band values) -> indexes into _shingles
+        self.add_many(questions)
+
+    def __len__(self):
+        return len(self._shingles)
+
+    @staticmethod
+    def _band_values(signatures):
+        """Combines each band's rows into one bucket value; signatures has one column per question."""
+        rows = signatures.reshape(BANDS, ROWS_PER_BAND, -1)
+        combined = rows[:, 0]
+        for row in range(1, ROWS_PER_BAND):
+            combined = combined * np.uint64(_PRIME) + rows[:, row]
+        return combined
+
+    def _band_keys(self, signature):
+        return enumerate(self._band_values(signature[:, None])[:, 0].tolist())
+
+    def add(self, question):
+        """Indexes a question."""
+        self.add_many([question])
+
+    def add_many(self, questions):
+        """Indexes questions, computing their MinHash signatures in vectorized batches."""
+        new = []
+        with self._lock:
+            for question in questions:
+                normalized = normalize_question(question)
+                digest = hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+                if digest in self._hashes:
+                    continue
+                self._hashes.add(digest)
+                shingle_set = _shingles_of(normalized)
+                self._shingles.append(shingle_set)
+                if shingle_set:
+                    new.append(len(self._shingles) - 1)
+
+            for start in range(0, len(new), BATCH_SIZE):
+                positions = new[start:start + BATCH_SIZE]
+                sets = [self._shingles[position] for position in positions]
+                offsets = np.cumsum([0] + [len(shingle_set) for shingle_set in sets[:-1]])
+                values = np.fromiter((value for shingle_set in sets for value in shingle_set), dtype=np.uint64)
+                hashed = (_A[:, None] * values[None, :] + _B[:, None]) % _PRIME
+                signatures = np.minimum.reduceat(hashed, offsets, axis=1)
+                for band, band_values in enumerate(self._band_values(signatures).tolist()):
+                    for position, value in zip(positions, band_values):
+                        self._buckets.setdefault((band, value), []).append(position)
+
+    def is_duplicate(self, question, threshold=None):
+        """True if question, or one at least threshold similar to it, is indexed."""
+        threshold = SIMILARITY_THRESHOLD if threshold is None else threshold
+        normalized = normalize_question(question)
+        if hashlib.sha1(normalized.encode("utf-8")).hexdigest() in self._hashes:
+            return True
+        shingle_set = _shingles_of(normalized)
+        if not shingle_set:
+            return False
+        with self._lock:
+            candidates = set()
+            for key in self._band_keys(minhash(shingle_set)):
+                candidates.update(self._buckets.get(key, ()))
+            return any(jaccard(shingle_set, self._shingles[i]) >= threshold for i in candidates)
+
+    def filter_new(self, questions):
+        """
+        Splits questions into ones not yet indexed and duplicates.
+
+        Questions that repeat an earlier one in the same list count as duplicates too.
+
+        Returns:
+            tuple: (new questions, duplicate questions), each in input order.
+        """
+        batch = QuestionIndex()
+        fresh, duplicates = [], []
+        for question in questions:
+            if self.is_duplicate(question) or batch.is_duplicate(question):
+                duplicates.append(question)
+            else:
+                fresh.append(question)
+                batch.add(question)
+        return fresh, duplicates
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats = {"checked": 0, "duplicates": 0, "replaced": 0, "repeated": 0}
+
+
+def get_user_index(user_id):
+    """
+    Returns the index of every question user_id has been asked, loading it
+    from the questions table on first use.
+    """
+    with _indexes_lock:
+        index = _indexes.get(user_id)
+        if index is None:
+            try:
+                past_questions = database.get_user_question_texts(user_id)
+            except Exception as e:
+                print(f"Warning: could not load question history for user {user_id}: {e}")
+                past_questions = []
+            index = _indexes[user_id] = QuestionIndex(past_questions)
+        return index
+
+
+def record_questions(user_id, questions):
+    """Adds questions a user has just been asked to their index."""
+    get_user_index(user_id).add_many(questions)
+
+
+def iter_new_questions(user_id, questions, num_questions, generate_fn=None):
+    """
+    Passes on the questions user_id has not been asked before, as they arrive.
+
+    Once questions is exhausted, the duplicates found are replaced with
+    questions from generate_fn; duplicates no replacement was found for are
+    yielded last, so the interview still gets its questions.
+
+    Args:
+        user_id: The user being interviewed.
+        questions (iterable): Candidate questions; closed once done with if it is a generator.
+        num_questions (int): Number of questions wanted.
+        generate_fn (callable): generate_fn(n, avoid) returning up to n new
+                                questions unlike the ones in avoid.
+
+    Yields:
+        str: Up to num_questions questions.
+    """
+    index = get_user_index(user_id)
+    batch = QuestionIndex()
+    candidates, duplicates = [], []
+    count = 0
+    try:
+        for question in questions:
+            if count >= num_questions:
+                break
+            candidates.append(question)
+            if index.is_duplicate(question) or batch.is_duplicate(question):
+                duplicates.append(question)
+                continue
+            batch.add(question)
+            count += 1
+            yield question
+    finally:
+        close = getattr(questions, "close", None)
+        if close is not None:
+            close()
+
+    shortfall = min(len(duplicates), num_questions - count)
+    replaced = 0
+    if shortfall > 0 and generate_fn is not None:
+        try:
+            replacements = generate_fn(shortfall, candidates) or []
+        except Exception as e:
+            print(f"Warning: could not replace repeated questions for user {user_id}: {e}")
+            replacements = []
+        for question in replacements:
+            if replaced >= shortfall:
+                break
+            if index.is_duplicate(question) or batch.is_duplicate(question):
+                continue
+            batch.add(question)
+            replaced += 1
+            yield question
+    repeated = duplicates[:shortfall - replaced] if shortfall > replaced else []
+    with _stats_lock:
+        _stats["checked"] += len(candidates)
+        _stats["duplicates"] += len(duplicates)
+        _stats["replaced"] += replaced
+        _stats["repeated"] += len(repeated)
+    yield from repeated
+
+
+def dedup_questions(user_id, questions, num_questions, generate_fn=None):
+    """List version of iter_new_questions."""
+    return list(iter_new_questions(user_id, questions, num_questions, generate_fn))
+
+
+def reset_indexes():
+    """Drops every loaded index so the next lookup reloads it from the database."""
+    with _indexes_lock:
+        _indexes.clear()
+
+
+def get_dedup_stats():
+    """
+    Returns:
+        dict: Questions checked, duplicates found among them, duplicates
+              replaced by new questions or kept for lack of one, and the
+              duplicate rate.
+    """
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["duplicate_rate"] = stats["duplicates"] / stats["checked"] if stats["checked"] else 0.0
+    return stats
+
+
+def reset_dedup_stats():
+    """Resets the dedup counters."""
+    with _stats_lock:
+        for name in _stats:
+            _stats[name] = 0
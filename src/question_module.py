@@ -1,18 +1,28 @@
 """
 Module for generating interview questions.
 """
-import re
 import sys
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # Handle imports regardless of how the module is run
 try:
     # Try relative import (when imported as part of package)
-    from .genai_client import generate_text
+    from .genai_client import generate_text, stream_text
+    from .prompt_budget import compact_job_description, compact_text, enforce_prompt_budget
+    from . import llm_metrics
+    from . import question_bank
+    from . import question_dedup
+    from . import question_pool
+    from . import question_retrieval
+    from .jd_analysis import summarize_job_description
+    from .question_parser import QuestionParser, parse_questions
 except ImportError:
     # Fallback to direct import (when run as script)
     import genai_client
     generate_text = genai_client.generate_text
+    stream_text = genai_client.stream_text
     # If that fails, try to import from the same directory
     if 'genai_client' not in sys.modules:
         # Add the parent directory to sys.path if needed
@@ -22,58 +32,98 @@ except ImportError:
         # Try again with direct import
         import genai_client
         generate_text = genai_client.generate_text
+        stream_text = genai_client.stream_text
+    from prompt_budget import compact_job_description, compact_text, enforce_prompt_budget
+    import llm_metrics
+    import question_bank
+    import question_dedup
+    import question_pool
+    import question_retrieval
+    from jd_analysis import summarize_job_description
+    from question_parser import QuestionParser, parse_questions
+
+# Where questions come from: "llm" (question bank, then the LLM), "retrieval"
+# (most relevant questions from the local dataset, no LLM call) or "seeded"
+# (the LLM, with relevant dataset questions included in the prompt as examples)
+QUESTION_SOURCE = os.getenv("QUESTION_SOURCE", "llm")
+SEED_EXAMPLES = 3
+
+# Adaptive interviews: difficulty levels in order, and the answer scores (out
+# of 10) at or above which the next question gets harder, or at or below
+# which it gets easier
+DIFFICULTY_LEVELS = ["Easy", "Medium", "Hard"]
+HARDER_AT_SCORE = 8
+EASIER_AT_SCORE = 4
+
+_adaptive_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="adaptive-prefetch")
 
 def parse_questions_from_text(text_response):
     """
     Parses a block of text from LLM into a list of questions.
-    Assumes questions are separated by newlines.
-    """
-    if not text_response:
-        return []
-    # Simple split by newline, removing empty lines and stripping whitespace
-    questions = [q.strip() for q in text_response.split('\n') if q.strip()]
-    # Further refinement might be needed based on LLM output format
-    # e.g., removing numbering like "1. Question text"
-    cleaned_questions = []
-    for q in questions:
-        if q.startswith(tuple(f"{i}." for i in range(1, 10))): # "1.", "2." etc.
-            cleaned_questions.append(q.split('.', 1)[1].strip())
-        elif q.startswith(tuple(f"{i})" for i in range(1, 10))): # "1)", "2)" etc.
-            cleaned_questions.append(q.split(')', 1)[1].strip())
-        else:
-            cleaned_questions.append(q)
-    return cleaned_questions
+
+    Numbered ("1.", "10)"), bulleted and markdown lists are accepted, as is a
+    JSON array of questions; see question_parser.
+    """
+    return parse_questions(text_response)
+
+
+def _has_questions(text_response):
+    """Whether a response contains any questions; only such responses are cached."""
+    return bool(parse_questions(text_response))
 
 
-def generate_questions(config, num_questions=5):
+def _build_question_messages(config, num_questions, examples=None, avoid=None):
     """
-    Generates interview questions using a GenAI model.
+    Builds the prompt asking the GenAI model for num_questions questions.
 
     Args:
-        config (dict): Interview configuration from config_module.
-        num_questions (int): Number of questions to generate.
-
-    Returns:
-        list: A list of generated interview questions (strings).
+        examples (list): Related questions to show the model as a reference for depth and topics.
+        avoid (list): Questions already asked in this interview, which must not be repeated.
     """
-    print(f"\n--- Generating {num_questions} Questions (Mistral AI) ---")
-    print(f"Configuration: Role - {config.get('job_role')}, Difficulty - {config.get('difficulty')}")
-    
-    questions = []
-    
-    # --- GenAI Integration using Mistral ---
+    # Pasted job descriptions can run to pages; the prompt gets their cached
+    # analysis (skills, seniority, topics, key sentences), or the key sentences
+    # alone when nothing in them was recognized
+    job_description = config.get('job_description')
+    summary = summarize_job_description(job_description, highlights=True)
+    if summary:
+        job_description_line = f"The job description summary is: {summary} "
+    else:
+        job_description_line = f"The job description is: '{compact_job_description(job_description) or 'Not provided'}'. "
     prompt_content = (
         f"You are an expert interviewer. Generate {num_questions} interview questions "
         f"for a candidate applying for the role of '{config.get('job_role')}'. "
         f"The desired difficulty level is '{config.get('difficulty')}'. "
-        f"The job description is: '{config.get('job_description', 'Not provided')}'. "
+        f"{job_description_line}"
         f"Focus on questions relevant to this role and difficulty. "
         f"Ensure each question is distinct and on a new line, without any introductory or concluding text, just the questions."
     )
+    if examples:
+        prompt_content += (
+            " For reference, these related questions come from our question library; "
+            "match their depth but do not repeat them:\n"
+            + "\n".join(f"- {compact_text(example, 80)}" for example in examples)
+        )
+    if avoid:
+        prompt_content += (
+            " These questions were already asked in this interview; do not repeat them:\n"
+            + "\n".join(f"- {compact_text(question, 60)}" for question in avoid)
+        )
     
-    messages = [{"role": "user", "content": prompt_content}]
-    
-    generated_text = generate_text(messages)
+    return enforce_prompt_budget([{"role": "user", "content": prompt_content}], "question_gen")
+
+
+def _generate_with_llm(config, num_questions, call_site="question_gen", examples=None, avoid=None):
+    """
+    Asks the GenAI model for questions.
+
+    Returns:
+        list: Up to num_questions parsed questions; empty if the call or parsing failed.
+    """
+    questions = []
+
+    # --- GenAI Integration using Mistral ---
+    messages = _build_question_messages(config, num_questions, examples, avoid)
+    generated_text = generate_text(messages, call_site=call_site, validate=_has_questions)
     
     if generated_text:
         questions = parse_questions_from_text(generated_text)
@@ -81,33 +131,530 @@ def generate_questions(config, num_questions=5):
             questions = questions[:num_questions]
         elif not questions:
             print("Warning: Mistral API returned text, but no questions could be parsed.")
+            llm_metrics.record_parse_failure(call_site)
     else:
         print("Error: Failed to generate questions from Mistral API.")
     # --- End GenAI Integration ---
+    return questions
+
+
+def _stream_with_llm(config, num_questions, examples=None):
+    """
+    Streams questions from the GenAI model, yielding each one as soon as its line is complete.
+
+    Yields:
+        str: Up to num_questions parsed questions; nothing if the call or parsing failed.
+    """
+    messages = _build_question_messages(config, num_questions, examples)
+    parser = QuestionParser()
+    received = False
+    count = 0
+    stream = stream_text(messages, call_site="question_gen", validate=_has_questions)
+    try:
+        for delta in stream:
+            received = True
+            for question in parser.feed(delta):
+                yield question
+                count += 1
+                if count >= num_questions:
+                    return
+        for question in parser.close()[:num_questions - count]:
+            yield question
+            count += 1
+    finally:
+        stream.close()  # Stops reading the response once enough questions have arrived
+
+    if not received:
+        print("Error: Failed to generate questions from Mistral API.")
+    elif not count:
+        print("Warning: Mistral API returned text, but no questions could be parsed.")
+        llm_metrics.record_parse_failure("question_gen")
+
+
+def _generate_for_bank(config, num_questions):
+    """Generates a batch of questions to restock the question bank."""
+    return _generate_with_llm(config, num_questions, call_site="question_bank")
+
+
+def _generate_for_pool(config, num_questions, avoid=None):
+    """Generates a large, varied batch of questions for a question pool, unlike the ones it holds."""
+    return _generate_with_llm(config, num_questions, call_site="question_pool", avoid=avoid)
+
+
+def _seed_pool(config, questions):
+    """Adds freshly generated questions to the pool that will serve config, creating it on a first request."""
+    if question_pool.ENABLED and questions:
+        question_pool.add_to_pool(config, questions, question_pool.find_pool(config))
+
+
+def _skips_asked(user_id, source):
+    """True if questions for user_id should be checked against the ones they were already asked."""
+    return question_dedup.ENABLED and user_id is not None and source != "retrieval"
+
+
+def _replacement_generator(config):
+    """generate_fn for question_dedup: new questions for config unlike the ones given."""
+    def generate(num_questions, avoid):
+        return _generate_with_llm(config, num_questions, call_site="question_dedup", avoid=avoid)
+    return generate
+
+
+def _fallback_questions(config, num_questions):
+    """Questions to use when the LLM produced none: dataset retrieval, then fixed placeholders."""
+    # Keep interviews relevant while the API is down
+    questions = question_retrieval.retrieve_questions(config, num_questions)
+    if questions:
+        print(f"Using {len(questions)} questions retrieved from the local dataset.")
+        return questions
+
+    print("Using fallback placeholder questions.")
+    if config.get("job_role", "").lower() == "software engineer":
+        questions = [
+            "Tell me about a challenging project you worked on.",
+            "How do you handle disagreements within your team?",
+            "Explain a complex technical concept to a non-technical person.",
+            "Describe your experience with [specific technology from job description, if any].",
+            f"What are your strengths and weaknesses as a {config.get('job_role')}?"
+        ]
+    else:
+         questions = [
+            f"What interests you about the {config.get('job_role')} role?",
+            "Describe a time you had to learn something new quickly.",
+            "How do you prioritize your tasks when working on multiple projects?",
+            "Where do you see yourself in 5 years?",
+            "Why should we hire you for this position?"
+        ]
+    return questions[:num_questions]
+
+
+def generate_questions(config, num_questions=5, source=None, user_id=None):
+    """
+    Generates interview questions using a GenAI model.
+
+    Questions are sampled from the configuration's question pool when one
+    exists, avoiding ones user_id has already been asked; on a miss they are
+    generated on the spot and added to the pool for later requests. With
+    pools disabled, the question bank takes their place: questions are served
+    from it when it holds enough for this role, difficulty and job
+    description, or generated on the spot, and the bank is topped up in the
+    background once it runs low. If the LLM fails, the most relevant questions from the local
+    dataset are used instead. Questions user_id was asked in an earlier
+    interview, or near rewordings of them, are replaced with new ones.
+
+    Args:
+        config (dict): Interview configuration from config_module.
+        num_questions (int): Number of questions to generate.
+        source (str): "llm", "retrieval" or "seeded"; defaults to QUESTION_SOURCE.
+        user_id: The user being interviewed, so questions are not repeated for them.
+
+    Returns:
+        list: A list of generated interview questions (strings).
+    """
+    source = source or QUESTION_SOURCE
+    if _skips_asked(user_id, source):
+        return question_dedup.dedup_questions(
+            user_id, _generate_questions(config, num_questions, source, user_id),
+            num_questions, _replacement_generator(config)
+        )
+    return _generate_questions(config, num_questions, source, user_id)
+
+
+def _uses_bank():
+    """The question bank is only used without pools: once a pool exists it answers every request first."""
+    return question_bank.ENABLED and not question_pool.ENABLED
+
+
+def _generate_questions(config, num_questions, source, user_id):
+    print(f"\n--- Generating {num_questions} Questions (Mistral AI) ---")
+    print(f"Configuration: Role - {config.get('job_role')}, Difficulty - {config.get('difficulty')}")
+    
+    questions = []
+    if source == "retrieval":
+        questions = question_retrieval.retrieve_questions(config, num_questions)
+        if questions:
+            print(f"Selected {len(questions)} questions from the local dataset.")
+            return questions
+
+    if question_pool.ENABLED:
+        questions = question_pool.sample_questions(config, num_questions, user_id, _generate_for_pool)
+        if questions:
+            print(f"Sampled {len(questions)} questions from the question pool.")
+            return questions
+
+    if _uses_bank():
+        questions = question_bank.take_questions(config, num_questions)
+        if questions:
+            print(f"Served {len(questions)} questions from the question bank.")
+
+    if not questions:
+        examples = question_retrieval.retrieve_questions(config, SEED_EXAMPLES) if source == "seeded" else None
+        questions = _generate_with_llm(config, num_questions, examples=examples)
+        _seed_pool(config, questions)
+
+    if _uses_bank():
+        question_bank.refill_if_low(config, _generate_for_bank)
 
     if not questions: # Fallback if API fails or parsing yields nothing
-        print("Using fallback placeholder questions.")
-        if config.get("job_role", "").lower() == "software engineer":
-            questions = [
-                "Tell me about a challenging project you worked on.",
-                "How do you handle disagreements within your team?",
-                "Explain a complex technical concept to a non-technical person.",
-                "Describe your experience with [specific technology from job description, if any].",
-                f"What are your strengths and weaknesses as a {config.get('job_role')}?"
-            ]
-        else:
-             questions = [
-                f"What interests you about the {config.get('job_role')} role?",
-                "Describe a time you had to learn something new quickly.",
-                "How do you prioritize your tasks when working on multiple projects?",
-                "Where do you see yourself in 5 years?",
-                "Why should we hire you for this position?"
-            ]
-        questions = questions[:num_questions]
+        questions = _fallback_questions(config, num_questions)
 
     print(f"{len(questions)} questions generated.")
     return questions
 
+
+def iter_questions(config, num_questions=5, source=None, user_id=None, speculative=False, generated=None):
+    """
+    Generates interview questions like generate_questions, yielding each one as soon as it exists.
+
+    Pooled, banked and retrieved questions are yielded at once; freshly generated
+    ones are streamed from the LLM, so the first question is available long
+    before the last one has been written.
+
+    Args:
+        speculative (bool): Generate for a configuration that may never be submitted:
+                            the question pool and bank are left untouched (nothing is
+                            sampled, marked as served, taken or refilled). Call
+                            restock_after_generation once the configuration is submitted.
+        generated (list): If given, the questions the LLM generated are appended to it.
+
+    Yields:
+        str: Up to num_questions interview questions.
+    """
+    source = source or QUESTION_SOURCE
+    if _skips_asked(user_id, source):
+        yield from question_dedup.iter_new_questions(
+            user_id, _iter_questions(config, num_questions, source, user_id, speculative, generated),
+            num_questions, _replacement_generator(config)
+        )
+    else:
+        yield from _iter_questions(config, num_questions, source, user_id, speculative, generated)
+
+
+def _iter_questions(config, num_questions, source, user_id, speculative=False, generated=None):
+    print(f"\n--- Generating {num_questions} Questions (Mistral AI, streaming) ---")
+    print(f"Configuration: Role - {config.get('job_role')}, Difficulty - {config.get('difficulty')}")
+
+    questions = []
+    if source == "retrieval":
+        questions = question_retrieval.retrieve_questions(config, num_questions)
+        if questions:
+            # Same as generate_questions: retrieval mode makes no LLM calls, bank refills included
+            yield from questions
+            return
+    if question_pool.ENABLED and not speculative:
+        questions = question_pool.sample_questions(config, num_questions, user_id, _generate_for_pool)
+        if questions:
+            yield from questions
+            return
+    if _uses_bank() and not speculative:
+        questions = question_bank.take_questions(config, num_questions)
+    yield from questions
+
+    count = len(questions)
+    if not count:
+        examples = question_retrieval.retrieve_questions(config, SEED_EXAMPLES) if source == "seeded" else None
+        generated = [] if generated is None else generated
+        for question in _stream_with_llm(config, num_questions, examples):
+            generated.append(question)
+            count += 1
+            yield question
+        if not speculative:
+            _seed_pool(config, generated)
+
+    if _uses_bank() and not speculative:
+        question_bank.refill_if_low(config, _generate_for_bank)
+
+    if not count:
+        yield from _fallback_questions(config, num_questions)
+
+
+def has_stored_questions(config, num_questions):
+    """True if the question pool (or, without pools, the bank) can serve config now, without an LLM call."""
+    if question_pool.ENABLED:
+        key = question_pool.find_pool(config)
+        return key is not None and question_pool.pool_size(key) >= num_questions
+    if _uses_bank():
+        return question_bank.count_questions(config) >= num_questions
+    return False
+
+
+def restock_after_generation(config, generated):
+    """
+    Does the restocking a request served by the LLM would have done.
+
+    Used when speculatively generated questions are claimed for a submitted
+    configuration: the questions the LLM generated seed the pool as on a pool
+    miss, or without pools the bank is refilled if it runs low.
+
+    Args:
+        config (dict): The submitted configuration.
+        generated (list): The questions the speculation's LLM call generated.
+    """
+    if question_pool.ENABLED:
+        _seed_pool(config, generated)
+    elif _uses_bank():
+        question_bank.refill_if_low(config, _generate_for_bank)
+
+
+def prefill_questions(config, max_calls=1):
+    """
+    Stocks the store generate_questions serves config from, ahead of demand.
+
+    Fills config's question pool (or, with pools disabled, its question bank)
+    up to its target size, making at most max_calls LLM calls.
+
+    Returns:
+        tuple: (LLM calls made, questions added).
+    """
+    calls = added = 0
+    if question_pool.ENABLED:
+        key = question_pool.find_pool(config)
+        pooled = question_pool.pool_questions(key) if key is not None else []
+        if max_calls > 0 and len(pooled) < question_pool.POOL_SIZE:
+            added = question_pool.add_to_pool(
+                config, _generate_for_pool(config, question_pool.POOL_SIZE - len(pooled), pooled), key
+            )
+            calls = 1
+        return calls, added
+
+    if question_bank.ENABLED:
+        while calls < max_calls and question_bank.count_questions(config) < question_bank.TARGET_SIZE:
+            new = question_bank.add_questions(config, _generate_for_bank(config, question_bank.REFILL_BATCH))
+            calls += 1
+            added += new
+            if not new:
+                break  # The LLM is failing or only repeating itself
+    return calls, added
+
+
+class QuestionStream:
+    """
+    Collects questions from iter_questions on a background thread.
+
+    questions is appended to as each question arrives, so a caller can start
+    the interview with the first question while the rest are still being
+    generated. generated holds the ones that came from the LLM rather than a
+    store or the fallbacks.
+    """
+
+    def __init__(self, config, num_questions=5, source=None, user_id=None, speculative=False):
+        self.num_questions = num_questions
+        self.questions = []
+        self.generated = []
+        self.error = None
+        self._callbacks = []
+        self._done = threading.Event()
+        self._cancelled = threading.Event()
+        self._changed = threading.Condition()
+        self._thread = threading.Thread(
+            target=self._run, args=(dict(config), num_questions, source, user_id, speculative), daemon=True,
+            name="question-stream"
+        )
+        self._thread.start()
+
+    def _run(self, config, num_questions, source, user_id, speculative):
+        questions = iter_questions(config, num_questions, source, user_id, speculative, self.generated)
+        try:
+            for question in questions:
+                if self._cancelled.is_set():
+                    break
+                with self._changed:
+                    self.questions.append(question)
+                    self._changed.notify_all()
+        except Exception as e:
+            print(f"Error: question generation failed: {e}")
+            self.error = e
+        finally:
+            questions.close()  # A cancelled stream stops reading the LLM response
+            with self._changed:
+                self._done.set()
+                self._changed.notify_all()
+                callbacks, self._callbacks = self._callbacks, []
+            for callback in callbacks:
+                self._run_callback(callback)
+
+    def _run_callback(self, callback):
+        try:
+            callback(self)
+        except Exception as e:
+            print(f"Error: question stream callback failed: {e}")
+
+    def add_done_callback(self, callback):
+        """Calls callback(stream) once no more questions will arrive; at once if that is already so."""
+        with self._changed:
+            if not self.done:
+                self._callbacks.append(callback)
+                return
+        self._run_callback(callback)
+
+    @property
+    def done(self):
+        """True once no more questions will arrive."""
+        return self._done.is_set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        """Stops generating; an LLM call already in flight is abandoned when its next chunk arrives."""
+        self._cancelled.set()
+
+    def expected_count(self):
+        """The number of questions the interview will have, as far as is known now."""
+        return len(self.questions) if self.done else self.num_questions
+
+    def wait_for(self, count, timeout=None):
+        """
+        Blocks until at least count questions have arrived or the stream is done.
+
+        Returns:
+            bool: True if count questions are available.
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: len(self.questions) >= count or self.done, timeout)
+            return len(self.questions) >= count
+
+
+def next_difficulty(difficulty, score):
+    """
+    Picks the next question's difficulty from the score of the previous answer.
+
+    Args:
+        difficulty (str): Current difficulty, one of DIFFICULTY_LEVELS.
+        score: The previous answer's score out of 10; anything non-numeric keeps the difficulty.
+
+    Returns:
+        str: The next difficulty.
+    """
+    try:
+        score = float(score)
+    except (TypeError, ValueError):
+        return difficulty
+    if difficulty not in DIFFICULTY_LEVELS:
+        return difficulty
+    level = DIFFICULTY_LEVELS.index(difficulty)
+    if score >= HARDER_AT_SCORE:
+        level = min(level + 1, len(DIFFICULTY_LEVELS) - 1)
+    elif score <= EASIER_AT_SCORE:
+        level = max(level - 1, 0)
+    return DIFFICULTY_LEVELS[level]
+
+
+class AdaptiveInterview:
+    """
+    Interview whose difficulty follows the candidate's scores.
+
+    Questions at the starting difficulty come from a QuestionStream. While the
+    candidate answers, one harder and one easier candidate for the next
+    question are generated in the background (plus one at the current level
+    once it differs from the starting one); advance() keeps the one the score
+    calls for and discards the rest. A candidate that is not ready yet is
+    never waited for: the next streamed question is used instead, so adapting
+    never adds an LLM call between questions.
+
+    Offers the same done / expected_count() / wait_for() / cancel() interface
+    as QuestionStream.
+    """
+
+    def __init__(self, config, num_questions, stream):
+        self.config = dict(config)
+        self.num_questions = num_questions
+        self.difficulty = config.get("difficulty")
+        self._base_difficulty = self.difficulty
+        self.questions = []
+        self.difficulties = []
+        self.stats = {"adapted": 0, "not_ready": 0, "discarded": 0}
+        self._stream = stream
+        self._base_used = 0
+        self._candidates = {}  # difficulty -> Future of a question list
+        self._exhausted = False
+        if self._take_base():
+            self._prefetch()
+        else:
+            self._exhausted = True
+
+    def _take_base(self):
+        """Appends the next unused question at the starting difficulty; False if there is none."""
+        while self._stream.wait_for(self._base_used + 1):
+            question = self._stream.questions[self._base_used]
+            self._base_used += 1
+            if question not in self.questions:
+                self.questions.append(question)
+                self.difficulties.append(self._base_difficulty)
+                return True
+        return False
+
+    def _prefetch(self):
+        """Starts generating the candidates for the next question at each difficulty it may have."""
+        if len(self.questions) >= self.num_questions:
+            return
+        asked = list(self.questions)
+        for score in (HARDER_AT_SCORE, None, EASIER_AT_SCORE):
+            difficulty = next_difficulty(self.difficulty, score)
+            if difficulty != self._base_difficulty and difficulty not in self._candidates:
+                config = dict(self.config, difficulty=difficulty)
+                self._candidates[difficulty] = _adaptive_executor.submit(
+                    _generate_with_llm, config, 1, "question_adaptive", None, asked
+                )
+
+    def _take_candidate(self, difficulty):
+        """Returns the prefetched question for difficulty if it is ready, discarding the other candidates."""
+        chosen = self._candidates.pop(difficulty, None)
+        for future in self._candidates.values():
+            future.cancel()
+            self.stats["discarded"] += 1
+        self._candidates = {}
+        if chosen is None:
+            return None
+        if not chosen.done():
+            chosen.cancel()
+            self.stats["not_ready"] += 1
+            return None
+        questions = chosen.result() if not chosen.cancelled() else []
+        if questions and questions[0] not in self.questions:
+            return questions[0]
+        return None
+
+    def advance(self, score):
+        """
+        Adds the next question, chosen by the score of the answer to the last one.
+
+        Returns:
+            str: The next question, or None if the interview is complete.
+        """
+        if self.done:
+            return None
+        target = next_difficulty(self.difficulty, score)
+        if target != self.difficulty:
+            self.stats["adapted"] += 1
+        self.difficulty = target
+        question = self._take_candidate(target)
+        if question is not None:
+            self.questions.append(question)
+            self.difficulties.append(target)
+        elif not self._take_base():
+            self._exhausted = True
+            return None
+        self._prefetch()
+        return self.questions[-1]
+
+    @property
+    def done(self):
+        return self._exhausted or len(self.questions) >= self.num_questions
+
+    def expected_count(self):
+        return len(self.questions) if self.done else self.num_questions
+
+    def wait_for(self, count, timeout=None):
+        # Questions are added by advance(), never in the background
+        return len(self.questions) >= count
+
+    def cancel(self):
+        """Stops the base stream and discards any prefetched candidates."""
+        self._stream.cancel()
+        self._take_candidate(None)
+
+
 if __name__ == '__main__':
     # Example usage (for testing this module directly)
     sample_config = {
@@ -0,0 +1,171 @@
+"""
+Incremental, format-tolerant parsing of the question lists the LLM returns.
+
+The prompt asks for one question per line, but responses vary: numbering
+with "." or ")" (past 9 as well), "Q3:" labels, bullets, markdown bold and
+headings, bold category labels, a preamble line, or a JSON array (bare, fenced, of objects, or
+under a "questions" key). QuestionParser takes the response in chunks as it
+streams in and hands back each question as soon as its line, or its JSON
+string, is complete.
+"""
+import re
+import json
+
+# List markers in front of a question: "1.", "10)", "[2]", "Q3:", "Question 4 -", "- ", "* ", "•", "> ", "## "
+_MARKER = re.compile(
+    r"^(?:[-*+•>]\s+|•\s*|#+\s*|\[\d+\]\s*|(?:q(?:uestion)?\s*)?\d+(?:[.)]|\s*[:\-–]\s)\s*|q\d+\s*:\s*)",
+    re.IGNORECASE
+)
+# A bold category label ahead of the question, after any list marker: "- **Databases:** How ...?"
+_LABEL = re.compile(
+    r"^((?:[-*+•>]\s+|(?:q(?:uestion)?\s*)?\d+[.)]\s*)?)(?:\*\*|__)[^*_?]+?(?::(?:\*\*|__)|(?:\*\*|__):)\s*(?=\S)",
+    re.IGNORECASE
+)
+_EMPHASIS = re.compile(r"\*\*|__")
+_JSON_STRING = re.compile(r'"(?:[^"\\]|\\.)*"')
+# JSON object keys whose string values are questions
+QUESTION_KEYS = frozenset({"question", "questions", "text", "q"})
+
+
+def clean_line(line):
+    """
+    Strips list markers, bold category labels, markdown and quotes from one line of a response.
+
+    Returns:
+        str: The question on the line, or "" if the line holds none (blank
+             lines, code fences, headings and preambles such as "Here are
+             your questions:").
+    """
+    text = line.strip()
+    if not text or text.startswith("```"):
+        return ""
+    heading = text.startswith("#")
+    text = _LABEL.sub(r"\1", text, count=1)
+    text = _EMPHASIS.sub("", text).strip()
+    previous = None
+    while previous != text:
+        previous = text
+        text = _MARKER.sub("", text, count=1).strip()
+    text = text.strip('"').rstrip(",").strip().strip('"').strip()
+    if not text.endswith("?") and (heading or text.endswith(":")):
+        return ""
+    return text
+
+
+class QuestionParser:
+    """
+    Parses an LLM response into questions as it arrives.
+
+    Call feed() with each chunk and close() once the response is complete;
+    both return the questions completed by that call.
+    """
+
+    def __init__(self):
+        self._pending = ""
+        self._mode = None  # "lines" or "json", decided by the first meaningful character
+        self._key = None   # Last JSON object key seen
+        self._value = None  # JSON string waiting to find out whether it is a key or a value
+        self._text = ""     # The response so far, while JSON parsing has found nothing
+        self._found = 0
+
+    def feed(self, chunk):
+        """Adds a chunk of the response; returns the questions it completed."""
+        return self._parse(chunk or "", final=False)
+
+    def close(self):
+        """Ends the response; returns the questions left in it."""
+        return self._parse("", final=True)
+
+    def _parse(self, chunk, final):
+        self._pending += chunk
+        if not self._found:
+            self._text += chunk
+        if self._mode is None and not self._detect_mode(final):
+            return []
+        if self._mode == "lines":
+            questions = self._parse_lines(final)
+        else:
+            questions = self._parse_json(final)
+            if final and not self._found and not questions:
+                # Started like JSON but was not, e.g. "[1] What is...": read it as lines instead
+                self._pending = self._text
+                questions = self._parse_lines(final)
+        self._found += len(questions)
+        if self._found:
+            self._text = ""
+        return questions
+
+    def _detect_mode(self, final=False):
+        # Skip whitespace and markdown code fences (```json) to find how the response starts
+        text = self._pending.lstrip()
+        while text.startswith("```"):
+            if "\n" not in text:
+                return False
+            text = text.split("\n", 1)[1].lstrip()
+        if not final and "```".startswith(text):
+            return False  # Nothing yet, or what may be the start of a fence
+        self._mode = "json" if text[:1] in ("[", "{") else "lines"
+        if self._mode == "json":
+            self._pending = text
+        return True
+
+    def _parse_lines(self, final):
+        if final:
+            lines, self._pending = self._pending.split("\n"), ""
+        elif "\n" in self._pending:
+            complete, self._pending = self._pending.rsplit("\n", 1)
+            lines = complete.split("\n")
+        else:
+            return []
+        return [question for question in map(clean_line, lines) if question]
+
+    def _parse_json(self, final):
+        questions = []
+        position = 0
+        while True:
+            if self._value is not None:
+                # A string followed by ":" is a key; by anything else, a value
+                rest = self._pending[position:].lstrip()
+                if not rest and not final:
+                    break
+                position = len(self._pending) - len(rest)
+                if rest[:1] == ":":
+                    self._key = self._value
+                elif self._key is None or self._key.lower() in QUESTION_KEYS:
+                    question = clean_line(self._value)
+                    if question:
+                        questions.append(question)
+                self._value = None
+            match = _JSON_STRING.search(self._pending, position)
+            if match is None:
+                break
+            try:
+                self._value = json.loads(match.group())
+            except ValueError:
+                self._value = match.group()[1:-1]
+            position = match.end()
+            if not isinstance(self._value, str):
+                self._value = None
+        # Every complete string before position was consumed, so a quote after it opens an unfinished one
+        start = self._pending.find('"', position)
+        self._pending = self._pending[start:] if start != -1 else ""
+        return questions
+
+
+def parse_questions(text):
+    """Parses a complete response into a list of questions."""
+    parser = QuestionParser()
+    return parser.feed(text or "") + parser.close()
+
+
+def iter_parsed_questions(chunks):
+    """
+    Parses a response streamed as chunks of text.
+
+    Yields:
+        str: Each question as soon as it is complete.
+    """
+    parser = QuestionParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
@@ -0,0 +1,333 @@
+"""
+Large question pools per interview configuration, sampled without repeats per user.
+
+The questions generated on the spot for a configuration's first request
+seed its pool. Later requests for the same configuration, or one whose job
+description is nearly the same, draw random distinct subsets from it. Each
+user's served questions are tracked so nobody sees a question twice until
+they have been through the whole pool. When a user is running low on unseen
+questions the pool is topped up in the background with questions unlike the
+ones it holds; a pool keeps at most POOL_SIZE questions, the oldest being
+evicted first.
+
+Unlike the question bank, serving does not use questions up, so one LLM call
+keeps a popular configuration varied for many interviews.
+"""
+import os
+import time
+import random
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from . import database
+    from . import question_bank
+except ImportError:
+    import database
+    import question_bank
+
+ENABLED = os.getenv("QUESTION_POOL_ENABLED", "1") != "0"
+DB_PATH = os.getenv("QUESTION_POOL_DB_PATH", database.DB_PATH)
+
+# Questions requested from the LLM when a pool is refreshed, and the most a pool keeps
+POOL_SIZE = int(os.getenv("QUESTION_POOL_SIZE", "30"))
+# Word overlap (Jaccard) between job descriptions for a pool to be shared
+SIMILARITY_THRESHOLD = 0.8
+ANONYMOUS_USER = "anonymous"
+
+_refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="question-pool-refresh")
+_pending_refreshes = set()
+_lock = threading.Lock()
+_initialized_path = None
+_stats = {"hits": 0, "misses": 0, "cycles": 0, "refreshes": 0, "refreshed_questions": 0, "evicted": 0}
+
+
+def _connect():
+    """Opens a connection to the pools' database, creating their tables on first use."""
+    global _initialized_path
+    conn = sqlite3.connect(DB_PATH, timeout=10)
+    if _initialized_path != DB_PATH:
+        conn.executescript('''
+        CREATE TABLE IF NOT EXISTS question_pools (
+            pool_key TEXT PRIMARY KEY,
+            job_role TEXT NOT NULL,
+            difficulty TEXT NOT NULL,
+            jd_words TEXT NOT NULL,
+            created_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS question_pool_questions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            pool_key TEXT NOT NULL,
+            question_text TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            UNIQUE (pool_key, question_text)
+        );
+        CREATE TABLE IF NOT EXISTS question_pool_served (
+            user_key TEXT NOT NULL,
+            pool_key TEXT NOT NULL,
+            question_text TEXT NOT NULL,
+            served_at REAL NOT NULL,
+            PRIMARY KEY (user_key, pool_key, question_text)
+        );
+        ''')
+        conn.commit()
+        _initialized_path = DB_PATH
+    return conn
+
+
+def _count_stat(name, amount=1):
+    with _lock:
+        _stats[name] += amount
+
+
+def _user_key(user_id):
+    return ANONYMOUS_USER if user_id is None else str(user_id)
+
+
+def _jaccard(a, b):
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def find_pool(config):
+    """
+    Finds the pool serving config: its own, or else the pool for the same role
+    and difficulty whose job description overlaps it the most, if that overlap
+    reaches SIMILARITY_THRESHOLD.
+
+    Returns:
+        str: The pool key, or None if no pool fits.
+    """
+    key = question_bank.bucket_key(config)
+    role = question_bank.normalize_text(config.get("job_role"))
+    difficulty = question_bank.normalize_text(config.get("difficulty"))
+    words = question_bank.jd_words(config.get("job_description"))
+    conn = _connect()
+    try:
+        rows = conn.execute(
+            "SELECT pool_key, jd_words FROM question_pools WHERE job_role = ? AND difficulty = ?",
+            (role, difficulty)
+        ).fetchall()
+    finally:
+        conn.close()
+
+    best_key, best_score = None, SIMILARITY_THRESHOLD
+    for pool_key, jd_words in rows:
+        if pool_key == key:
+            return key
+        score = _jaccard(words, set(jd_words.split()))
+        if score >= best_score:
+            best_key, best_score = pool_key, score
+    return best_key
+
+
+def add_to_pool(config, questions, key=None):
+    """
+    Adds questions to a pool, creating the pool for config if needed.
+
+    If the pool then holds more than POOL_SIZE questions, the oldest are
+    evicted, along with their served-question history.
+
+    Args:
+        config (dict): Interview configuration the questions were generated for.
+        questions (list): Questions to add; ones already in the pool are ignored.
+        key (str): Pool to add to; defaults to config's own pool.
+
+    Returns:
+        int: Number of questions added.
+    """
+    key = key or question_bank.bucket_key(config)
+    now = time.time()
+    conn = _connect()
+    try:
+        conn.execute(
+            "INSERT OR IGNORE INTO question_pools (pool_key, job_role, difficulty, jd_words, created_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (key, question_bank.normalize_text(config.get("job_role")),
+             question_bank.normalize_text(config.get("difficulty")),
+             " ".join(sorted(question_bank.jd_words(config.get("job_description")))), now)
+        )
+        before = conn.total_changes
+        conn.executemany(
+            "INSERT OR IGNORE INTO question_pool_questions (pool_key, question_text, created_at) VALUES (?, ?, ?)",
+            [(key, question.strip(), now) for question in questions if question and question.strip()]
+        )
+        added = conn.total_changes - before
+        evicted = conn.execute(
+            "DELETE FROM question_pool_questions WHERE pool_key = ? AND id NOT IN "
+            "(SELECT id FROM question_pool_questions WHERE pool_key = ? ORDER BY id DESC LIMIT ?)",
+            (key, key, POOL_SIZE)
+        ).rowcount
+        if evicted:
+            conn.execute(
+                "DELETE FROM question_pool_served WHERE pool_key = ? AND question_text NOT IN "
+                "(SELECT question_text FROM question_pool_questions WHERE pool_key = ?)",
+                (key, key)
+            )
+        conn.commit()
+    finally:
+        conn.close()
+    if evicted:
+        _count_stat("evicted", evicted)
+    return added
+
+
+def pool_questions(key):
+    """Returns a pool's questions, oldest first."""
+    conn = _connect()
+    try:
+        return [row[0] for row in conn.execute(
+            "SELECT question_text FROM question_pool_questions WHERE pool_key = ? ORDER BY id", (key,)
+        )]
+    finally:
+        conn.close()
+
+
+def pool_size(key):
+    """Returns how many questions a pool holds."""
+    conn = _connect()
+    try:
+        return conn.execute("SELECT COUNT(*) FROM question_pool_questions WHERE pool_key = ?", (key,)).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def sample_questions(config, num_questions, user_id=None, generate_fn=None):
+    """
+    Draws num_questions distinct questions for config that user_id has not been served yet.
+
+    Once fewer than num_questions unseen questions would be left for the
+    user, the pool is refreshed in the background (if generate_fn is given).
+    When they run out, a full pool completes the request with repeats and
+    starts the user's history for it over. When no pool fits config, or the
+    pool is too small to serve the request, nothing is generated here: the
+    caller generates the questions itself and seeds the pool with them
+    through add_to_pool.
+
+    Args:
+        config (dict): Interview configuration.
+        num_questions (int): Number of questions wanted.
+        user_id: The user being served; None shares one anonymous history.
+        generate_fn (callable): generate_fn(config, n, avoid) returning a list of
+                                new questions unlike the ones in avoid.
+
+    Returns:
+        list: The questions, or [] if no pool can serve the request yet.
+    """
+    key = find_pool(config)
+    if key is None:
+        _count_stat("misses")
+        return []
+
+    user_key = _user_key(user_id)
+    conn = _connect()
+    conn.isolation_level = None  # Explicit transaction so a user's concurrent sessions see one history
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        pool = [row[0] for row in conn.execute(
+            "SELECT question_text FROM question_pool_questions WHERE pool_key = ? ORDER BY id", (key,)
+        )]
+        served = {row[0] for row in conn.execute(
+            "SELECT question_text FROM question_pool_served WHERE user_key = ? AND pool_key = ?", (user_key, key)
+        )}
+        unseen = [question for question in pool if question not in served]
+        if len(pool) < num_questions or (len(unseen) < num_questions and len(pool) < POOL_SIZE):
+            # Too small to serve, or to start the user over on: the caller's generation grows it instead
+            conn.execute("ROLLBACK")
+            _count_stat("misses")
+            return []
+
+        picked = random.sample(unseen, min(num_questions, len(unseen)))
+        exhausted = len(picked) < num_questions
+        running_low = len(unseen) - len(picked) < num_questions
+        if exhausted:
+            # The user has seen everything: finish with repeats and start their next cycle through the pool
+            rest = [question for question in pool if question not in picked]
+            picked += random.sample(rest, num_questions - len(picked))
+            conn.execute("DELETE FROM question_pool_served WHERE user_key = ? AND pool_key = ?", (user_key, key))
+        now = time.time()
+        conn.executemany(
+            "INSERT OR REPLACE INTO question_pool_served (user_key, pool_key, question_text, served_at) "
+            "VALUES (?, ?, ?, ?)",
+            [(user_key, key, question, now) for question in picked]
+        )
+        conn.execute("COMMIT")
+    finally:
+        conn.close()
+
+    _count_stat("hits")
+    if exhausted:
+        _count_stat("cycles")
+    if running_low and generate_fn is not None:
+        # Top the pool up before the user's next interview needs it
+        schedule_refresh(config, generate_fn, key)
+    return picked
+
+
+def clear_pools():
+    """Removes every pool and all served-question history."""
+    conn = _connect()
+    try:
+        conn.executescript(
+            "DELETE FROM question_pool_served; DELETE FROM question_pool_questions; DELETE FROM question_pools;"
+        )
+    finally:
+        conn.close()
+
+
+def _refresh(config, generate_fn, key):
+    """Adds POOL_SIZE newly generated questions, unlike the ones it holds, to a pool."""
+    try:
+        added = add_to_pool(config, generate_fn(config, POOL_SIZE, pool_questions(key)) or [], key)
+        _count_stat("refreshed_questions", added)
+    except Exception as e:
+        print(f"Warning: question pool refresh failed for '{key}': {e}")
+    finally:
+        with _lock:
+            _pending_refreshes.discard(key)
+
+
+def schedule_refresh(config, generate_fn, key=None):
+    """
+    Tops up a pool in the background, unless that pool is already being refreshed.
+
+    Args:
+        config (dict): Interview configuration to generate questions for.
+        generate_fn (callable): generate_fn(config, n, avoid) returning a list of
+                                new questions unlike the ones in avoid.
+        key (str): Pool to refresh; defaults to config's own pool.
+
+    Returns:
+        concurrent.futures.Future: The refresh job, or None if one was already pending.
+    """
+    key = key or question_bank.bucket_key(config)
+    with _lock:
+        if key in _pending_refreshes:
+            return None
+        _pending_refreshes.add(key)
+        _stats["refreshes"] += 1
+    return _refresh_executor.submit(_refresh, dict(config), generate_fn, key)
+
+
+def get_pool_stats():
+    """
+    Returns:
+        dict: Requests served from a pool (hits), requests no pool could serve
+              (misses), users starting a new cycle through a pool, refreshes
+              started, questions they added and questions evicted to keep
+              pools at POOL_SIZE.
+    """
+    with _lock:
+        stats = dict(_stats)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+    return stats
+
+
+def reset_pool_stats():
+    """Resets the pool counters."""
+    with _lock:
+        for name in _stats:
+            _stats[name] = 0
@@ -0,0 +1,238 @@
+"""
+TF-IDF retrieval over the local interview question dataset.
+
+Builds an L2-normalized TF-IDF matrix (NumPy) over the questions in
+dataset/interview_qa_dataset.csv and answers queries by cosine similarity,
+so relevant questions can be picked for a job description in a few
+milliseconds without calling the LLM. The index is persisted next to the
+dataset and rebuilt automatically when the dataset changes.
+"""
+import os
+import re
+import csv
+import math
+import threading
+from collections import Counter
+
+import numpy as np
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATASET_PATH = os.getenv("QUESTION_DATASET_PATH", os.path.join(_REPO_ROOT, "dataset", "interview_qa_dataset.csv"))
+INDEX_PATH = os.getenv("QUESTION_INDEX_PATH", os.path.join(_REPO_ROOT, "dataset", "question_index.npz"))
+# Vocabulary cap: the most document-frequent terms are kept
+MAX_FEATURES = 5000
+# Weight of the job role's vector relative to the job description's in a query
+ROLE_WEIGHT = float(os.getenv("QUESTION_RETRIEVAL_ROLE_WEIGHT", "2"))
+
+STOP_WORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being below between
+both but by can could did do does doing down during each few for from further had has have having he her here
+hers him his how i if in into is it its itself just me more most my no nor not now of off on once only or other
+our out over own same she should so some such than that the their them then there these they this those through
+to too under until up very was we were what when where which while who whom why will with would you your
+explain describe discuss tell give example examples walk us please additionally
+""".split())
+
+_TOKEN = re.compile(r"[a-z][a-z0-9+#]*")
+
+
+def tokenize(text):
+    """Lower-cased word tokens of text, without stop words."""
+    return [token for token in _TOKEN.findall((text or "").lower()) if token not in STOP_WORDS and len(token) > 1]
+
+
+def load_questions(dataset_path=None):
+    """
+    Reads the distinct questions from the dataset CSV, in file order.
+
+    Returns:
+        list: Question strings.
+    """
+    questions = []
+    seen = set()
+    with open(dataset_path or DATASET_PATH, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            question = (row.get("question") or "").strip()
+            if question and question not in seen:
+                seen.add(question)
+                questions.append(question)
+    return questions
+
+
+def _source_fingerprint(dataset_path):
+    """Identifies a version of the dataset file by its size and modification time."""
+    stat = os.stat(dataset_path)
+    return f"{stat.st_size}:{int(stat.st_mtime)}"
+
+
+class QuestionIndex:
+    """TF-IDF vectors for a fixed list of questions."""
+
+    def __init__(self, questions, vocabulary, idf, matrix):
+        self.questions = list(questions)
+        self.vocabulary = vocabulary  # term -> column
+        self.idf = idf
+        self.matrix = matrix  # rows are L2-normalized TF-IDF vectors
+
+    @classmethod
+    def build(cls, questions, max_features=MAX_FEATURES):
+        """Builds the index for questions."""
+        tokenized = [tokenize(question) for question in questions]
+        document_frequency = Counter(term for tokens in tokenized for term in set(tokens))
+        terms = sorted(document_frequency, key=lambda term: (-document_frequency[term], term))[:max_features]
+        vocabulary = {term: i for i, term in enumerate(terms)}
+
+        n = len(questions)
+        idf = np.array([math.log((1 + n) / (1 + document_frequency[term])) + 1 for term in terms], dtype=np.float32)
+        matrix = np.zeros((n, len(terms)), dtype=np.float32)
+        for row, tokens in enumerate(tokenized):
+            for term, count in Counter(tokens).items():
+                column = vocabulary.get(term)
+                if column is not None:
+                    matrix[row, column] = count
+        matrix *= idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.where(norms == 0, 1, norms)
+        return cls(questions, vocabulary, idf, matrix)
+
+    def vectorize(self, text):
+        """Returns the L2-normalized TF-IDF vector of text."""
+        vector = np.zeros(len(self.vocabulary), dtype=np.float32)
+        for term, count in Counter(tokenize(text)).items():
+            column = self.vocabulary.get(term)
+            if column is not None:
+                vector[column] = count * self.idf[column]
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def search(self, text, k=5, exclude=None):
+        """
+        Finds the questions most similar to text.
+
+        Args:
+            text (str): Query text, e.g. job role plus job description.
+            k (int): Number of questions to return.
+            exclude (iterable): Questions that must not be returned.
+
+        Returns:
+            list: (question, cosine similarity) pairs, best first. Questions with
+                  no term in common with the query are never returned.
+        """
+        return self.search_vector(self.vectorize(text), k, exclude)
+
+    def search_vector(self, vector, k=5, exclude=None):
+        """Like search, for a query that is already an L2-normalized vector."""
+        scores = self.matrix @ vector
+        excluded = set(exclude or ())
+        results = []
+        for row in np.argsort(-scores, kind="stable"):
+            if scores[row] <= 0 or len(results) >= k:
+                break
+            if self.questions[row] not in excluded:
+                results.append((self.questions[row], float(scores[row])))
+        return results
+
+    def save(self, path, source_fingerprint=""):
+        terms = sorted(self.vocabulary, key=self.vocabulary.get)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez_compressed(
+            tmp_path,
+            questions=np.array(self.questions, dtype=str),
+            terms=np.array(terms, dtype=str),
+            idf=self.idf,
+            matrix=self.matrix,
+            source=np.array(source_fingerprint),
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads a saved index.
+
+        Returns:
+            tuple: (QuestionIndex, fingerprint of the dataset it was built from).
+        """
+        with np.load(path) as data:
+            vocabulary = {term: i for i, term in enumerate(data["terms"].tolist())}
+            index = cls(data["questions"].tolist(), vocabulary, data["idf"], data["matrix"])
+            return index, str(data["source"])
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index():
+    """
+    Returns the shared index, loading it from INDEX_PATH or building (and saving) it on first use.
+
+    Returns:
+        QuestionIndex: The index, or None if the dataset is unavailable.
+    """
+    global _index
+    if _index is not None:
+        return _index
+    with _index_lock:
+        if _index is None:
+            try:
+                fingerprint = _source_fingerprint(DATASET_PATH)
+            except OSError as e:
+                print(f"Warning: question dataset not available for retrieval: {e}")
+                return None
+            try:
+                index, saved_fingerprint = QuestionIndex.load(INDEX_PATH)
+                if saved_fingerprint == fingerprint:
+                    _index = index
+            except (OSError, KeyError, ValueError):
+                pass
+            if _index is None:
+                _index = QuestionIndex.build(load_questions(DATASET_PATH))
+                try:
+                    _index.save(INDEX_PATH, fingerprint)
+                except OSError as e:
+                    print(f"Warning: could not save question index to {INDEX_PATH}: {e}")
+    return _index
+
+
+def reset_index():
+    """Drops the in-memory index so the next call reloads it."""
+    global _index
+    with _index_lock:
+        _index = None
+
+
+def build_query_vector(index, config, role_weight=None):
+    """
+    Query vector for an interview configuration.
+
+    The role and the description are vectorized separately, each L2-normalized,
+    and combined as role_weight * role + description, so the role keeps the same
+    pull on the results however long the description is.
+
+    Returns:
+        numpy.ndarray: The L2-normalized query vector.
+    """
+    role_weight = ROLE_WEIGHT if role_weight is None else role_weight
+    vector = role_weight * index.vectorize(config.get("job_role")) + index.vectorize(config.get("job_description"))
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def retrieve_questions(config, num_questions=5, exclude=None):
+    """
+    Picks the dataset questions most relevant to an interview configuration.
+
+    Args:
+        config (dict): Interview configuration with job_role and job_description.
+        num_questions (int): Number of questions wanted.
+        exclude (iterable): Questions to leave out.
+
+    Returns:
+        list: Up to num_questions questions, most relevant first.
+    """
+    index = get_index()
+    if index is None:
+        return []
+    query = build_query_vector(index, config)
+    return [question for question, _ in index.search_vector(query, num_questions, exclude)]
@@ -0,0 +1,235 @@
+"""
+Process-wide rate limiting for GenAI API calls.
+
+Each API gets one shared limiter that enforces both a requests-per-minute
+and a tokens-per-minute budget using token buckets. When the API answers 429
+the limiter pauses all callers (honouring Retry-After when present) and lowers its own rate, then
+recovers it gradually as calls succeed.
+"""
+import os
+import time
+import asyncio
+import threading
+from email.utils import parsedate_to_datetime
+
+REQUESTS_PER_MINUTE = float(os.getenv("MISTRAL_RPM", "60"))
+TOKENS_PER_MINUTE = float(os.getenv("MISTRAL_TPM", "500000"))
+# Bucket capacity, in seconds' worth of budget; bounds how bursty callers can be
+BURST_SECONDS = float(os.getenv("MISTRAL_BURST_SECONDS", "10"))
+# Pause applied after a 429 that carries no usable Retry-After header
+DEFAULT_THROTTLE_PAUSE = 2.0
+# Tokens assumed for a completion when the caller does not set max_tokens
+DEFAULT_COMPLETION_TOKENS = 400
+
+MIN_RATE_FACTOR = 0.1
+RATE_DECREASE = 0.5
+RATE_RECOVERY = 0.05
+
+
+def estimate_tokens(text):
+    """Roughly estimates the token count of a text (about four characters per token)."""
+    if not text:
+        return 0
+    return max(1, len(text) // 4)
+
+
+def estimate_request_tokens(prompt_messages, max_tokens=None):
+    """
+    Estimates the tokens a chat completion request will consume.
+
+    Args:
+        prompt_messages (list): The prompt messages.
+        max_tokens (int): The completion limit sent with the request, if any.
+
+    Returns:
+        int: Estimated prompt plus completion tokens.
+    """
+    prompt_tokens = sum(estimate_tokens(m.get("content", "")) for m in prompt_messages)
+    return prompt_tokens + (max_tokens or DEFAULT_COMPLETION_TOKENS)
+
+
+def parse_retry_after(value):
+    """
+    Converts a Retry-After header value to seconds.
+
+    Returns:
+        float: Seconds to wait, or None if the header is missing or unparseable.
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """Token-bucket limiter for request and token budgets per minute."""
+
+    def __init__(self, requests_per_minute, tokens_per_minute, burst_seconds=BURST_SECONDS, clock=time.monotonic):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._request_capacity = max(1.0, requests_per_minute * burst_seconds / 60)
+        self._token_capacity = max(1.0, tokens_per_minute * burst_seconds / 60)
+        self._request_level = self._request_capacity
+        self._token_level = self._token_capacity
+        self._last_refill = clock()
+        self._paused_until = 0.0
+        self._rate_factor = 1.0
+        self._stats = {"acquired": 0, "waits": 0, "wait_seconds": 0.0, "throttled": 0}
+
+    def _refill(self, now):
+        elapsed = max(now - self._last_refill, 0.0)
+        self._last_refill = now
+        self._request_level = min(
+            self._request_capacity,
+            self._request_level + elapsed * self.requests_per_minute * self._rate_factor / 60
+        )
+        self._token_level = min(
+            self._token_capacity,
+            self._token_level + elapsed * self.tokens_per_minute * self._rate_factor / 60
+        )
+
+    def reserve(self, tokens=0):
+        """
+        Takes one request and the given tokens from the budget if available.
+
+        Args:
+            tokens (int): Estimated tokens for the request.
+
+        Returns:
+            float: 0 if the budget was taken, otherwise the seconds to wait before trying again.
+        """
+        tokens = min(tokens, self._token_capacity)
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            if now < self._paused_until:
+                return self._paused_until - now
+            request_rate = self.requests_per_minute * self._rate_factor / 60
+            token_rate = self.tokens_per_minute * self._rate_factor / 60
+            wait = max(
+                (1 - self._request_level) / request_rate if self._request_level < 1 else 0.0,
+                (tokens - self._token_level) / token_rate if self._token_level < tokens else 0.0,
+            )
+            if wait > 0:
+                return wait
+            self._request_level -= 1
+            self._token_level -= tokens
+            self._stats["acquired"] += 1
+            return 0.0
+
+    def _record_wait(self, seconds):
+        with self._lock:
+            self._stats["waits"] += 1
+            self._stats["wait_seconds"] += seconds
+
+    def acquire(self, tokens=0):
+        """Blocks until one request and the given tokens fit within the budget."""
+        while True:
+            wait = self.reserve(tokens)
+            if wait <= 0:
+                return
+            self._record_wait(wait)
+            time.sleep(wait)
+
+    async def aacquire(self, tokens=0):
+        """Async variant of acquire() that waits without blocking the event loop."""
+        while True:
+            wait = self.reserve(tokens)
+            if wait <= 0:
+                return
+            self._record_wait(wait)
+            await asyncio.sleep(wait)
+
+    def record_usage(self, estimated_tokens, actual_tokens):
+        """
+        Corrects the token bucket once the real usage of a request is known.
+
+        Also counts as a successful call, letting a throttled rate recover.
+        """
+        with self._lock:
+            if actual_tokens is not None:
+                self._token_level = min(self._token_capacity, self._token_level + estimated_tokens - actual_tokens)
+            self._rate_factor = min(1.0, self._rate_factor + RATE_RECOVERY)
+
+    def report_throttled(self, retry_after=None):
+        """
+        Reacts to a 429 response by pausing all callers and lowering the rate.
+
+        Args:
+            retry_after (str or float): The Retry-After header value, if any.
+        """
+        pause = parse_retry_after(retry_after) if isinstance(retry_after, str) else retry_after
+        if pause is None:
+            pause = DEFAULT_THROTTLE_PAUSE
+        with self._lock:
+            now = self._clock()
+            self._paused_until = max(self._paused_until, now + pause)
+            self._rate_factor = max(MIN_RATE_FACTOR, self._rate_factor * RATE_DECREASE)
+            self._request_level = min(self._request_level, 0.0)
+            self._stats["throttled"] += 1
+
+    def stats(self):
+        """
+        Returns:
+            dict: Acquisition, waiting and throttling counters plus the current rate factor.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["rate_factor"] = self._rate_factor
+            stats["requests_per_minute"] = self.requests_per_minute
+            stats["tokens_per_minute"] = self.tokens_per_minute
+        return stats
+
+
+DEFAULT_LIMITER = "mistral"
+
+_limiters = {}
+_limiter_lock = threading.Lock()
+
+
+def get_limiter(name=DEFAULT_LIMITER, requests_per_minute=None, tokens_per_minute=None):
+    """
+    Returns the process-wide limiter shared by every caller of one API.
+
+    Args:
+        name (str): The API (provider) whose budget the limiter enforces.
+        requests_per_minute (float): Budget used when the limiter is first created;
+                                     defaults to MISTRAL_RPM.
+        tokens_per_minute (float): Budget used when the limiter is first created;
+                                   defaults to MISTRAL_TPM.
+
+    Returns:
+        RateLimiter: The shared limiter for name.
+    """
+    limiter = _limiters.get(name)
+    if limiter is None:
+        with _limiter_lock:
+            limiter = _limiters.get(name)
+            if limiter is None:
+                limiter = RateLimiter(
+                    requests_per_minute or REQUESTS_PER_MINUTE,
+                    tokens_per_minute or TOKENS_PER_MINUTE,
+                )
+                _limiters[name] = limiter
+    return limiter
+
+
+def configure_limiter(requests_per_minute=None, tokens_per_minute=None, burst_seconds=BURST_SECONDS,
+                      name=DEFAULT_LIMITER):
+    """Replaces the process-wide limiter for name with one using the given budgets."""
+    with _limiter_lock:
+        limiter = RateLimiter(
+            requests_per_minute or REQUESTS_PER_MINUTE,
+            tokens_per_minute or TOKENS_PER_MINUTE,
+            burst_seconds=burst_seconds,
+        )
+        _limiters[name] = limiter
+    return limiter
@@ -0,0 +1,103 @@
+"""
+Bulk re-scoring of stored interviews.
+
+Re-evaluates the saved answers of past interviews with the batched
+evaluation (one GenAI call per interview of up to MAX_BATCH_SIZE answers
+instead of one per answer) and stores the new feedback and overall score,
+e.g. after the evaluation prompt or model has changed.
+
+    python src/rescore.py --user-id 3
+    python src/rescore.py --interview-id 12 --interview-id 15
+"""
+import os
+import sys
+import argparse
+
+try:
+    from . import database
+    from . import evaluation_module
+except ImportError:
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    if current_dir not in sys.path:
+        sys.path.insert(0, current_dir)
+    import database
+    import evaluation_module
+
+
+def average_score(feedback):
+    """Average of the numeric scores in a list of feedback dicts, or None if there are none."""
+    scores = []
+    for item in feedback:
+        try:
+            scores.append(float(item.get("score")))
+        except (AttributeError, TypeError, ValueError):
+            pass
+    return sum(scores) / len(scores) if scores else None
+
+
+def rescore_interview(interview_id):
+    """
+    Re-evaluates and stores the answers of one saved interview.
+
+    The overall analysis text is left as it was; only per-answer feedback
+    and the overall score change. Answers the GenAI evaluation failed for
+    keep their stored feedback rather than being overwritten with fallback
+    feedback, and count towards the new score as stored.
+
+    Returns:
+        float: The interview's new average score, or None if no answer got a numeric score.
+    """
+    details = database.get_interview_details(interview_id)
+    interview = details["interview"]
+    config = {
+        "job_role": interview["job_role"],
+        "job_description": interview["job_description"] or "",
+        "difficulty": interview["difficulty"],
+    }
+    feedback = evaluation_module.evaluate_responses(details["questions"], details["responses"], config)
+    failed = [i for i, item in enumerate(feedback) if evaluation_module.is_fallback_feedback(item)]
+    if failed:
+        print(f"Warning: interview {interview_id}: GenAI evaluation failed for {len(failed)} answer(s); "
+              "keeping their stored feedback")
+        feedback = [None if i in failed else item for i, item in enumerate(feedback)]
+    score = average_score([item if item is not None else stored for item, stored in zip(feedback, details["feedback"])])
+    database.update_interview_feedback(interview_id, feedback, score)
+    return score
+
+
+def rescore_interviews(interview_ids):
+    """
+    Re-scores several interviews, carrying on past ones that fail.
+
+    Returns:
+        dict: Interview id -> new average score (None when it could not be scored).
+    """
+    scores = {}
+    for interview_id in interview_ids:
+        try:
+            scores[interview_id] = rescore_interview(interview_id)
+        except Exception as e:
+            print(f"Warning: could not re-score interview {interview_id}: {e}")
+            scores[interview_id] = None
+            continue
+        score = scores[interview_id]
+        print(f"Interview {interview_id}: " + (f"{score:.1f} / 10" if score is not None else "no numeric score"))
+    return scores
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-evaluate the answers of stored interviews.")
+    parser.add_argument("--interview-id", type=int, action="append", default=[], help="Interview to re-score (repeatable)")
+    parser.add_argument("--user-id", type=int, default=None, help="Re-score every interview of this user")
+    args = parser.parse_args(argv)
+
+    interview_ids = list(args.interview_id)
+    if args.user_id is not None:
+        interview_ids += [interview["id"] for interview in database.get_user_interviews(args.user_id)]
+    if not interview_ids:
+        parser.error("give --interview-id or --user-id")
+    return rescore_interviews(interview_ids)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+"""
+Tail-latency and failure protection for GenAI calls.
+
+LatencyTracker keeps a rolling window of recent call latencies, hedged_call
+fires a duplicate request when the first one is slower than a recent latency
+percentile, so a slow call that then fails already has a retry under way,
+and CircuitBreaker fails fast after repeated failures so callers
+can drop straight to their fallbacks.
+"""
+import time
+import threading
+from collections import deque
+
+
+class LatencyTracker:
+    """Rolling window of recent latencies, in seconds."""
+
+    def __init__(self, window=200):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def count(self):
+        with self._lock:
+            return len(self._samples)
+
+    def percentile(self, pct):
+        """
+        Returns the pct-th percentile (0-100) of the recorded latencies, or None if empty.
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        rank = min(len(samples) - 1, max(0, int(round(pct / 100 * (len(samples) - 1)))))
+        return samples[rank]
+
+
+def hedged_call(fn, executor, hedge_delay):
+    """
+    Runs fn() on the calling thread and, if it has not answered within
+    hedge_delay seconds, starts a duplicate on executor.
+
+    The primary call's result is used when it succeeds. When it fails (returns
+    None), the duplicate, which has been running since the hedge delay
+    expired, supplies the result instead. Only duplicates occupy the executor,
+    so it does not limit how many calls run at once, and time a call spends
+    waiting for a worker never counts against its hedge delay.
+
+    Args:
+        fn (callable): Zero-argument function; a None result counts as a failure.
+        executor (concurrent.futures.Executor): Executor that runs the duplicates.
+        hedge_delay (float): Seconds to wait before hedging; None disables hedging.
+
+    Returns:
+        tuple: (result, hedged, hedge_won) where result is the first non-None
+               result (or None if every attempt failed), hedged tells whether a
+               duplicate was fired and hedge_won whether the result came from it.
+    """
+    if hedge_delay is None:
+        return fn(), False, False
+
+    lock = threading.Lock()
+    state = {"finished": False, "hedge": None}
+
+    def fire_hedge():
+        with lock:
+            if not state["finished"]:
+                state["hedge"] = executor.submit(fn)
+
+    timer = threading.Timer(hedge_delay, fire_hedge)
+    timer.daemon = True
+    timer.start()
+    try:
+        result = fn()
+    finally:
+        timer.cancel()
+        with lock:
+            state["finished"] = True
+            hedge = state["hedge"]
+
+    if hedge is None:
+        return result, False, False
+    if result is not None:
+        return result, True, False
+    hedge_result = hedge.result()
+    return hedge_result, True, hedge_result is not None
+
+
+class CircuitBreaker:
+    """
+    Stops calling a failing dependency for a while.
+
+    closed: calls go through; consecutive failures are counted.
+    open: after failure_threshold consecutive failures, calls are refused until
+          reset_timeout seconds have passed.
+    half_open: one trial call is let through; success closes the circuit,
+               failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._rejected = 0
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self):
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._trial_in_flight = False
+        return self._state
+
+    def allow_request(self):
+        """
+        Returns:
+            bool: True if a call may be made now.
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self._rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+                self._trial_in_flight = False
+
+    def stats(self):
+        """
+        Returns:
+            dict: Current state, consecutive failures and calls rejected while open.
+        """
+        with self._lock:
+            return {
+                "state": self._current_state(),
+                "consecutive_failures": self._failures,
+                "rejected": self._rejected,
+            }
@@ -0,0 +1,87 @@
+"""
+Single-flight execution: concurrent callers asking for the same key share one call.
+"""
+import threading
+
+
+class _Call:
+    """An in-flight call whose result is shared with every waiter."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key.
+
+    The first caller for a key runs the function; callers arriving while it is
+    still running block until it finishes and receive the same result (or the
+    same exception). Once the call completes the key is forgotten, so later
+    calls run again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._executions = 0
+        self._coalesced = 0
+
+    def do(self, key, fn):
+        """
+        Runs fn() for key unless an identical call is already in flight.
+
+        Args:
+            key (str): Identifies calls that may share a result.
+            fn (callable): Zero-argument function producing the result.
+
+        Returns:
+            The result of the (possibly shared) call.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+                self._executions += 1
+                is_leader = True
+            else:
+                self._coalesced += 1
+                is_leader = False
+
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self):
+        """
+        Returns:
+            dict: Number of executed calls, coalesced calls and calls currently in flight.
+        """
+        with self._lock:
+            return {
+                "executions": self._executions,
+                "coalesced": self._coalesced,
+                "in_flight": len(self._calls),
+            }
+
+    def reset_stats(self):
+        """Resets the execution and coalescing counters."""
+        with self._lock:
+            self._executions = 0
+            self._coalesced = 0
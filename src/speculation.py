@@ -0,0 +1,171 @@
+"""
+Speculative question generation while the interview setup form is being filled in.
+
+As soon as the job role, difficulty and a long enough job description have
+been entered, questions start generating in the background after a short
+debounce. Editing the inputs cancels that work and starts over; submitting
+with the configuration that was speculated on reuses the questions already
+generated, hiding most of the generation latency behind the user's typing.
+
+Speculation only prefetches from the LLM: the question pool and bank are
+neither sampled nor refilled for inputs that may never be submitted. A
+configuration they can already serve is not speculated on at all, and the
+generated questions only restock them once take() claims them on submit.
+"""
+import os
+import threading
+
+try:
+    from . import question_bank
+    from . import question_module
+except ImportError:
+    import question_bank
+    import question_module
+
+ENABLED = os.getenv("QUESTION_SPECULATION_ENABLED", "1") != "0"
+# Seconds the inputs must stay unchanged before generation starts
+DEBOUNCE_SECONDS = float(os.getenv("QUESTION_SPECULATION_DEBOUNCE", "1.0"))
+# Shorter job descriptions are probably still being typed or pasted
+MIN_JOB_DESCRIPTION_CHARS = 100
+
+_lock = threading.Lock()
+_stats = {"started": 0, "cancelled": 0, "hits": 0, "misses": 0, "stored": 0}
+
+
+def _count_stat(name):
+    with _lock:
+        _stats[name] += 1
+
+
+def is_ready(config):
+    """True if config is complete enough to be worth generating questions for."""
+    return bool(
+        (config.get("job_role") or "").strip()
+        and config.get("difficulty")
+        and len((config.get("job_description") or "").strip()) >= MIN_JOB_DESCRIPTION_CHARS
+    )
+
+
+def speculation_key(config, num_questions, user_id=None):
+    """Identifies the interview a speculation is for; equal keys get the same questions."""
+    # Per user: questions already asked are filtered out for the user the speculation ran for
+    return question_bank.bucket_key(config), num_questions, user_id
+
+
+class SpeculativeQuestions:
+    """
+    One user's speculative question generation; keep one per session.
+
+    Call update() whenever the setup inputs may have changed and take() on submit.
+    """
+
+    def __init__(self, debounce_seconds=None):
+        self.debounce_seconds = DEBOUNCE_SECONDS if debounce_seconds is None else debounce_seconds
+        self._lock = threading.Lock()
+        self._key = None
+        self._timer = None
+        self._stream = None
+        self._stored = False
+
+    def update(self, config, num_questions, user_id=None):
+        """
+        Notes the current setup inputs, (re)starting speculation if they changed.
+
+        Incomplete inputs cancel any speculation in progress.
+        """
+        if not ENABLED or not is_ready(config):
+            self.cancel()
+            return
+        key = speculation_key(config, num_questions, user_id)
+        with self._lock:
+            if key == self._key:
+                return
+            self._cancel_locked()
+            self._key = key
+            self._timer = threading.Timer(
+                self.debounce_seconds, self._start, args=(key, dict(config), num_questions, user_id)
+            )
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _start(self, key, config, num_questions, user_id):
+        stored = question_module.has_stored_questions(config, num_questions)
+        with self._lock:
+            if key != self._key or self._stream is not None:
+                return  # The inputs changed while the timer was pending
+            if stored:
+                self._stored = True  # Submitting will be served from the pool or bank without waiting
+                return
+            self._stream = question_module.QuestionStream(config, num_questions, user_id=user_id, speculative=True)
+        _count_stat("started")
+
+    def _cancel_locked(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._stream is not None:
+            self._stream.cancel()
+            self._stream = None
+            _count_stat("cancelled")
+        self._key = None
+        self._stored = False
+
+    def cancel(self):
+        """Abandons any pending or running speculation."""
+        with self._lock:
+            self._cancel_locked()
+
+    def take(self, config, num_questions, user_id=None):
+        """
+        Claims the speculative questions for the submitted configuration; once
+        they are all generated, they restock the pool or bank as an unspeculated
+        request's would have.
+
+        Returns:
+            question_module.QuestionStream: The speculation's stream if it was
+                started for this configuration and user, else None (and any
+                speculation is cancelled).
+        """
+        key = speculation_key(config, num_questions, user_id)
+        with self._lock:
+            stored = self._stored and key == self._key
+            stream = self._stream if key == self._key else None
+            if stream is not None and stream.error is None:
+                self._stream = None
+                self._key = None
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+            else:
+                stream = None
+                self._cancel_locked()
+        if stream is not None:
+            stream.add_done_callback(
+                lambda claimed: question_module.restock_after_generation(config, claimed.generated)
+            )
+            _count_stat("hits")
+        else:
+            _count_stat("stored" if stored else "misses")
+        return stream
+
+
+def get_speculation_stats():
+    """
+    Returns:
+        dict: Speculations started and cancelled, submits that reused one
+              (hits), had to generate from scratch (misses) or were served
+              from the pool or bank, which are not speculated on (stored),
+              and the hit rate over hits and misses.
+    """
+    with _lock:
+        stats = dict(_stats)
+    submits = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / submits if submits else 0.0
+    return stats
+
+
+def reset_speculation_stats():
+    """Resets the speculation counters."""
+    with _lock:
+        for name in _stats:
+            _stats[name] = 0
@@ -0,0 +1,247 @@
+"""
+Local stand-in for an OpenAI-compatible chat completions API.
+
+Serves deterministic canned completions shaped like the real ones (numbered
+questions, feedback JSON, overall analysis JSON), with configurable latency
+and error injection, so the app and its load tests can run without network
+access or API spend.
+
+Usage:
+    python src/standin_server.py --port 8080 --latency-ms 400 --jitter-ms 200 --error-rate 0.05
+    GENAI_PROVIDER=openai OPENAI_BASE_URL=http://127.0.0.1:8080/v1 streamlit run src/streamlit_app.py
+"""
+import re
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+QUESTION_TEMPLATES = [
+    "Walk me through a {role} project you are proud of and the trade-offs you made.",
+    "How would you debug a production issue that only appears under heavy load as a {role}?",
+    "Which metrics would you track to know that your work as a {role} is succeeding?",
+    "Describe how you would design a system that has to scale tenfold in a year.",
+    "Tell me about a time you disagreed with a teammate and how you resolved it.",
+    "How do you decide when code is good enough to ship?",
+    "Explain a technical concept from your field to someone without a technical background.",
+    "What would you change first if you inherited a slow, poorly tested codebase?",
+    "How do you keep your skills current as a {role}?",
+    "Describe a failure you learned from and what you do differently now.",
+]
+
+_QUESTION_REQUEST = re.compile(r"Generate (\d+) interview questions")
+_ROLE = re.compile(r"role of '([^']*)'")
+
+
+def _digest(text):
+    """Stable integer derived from text, so the same prompt always gets the same answer."""
+    return int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:8], 16)
+
+
+def canned_completion(messages):
+    """
+    Builds the canned completion for a list of chat messages.
+
+    Args:
+        messages (list): OpenAI-style chat messages.
+
+    Returns:
+        str: A completion shaped like what the app expects for that prompt.
+    """
+    prompt = "\n".join(m.get("content", "") for m in messages)
+    seed = _digest(prompt)
+
+    question_request = _QUESTION_REQUEST.search(prompt)
+    if question_request:
+        count = int(question_request.group(1))
+        role_match = _ROLE.search(prompt)
+        role = role_match.group(1) if role_match else "engineer"
+        start = seed % len(QUESTION_TEMPLATES)
+        questions = [
+            QUESTION_TEMPLATES[(start + i) % len(QUESTION_TEMPLATES)].format(role=role)
+            for i in range(count)
+        ]
+        return "\n".join(f"{i + 1}. {question}" for i, question in enumerate(questions))
+
+    if "overall_analysis" in prompt:
+        return json.dumps({
+            "overall_analysis": "The candidate gave structured answers and communicated clearly overall.",
+            "key_strengths": ["Clear communication", "Relevant examples"],
+            "improvement_areas": ["Quantify impact", "Go deeper on trade-offs"],
+            "preparation_tips": ["Practise answers using the STAR format", "Review system design fundamentals"],
+        })
+
+    if "sample_answer" in prompt:
+        return json.dumps({
+            "score": 4 + seed % 6,
+            "strengths": "The answer addresses the question directly.",
+            "areas_for_improvement": "Add a concrete example and explain the reasoning behind your choices.",
+            "sample_answer": "A strong answer states the approach, gives a real example and names the trade-offs.",
+        })
+
+    if "interview question" in prompt.lower():
+        return QUESTION_TEMPLATES[seed % len(QUESTION_TEMPLATES)].format(role="Software Development Engineer")
+
+    return f"Stand-in response #{seed % 1000} for a {len(prompt)}-character prompt."
+
+
+class StandInConfig:
+    """Latency and error injection settings shared by the request handlers."""
+
+    def __init__(self, latency_ms=0, jitter_ms=0, error_rate=0.0, error_status=500,
+                 stream_chunk_chars=16, seed=None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.stream_chunk_chars = stream_chunk_chars
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+
+    def next_request(self):
+        """
+        Draws the simulated behaviour of the next request.
+
+        Returns:
+            tuple: (delay in seconds, whether to fail it).
+        """
+        with self._lock:
+            self.requests += 1
+            delay = (self.latency_ms + self._random.uniform(0, self.jitter_ms)) / 1000
+            fail = self._random.random() < self.error_rate
+        return delay, fail
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    config = StandInConfig()
+
+    def _send_json(self, status, body, headers=None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+        try:
+            request = json.loads(body or b"{}")
+        except json.JSONDecodeError:
+            self._send_json(400, {"error": {"message": "Request body is not valid JSON"}})
+            return
+
+        delay, fail = self.config.next_request()
+        time.sleep(delay)
+        if fail:
+            status = self.config.error_status
+            headers = {"Retry-After": "1"} if status == 429 else None
+            self._send_json(status, {"error": {"message": "Injected stand-in failure"}}, headers)
+            return
+
+        messages = request.get("messages") or []
+        content = canned_completion(messages)
+        model = request.get("model", "stand-in")
+        prompt_tokens = sum(len(m.get("content", "")) // 4 for m in messages)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": len(content) // 4,
+            "total_tokens": prompt_tokens + len(content) // 4,
+        }
+        if request.get("stream"):
+            self._stream(model, content)
+        else:
+            self._send_json(200, {
+                "id": f"standin-{self.config.requests}",
+                "object": "chat.completion",
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                "usage": usage,
+            })
+
+    def _stream(self, model, content):
+        """Sends content as server-sent events, one small delta per event."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        size = self.config.stream_chunk_chars
+        for start in range(0, len(content), size):
+            event = {"model": model, "choices": [{"index": 0, "delta": {"content": content[start:start + size]}}]}
+            self.wfile.write(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInServer:
+    """Runs the stand-in API on a background thread."""
+
+    def __init__(self, host="127.0.0.1", port=0, **config):
+        self.config = StandInConfig(**config)
+        handler = type("StandInHandler", (_StandInHandler,), {"config": self.config})
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._thread = None
+
+    @property
+    def base_url(self):
+        """Base URL to use as OPENAI_BASE_URL (or the base_url of an OpenAICompatibleProvider)."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve canned OpenAI-compatible chat completions locally.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency-ms", type=float, default=0, help="Fixed delay added to every request")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Extra random delay, uniform in [0, jitter]")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail (0-1)")
+    parser.add_argument("--error-status", type=int, default=500, help="HTTP status returned by injected failures")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for latency jitter and error injection")
+    args = parser.parse_args()
+
+    server = StandInServer(
+        args.host, args.port,
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate, error_status=args.error_status, seed=args.seed,
+    )
+    print(f"Stand-in GenAI API listening on {server.base_url} (Ctrl+C to stop)")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -14,6 +14,10 @@ try:
     from . import question_module
     from . import evaluation_module
     from . import database
+    from . import llm_metrics
+    from . import speculation
+    from . import question_dedup
+    from . import background_evaluation
 except ImportError:
     # When run as a script or imported directly
     # Add current directory to sys.path if not already there
@@ -26,6 +30,10 @@ except ImportError:
     import question_module
     import evaluation_module
     import database
+    import llm_metrics
+    import speculation
+    import question_dedup
+    import background_evaluation
 
 def main():
     # Set up the basic app configuration
@@ -34,6 +42,11 @@ def main():
         page_icon="💼",
         layout="centered",
     )
+
+    # Serve or dump GenAI call metrics if GENAI_METRICS_PORT / GENAI_METRICS_DUMP are set
+    llm_metrics.start_exporters_from_env()
+    # Load the local answer classifier in the background so it is ready by the first answer
+    evaluation_module.preload_classifier()
     
     # Initialize session state variables if they don't exist
     if "page" not in st.session_state:
@@ -42,12 +55,20 @@ def main():
         st.session_state.interview_config = None
     if "questions" not in st.session_state:
         st.session_state.questions = []
+    if "question_stream" not in st.session_state:
+        st.session_state.question_stream = None
     if "current_question_idx" not in st.session_state:
         st.session_state.current_question_idx = 0
     if "responses" not in st.session_state:
         st.session_state.responses = []
     if "feedback" not in st.session_state:
         st.session_state.feedback = []
+    if "evaluations" not in st.session_state:
+        st.session_state.evaluations = None
+    if "evaluate_at_end" not in st.session_state:
+        st.session_state.evaluate_at_end = False
+    if "answer_quality" not in st.session_state:
+        st.session_state.answer_quality = []
     if "user" not in st.session_state:
         st.session_state.user = None
     if "overall_analysis" not in st.session_state:
@@ -80,9 +101,15 @@ def main():
         st.session_state.page = "welcome"
         st.session_state.interview_config = None
         st.session_state.questions = []
+        st.session_state.question_stream = None
         st.session_state.current_question_idx = 0
         st.session_state.responses = []
         st.session_state.feedback = []
+        if st.session_state.evaluations is not None:
+            st.session_state.evaluations.cancel()
+        st.session_state.evaluations = None
+        st.session_state.evaluate_at_end = False
+        st.session_state.answer_quality = []
         st.session_state.overall_analysis = None
     
     def logout():
@@ -405,41 +432,60 @@ def display_interview_history_page(interview_id, go_to_dashboard):
 def display_setup_page(go_to_interview):
     st.title("Interview Setup")
     
-    # Form to collect interview configuration
-    with st.form("interview_config_form"):
-        job_role = st.text_input("Job Role (e.g., Software Engineer, Product Manager)", placeholder="Enter the role you're applying for")
-        job_description = st.text_area("Job Description", placeholder="Paste the job description here...", height=150)
-        difficulty = st.select_slider("Difficulty Level", options=["Easy", "Medium", "Hard"], value="Medium")
-        num_questions = st.slider("Number of Questions", min_value=3, max_value=10, value=5, step=1)
-        
-        # Using form_submit_button instead of regular button with callback
-        submit_button = st.form_submit_button("Generate Questions", use_container_width=True)
+    # Inputs sit outside a form so every change reruns the page, letting
+    # questions be generated speculatively while the user is still filling it in
+    job_role = st.text_input("Job Role (e.g., Software Engineer, Product Manager)", placeholder="Enter the role you're applying for")
+    job_description = st.text_area("Job Description", placeholder="Paste the job description here...", height=150)
+    difficulty = st.select_slider("Difficulty Level", options=["Easy", "Medium", "Hard"], value="Medium")
+    num_questions = st.slider("Number of Questions", min_value=3, max_value=10, value=5, step=1)
+    adaptive = st.checkbox("Adaptive difficulty (questions get harder or easier depending on your scores)", value=False)
+    evaluate_at_end = st.checkbox("Evaluate all answers at the end (no feedback between questions)", value=False)
+
+    config = {
+        "job_role": job_role,
+        "job_description": job_description,
+        "difficulty": difficulty,
+    }
+    user_id = st.session_state.user["id"] if st.session_state.user else None
+    if "question_speculator" not in st.session_state:
+        st.session_state.question_speculator = speculation.SpeculativeQuestions()
+    speculator = st.session_state.question_speculator
+    speculator.update(config, num_questions, user_id)
+
+    submit_button = st.button("Generate Questions", use_container_width=True, key="generate_questions_button")
         
-    # Process form after submission (outside the form)
     if submit_button:
         if not job_role or not job_description:
             st.error("Please fill in both the job role and job description fields.")
         else:
             # Create interview configuration
             with st.spinner("Setting up your interview..."):
-                st.session_state.interview_config = {
-                    "job_role": job_role,
-                    "job_description": job_description,
-                    "difficulty": difficulty,
-                }
+                st.session_state.interview_config = config
                 
-                # Generate questions using the existing module
-                st.session_state.questions = question_module.generate_questions(
-                    st.session_state.interview_config, 
-                    num_questions=num_questions
-                )
+                # Questions are generated in the background, unless speculation
+                # already started on this configuration; the interview can
+                # start as soon as the first one is ready
+                stream = speculator.take(config, num_questions, user_id)
+                if stream is None:
+                    stream = question_module.QuestionStream(config, num_questions=num_questions, user_id=user_id)
+                stream.wait_for(1)
+                if adaptive:
+                    stream = question_module.AdaptiveInterview(config, num_questions, stream)
+                st.session_state.question_stream = stream
+                st.session_state.questions = stream.questions
                 
                 if st.session_state.questions:
-                    st.success(f"Generated {len(st.session_state.questions)} questions for your interview!")
+                    if stream.done:
+                        st.success(f"Generated {len(st.session_state.questions)} questions for your interview!")
+                    else:
+                        st.success("Your first question is ready! The rest are being generated while you answer.")
                     # Reset responses and feedback for new interview
                     st.session_state.responses = []
                     st.session_state.feedback = []
+                    st.session_state.answer_quality = []
                     st.session_state.current_question_idx = 0
+                    # Adaptive interviews need each answer's score before the next question
+                    st.session_state.evaluate_at_end = evaluate_at_end and not adaptive
                     
                     # Button to start interview, appears after questions are generated
                     if st.button("Start Interview", on_click=go_to_interview, use_container_width=True, key="start_interview_main_button"):
@@ -447,11 +493,62 @@ def display_setup_page(go_to_interview):
                 else:
                     st.error("Failed to generate questions. Please try again.")
 
+def display_feedback(feedback, partial=False):
+    """
+    Render the feedback for a single answer.
+
+    With partial=True only the fields received so far are shown, which lets
+    streamed feedback fill in as it arrives.
+    """
+    if not partial or 'score' in feedback:
+        score = feedback.get('score', 'N/A')
+        score_display = str(score)
+        try:
+            score_val = float(score)
+            score_display = f"{score_val:.1f} / 10"
+        except (ValueError, TypeError):
+            pass # score_display remains as is
+        st.info(f"**Score**: {score_display}")
+    if not partial or 'strengths' in feedback:
+        st.success(f"**Strengths**: {feedback.get('strengths', 'N/A')}")
+    if not partial or 'areas_for_improvement' in feedback:
+        st.warning(f"**Areas for Improvement**: {feedback.get('areas_for_improvement', 'N/A')}")
+    if partial:
+        if 'sample_answer' in feedback:
+            st.markdown(f"**Sample Answer**: {feedback['sample_answer']}")
+    else:
+        with st.expander("View Sample Answer"):
+            st.markdown(feedback.get('sample_answer', 'N/A'))
+
+def _session_evaluations():
+    """The session's background evaluations, created on first use."""
+    if st.session_state.get("evaluations") is None:
+        st.session_state.evaluations = background_evaluation.BackgroundEvaluations()
+    return st.session_state.evaluations
+
+def display_quick_assessment(quality):
+    """Render the local classifier's instant verdict on an answer."""
+    st.info(f"**Quick assessment**: {quality.capitalize()} (local answer classifier)")
+
 def display_interview_page(go_to_results):
     st.title("Interview Simulation")
 
-    total_questions = len(st.session_state.questions)
+    # Pick up feedback from answers evaluated in the background since the last rerun
+    evaluations = _session_evaluations()
+    evaluations.collect(st.session_state.feedback)
+
     current_idx = st.session_state.current_question_idx
+    stream = st.session_state.question_stream
+    if stream is not None and current_idx >= len(st.session_state.questions) and not stream.done:
+        with st.spinner("Preparing the next question..."):
+            stream.wait_for(current_idx + 1)
+    total_questions = stream.expected_count() if stream is not None else len(st.session_state.questions)
+
+    if st.session_state.questions and current_idx >= len(st.session_state.questions):
+        # Generation ended with fewer questions than requested
+        go_to_results()
+        st.rerun()
+        return
 
     if not st.session_state.questions:
         st.error("No questions loaded. Please go back to setup.")
@@ -466,6 +563,9 @@ def display_interview_page(go_to_results):
 
     current_question = st.session_state.questions[current_idx]
     st.markdown(f"### Question: {current_question}")
+    adaptive = isinstance(stream, question_module.AdaptiveInterview)
+    if adaptive:
+        st.markdown(f"*Difficulty: {stream.difficulties[current_idx]}*")
 
     is_previously_answered = current_idx < len(st.session_state.responses) and st.session_state.responses[current_idx] is not None
 
@@ -495,26 +595,17 @@ def display_interview_page(go_to_results):
             feedback = st.session_state.feedback[current_idx]
             st.markdown("---")
             st.markdown("#### Feedback for This Answer:")
-            
-            score = feedback.get('score', 'N/A')
-            strengths = feedback.get('strengths', 'N/A')
-            areas_for_improvement = feedback.get('areas_for_improvement', 'N/A')
-            sample_answer = feedback.get('sample_answer', 'N/A')
-
-            score_display = str(score)
-            try:
-                score_val = float(score)
-                score_display = f"{score_val:.1f} / 10"
-            except (ValueError, TypeError):
-                pass # score_display remains as is
-
-            st.info(f"**Score**: {score_display}")
-            st.success(f"**Strengths**: {strengths}")
-            st.warning(f"**Areas for Improvement**: {areas_for_improvement}")
-            with st.expander("View Sample Answer"):
-                st.markdown(sample_answer)
+            display_feedback(feedback)
         else:
-            st.info("Feedback for this question is not available.")
+            answer_quality = st.session_state.get("answer_quality") or []
+            if current_idx < len(answer_quality) and answer_quality[current_idx]:
+                display_quick_assessment(answer_quality[current_idx])
+            if st.session_state.get("evaluate_at_end"):
+                st.info("Feedback for your answers will be shown on the results page.")
+            elif evaluations.is_pending(current_idx):
+                st.info("Your answer is still being evaluated; its feedback will appear here once it is ready.")
+            else:
+                st.info("Feedback for this question is not available.")
         st.markdown("---")
     else:  # Current question to be answered
         with st.form("response_form"):
@@ -530,12 +621,36 @@ def display_interview_page(go_to_results):
             if not response_text.strip():
                 st.warning("Please provide an answer before submitting.")
             else:
-                with st.spinner("Evaluating your response..."):
-                    feedback = evaluation_module.evaluate_response(
+                # Instant verdict from the local classifier; None while it is still loading
+                quality = evaluation_module.classify_answer_quality(response_text, current_question, wait=False)
+                if st.session_state.get("answer_quality") is None:
+                    st.session_state.answer_quality = []
+                while len(st.session_state.answer_quality) <= current_idx:
+                    st.session_state.answer_quality.append(None)
+                st.session_state.answer_quality[current_idx] = quality
+
+                # Adaptive interviews need this answer's score to pick the next question
+                if st.session_state.get("evaluate_at_end") and not adaptive:
+                    # Every answer is evaluated in one batch on the results page
+                    feedback = None
+                elif background_evaluation.ENABLED and not adaptive:
+                    # Move on at once; the feedback fills in when the evaluation finishes
+                    evaluations.submit(current_idx, current_question, response_text, st.session_state.interview_config)
+                    feedback = None
+                else:
+                    if quality:
+                        display_quick_assessment(quality)
+                    # Render feedback fields as they stream in rather than behind a spinner
+                    feedback_placeholder = st.empty()
+                    feedback_placeholder.info("Evaluating your response...")
+                    for feedback in evaluation_module.stream_evaluation(
                         current_question,
                         response_text,
                         st.session_state.interview_config
-                    )
+                    ):
+                        with feedback_placeholder.container():
+                            st.markdown("#### Feedback for This Answer:")
+                            display_feedback(feedback, partial=True)
 
                 while len(st.session_state.responses) <= current_idx:
                     st.session_state.responses.append(None)
@@ -545,6 +660,11 @@ def display_interview_page(go_to_results):
                 st.session_state.responses[current_idx] = response_text
                 st.session_state.feedback[current_idx] = feedback
 
+                if adaptive and current_idx == len(st.session_state.questions) - 1:
+                    # Picks a prefetched harder/easier question; never waits on the LLM
+                    stream.advance(feedback.get("score"))
+                    total_questions = stream.expected_count()
+
                 if current_idx < total_questions - 1:
                     st.session_state.current_question_idx += 1
                     st.rerun()
@@ -580,6 +700,31 @@ def display_results_page(restart, go_to_dashboard):
     st.markdown(f"**Job Role**: {st.session_state.interview_config.get('job_role')}")
     st.markdown(f"**Difficulty**: {st.session_state.interview_config.get('difficulty')}")
     
+    # Only the answers still being evaluated in the background are waited for
+    evaluations = st.session_state.get("evaluations")
+    if evaluations is not None:
+        if evaluations.pending():
+            with st.spinner("Finishing the evaluation of your last answers..."):
+                evaluations.wait()
+        evaluations.collect(st.session_state.feedback)
+    
+    if st.session_state.get("evaluate_at_end"):
+        unevaluated = [
+            i for i, response in enumerate(st.session_state.responses)
+            if response and (i >= len(st.session_state.feedback) or not st.session_state.feedback[i])
+        ]
+        if unevaluated:
+            with st.spinner("Evaluating your answers..."):
+                batch_feedback = evaluation_module.evaluate_responses(
+                    [st.session_state.questions[i] for i in unevaluated],
+                    [st.session_state.responses[i] for i in unevaluated],
+                    st.session_state.interview_config
+                )
+            while len(st.session_state.feedback) < len(st.session_state.responses):
+                st.session_state.feedback.append(None)
+            for i, item in zip(unevaluated, batch_feedback):
+                st.session_state.feedback[i] = item
+    
     # Calculate average score
     scores = []
     valid_feedback_count = 0
@@ -687,6 +832,7 @@ def display_results_page(restart, go_to_dashboard):
         )
         
         if interview_id:
+            question_dedup.record_questions(st.session_state.user["id"], st.session_state.questions)
             st.success("Interview saved to your history!")
     
     # Buttons to restart or go to dashboard
@@ -0,0 +1,114 @@
+"""
+Offline warm-up of question pools and banks for the most common interviews.
+
+Meant to run as a nightly job: it reads the most frequent job role and
+difficulty combinations from the interviews table and stocks the question
+store generate_questions serves them from, within a budget of LLM calls.
+Peak-time interviews for those roles are then served from SQLite instead of
+waiting on the API.
+
+    python src/warm_up.py --top 10 --max-calls 20 --days 30
+"""
+import os
+import sys
+import argparse
+from datetime import datetime, timedelta
+
+try:
+    from . import database
+    from . import question_bank
+    from . import question_module
+except ImportError:
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    if current_dir not in sys.path:
+        sys.path.insert(0, current_dir)
+    import database
+    import question_bank
+    import question_module
+
+TOP_ROLES = int(os.getenv("WARM_UP_TOP_ROLES", "10"))
+MAX_CALLS = int(os.getenv("WARM_UP_MAX_CALLS", "20"))
+
+
+def top_configs(top_n=TOP_ROLES, since=None):
+    """
+    Finds the most frequent job role and difficulty combinations.
+
+    Spelling variants of a role ("Data engineer", "data engineer ") count as
+    one. Each combination comes with the job description it was most often
+    used with, since that is the question store its interviews will look up.
+
+    Args:
+        top_n (int): Number of combinations to return.
+        since (str): Only count interviews created at or after this ISO timestamp.
+
+    Returns:
+        list: Dicts with job_role, difficulty, job_description and count, most frequent first.
+    """
+    combos = {}
+    for row in database.get_interview_config_counts(since):
+        combo = (question_bank.normalize_text(row["job_role"]), question_bank.normalize_text(row["difficulty"]))
+        if not combo[0]:
+            continue
+        if combo in combos:
+            combos[combo]["count"] += row["count"]
+        else:
+            # Rows come most frequent first, so the first one per combination has its commonest description
+            combos[combo] = {
+                "job_role": row["job_role"].strip(),
+                "difficulty": row["difficulty"],
+                "job_description": row["job_description"] or "",
+                "count": row["count"],
+            }
+    return sorted(combos.values(), key=lambda config: -config["count"])[:top_n]
+
+
+def warm_up(top_n=TOP_ROLES, max_calls=MAX_CALLS, since=None, dry_run=False):
+    """
+    Stocks question stores for the top_n most frequent interview configurations.
+
+    Configurations are handled most frequent first until max_calls LLM calls
+    have been made; ones whose store is already full cost nothing.
+
+    Returns:
+        dict: Configurations considered, configurations that got new
+              questions, LLM calls made and questions added.
+    """
+    summary = {"configs": 0, "warmed": 0, "calls": 0, "added": 0}
+    for config in top_configs(top_n, since):
+        summary["configs"] += 1
+        label = f"{config['job_role']} ({config['difficulty']}, {config['count']} interviews)"
+        if dry_run:
+            print(f"Would warm up: {label}")
+            continue
+        remaining = max_calls - summary["calls"]
+        if remaining <= 0:
+            print(f"API budget used up; skipping {label}")
+            continue
+        config_without_count = {key: value for key, value in config.items() if key != "count"}
+        calls, added = question_module.prefill_questions(config_without_count, remaining)
+        summary["calls"] += calls
+        summary["added"] += added
+        if added:
+            summary["warmed"] += 1
+        print(f"{label}: {added} questions added with {calls} LLM calls")
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-generate questions for the most common interview configurations.")
+    parser.add_argument("--top", type=int, default=TOP_ROLES, help="Number of role/difficulty combinations to warm up")
+    parser.add_argument("--max-calls", type=int, default=MAX_CALLS, help="Most LLM calls to make in this run")
+    parser.add_argument("--days", type=int, default=None, help="Only count interviews from the last N days")
+    parser.add_argument("--dry-run", action="store_true", help="List the configurations without calling the LLM")
+    args = parser.parse_args(argv)
+
+    since = (datetime.now() - timedelta(days=args.days)).isoformat() if args.days else None
+    summary = warm_up(args.top, args.max_calls, since, args.dry_run)
+    print(f"Warmed up {summary['warmed']} of {summary['configs']} configurations: "
+          f"{summary['added']} questions from {summary['calls']} LLM calls.")
+    return summary
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+import unittest
+import os
+import sys
+import tempfile
+import threading
+from unittest.mock import patch
+
+# Add src to sys.path to allow direct import of src modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import answer_classifier
+
+
+class _FakeClassifier:
+    loads = 0
+
+    def __init__(self, checkpoint_path=None):
+        _FakeClassifier.loads += 1
+
+    def predict(self, texts):
+        return ["excellent" if "detailed" in text else "insufficient" for text in texts]
+
+
+class TestAnswerClassifier(unittest.TestCase):
+
+    def setUp(self):
+        answer_classifier.reset()
+        self.addCleanup(answer_classifier.reset)
+        _FakeClassifier.loads = 0
+
+    def test_load_labels_reads_label_map_in_index_order(self):
+        with tempfile.TemporaryDirectory() as checkpoint:
+            self.assertEqual(answer_classifier.load_labels(checkpoint), answer_classifier.DEFAULT_LABELS)
+            with open(os.path.join(checkpoint, "label_map.txt"), "w") as f:
+                f.write("insufficient\t2\nadequate\t0\nexcellent\t1\n")
+            self.assertEqual(answer_classifier.load_labels(checkpoint), ["adequate", "excellent", "insufficient"])
+
+    def test_classifier_loaded_once_and_shared(self):
+        with patch.object(answer_classifier, 'TorchClassifier', _FakeClassifier):
+            texts = [answer_classifier.format_input("A detailed answer", "Q?"), answer_classifier.format_input("No")]
+            self.assertEqual(answer_classifier.predict(texts), ["excellent", "insufficient"])
+            self.assertEqual(answer_classifier.predict(texts[:1]), ["excellent"])
+        self.assertEqual(_FakeClassifier.loads, 1)
+        self.assertEqual(texts[0], "Question: Q? Answer: A detailed answer")
+
+    def test_load_failure_is_remembered(self):
+        with patch.object(answer_classifier, 'TorchClassifier', side_effect=ImportError("No module named 'torch'")) \
+                as mock_classifier:
+            self.assertIsNone(answer_classifier.predict(["text"]))
+            self.assertFalse(answer_classifier.is_available())
+        mock_classifier.assert_called_once()
+
+    def test_no_wait_starts_loading_in_background(self):
+        release = threading.Event()
+
+        class SlowClassifier(_FakeClassifier):
+            def __init__(self, checkpoint_path=None):
+                release.wait(5)
+                super().__init__(checkpoint_path)
+
+        with patch.object(answer_classifier, 'TorchClassifier', SlowClassifier):
+            self.assertIsNone(answer_classifier.predict(["A detailed answer"], wait=False))
+            release.set()
+            self.assertEqual(answer_classifier.predict(["A detailed answer"]), ["excellent"])
+        self.assertEqual(_FakeClassifier.loads, 1)
+
+    def test_auto_backend_prefers_exported_onnx_model(self):
+        with tempfile.TemporaryDirectory() as checkpoint:
+            onnx_path = os.path.join(checkpoint, "model.int8.onnx")
+            with patch.object(answer_classifier, 'ONNX_MODEL_PATH', onnx_path), \
+                    patch.object(answer_classifier, '_onnx_runtime_installed', return_value=True), \
+                    patch.object(answer_classifier, 'OnnxClassifier') as mock_onnx, \
+                    patch.object(answer_classifier, 'TorchClassifier') as mock_torch:
+                answer_classifier.load_classifier("auto")
+                mock_torch.assert_called_once()
+                open(onnx_path, "w").close()
+                answer_classifier.load_classifier("auto")
+                mock_onnx.assert_called_once_with(onnx_path, answer_classifier.CHECKPOINT_PATH)
+                answer_classifier.load_classifier("torch")
+                self.assertEqual(mock_torch.call_count, 2)
+        with self.assertRaises(ValueError):
+            answer_classifier.load_classifier("tensorrt")
+
+    def test_concurrent_predictions_are_micro_batched(self):
+        batch_sizes = []
+
+        class CountingClassifier(_FakeClassifier):
+            def predict(self, texts):
+                batch_sizes.append(len(texts))
+                return super().predict(texts)
+
+        results = {}
+
+        def classify(number):
+            results[number] = answer_classifier.predict([f"A detailed answer {number}"])
+
+        with patch.object(answer_classifier, 'TorchClassifier', CountingClassifier), \
+                patch.object(answer_classifier, 'BATCH_WAIT_MS', 100):
+            answer_classifier.get_classifier()
+            threads = [threading.Thread(target=classify, args=(number,)) for number in range(6)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(5)
+        self.assertEqual(results, {number: ["excellent"] for number in range(6)})
+        self.assertEqual(sum(batch_sizes), 6)
+        self.assertLess(len(batch_sizes), 6)
+        self.assertEqual(answer_classifier.get_batching_stats()["requests"], 6)
+
+    def test_disabled_classifier_never_loads(self):
+        with patch.object(answer_classifier, 'ENABLED', False), \
+                patch.object(answer_classifier, 'TorchClassifier', _FakeClassifier):
+            self.assertIsNone(answer_classifier.predict(["text"]))
+        self.assertEqual(_FakeClassifier.loads, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
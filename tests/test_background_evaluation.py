@@ -0,0 +1,49 @@
+import unittest
+import os
+import sys
+import threading
+from unittest.mock import patch
+
+# Add src to sys.path to allow direct import of src modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import background_evaluation, evaluation_module
+
+
+class TestBackgroundEvaluations(unittest.TestCase):
+
+    def setUp(self):
+        self.evaluations = background_evaluation.BackgroundEvaluations()
+        self.addCleanup(self.evaluations.cancel)
+
+    @patch('src.background_evaluation.evaluation_module.evaluate_response')
+    def test_feedback_collected_as_evaluations_finish(self, mock_evaluate_response):
+        release = threading.Event()
+        mock_evaluate_response.side_effect = lambda question, response, config: (
+            release.wait(5) and {"score": 5} if question == "Q2" else {"score": 9}
+        )
+        self.evaluations.submit(0, "Q1", "A1", {"job_role": "Engineer"}).result(timeout=5)
+        self.evaluations.submit(1, "Q2", "A2", {"job_role": "Engineer"})
+
+        feedback = []
+        self.assertEqual(self.evaluations.collect(feedback), 1)
+        self.assertEqual(feedback, [{"score": 9}])
+        self.assertTrue(self.evaluations.is_pending(1))
+        self.assertEqual(self.evaluations.pending(), [1])
+
+        release.set()
+        self.assertTrue(self.evaluations.wait(timeout=5))
+        self.evaluations.collect(feedback)
+        self.assertEqual(feedback, [{"score": 9}, {"score": 5}])
+        self.assertEqual(self.evaluations.pending(), [])
+
+    @patch('src.background_evaluation.evaluation_module.evaluate_response', side_effect=RuntimeError("boom"))
+    def test_failed_evaluation_gives_placeholder_feedback(self, _):
+        self.evaluations.submit(0, "Q1", "A1", {}).result(timeout=5)
+        feedback = []
+        self.evaluations.collect(feedback)
+        self.assertEqual(feedback, [evaluation_module.CALL_FAILED_FEEDBACK])
+
+
+if __name__ == '__main__':
+    unittest.main()
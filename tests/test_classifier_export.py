@@ -0,0 +1,68 @@
+import unittest
+import os
+import sys
+import json
+import tempfile
+from unittest.mock import patch
+
+# Add src to sys.path to allow direct import of src modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import classifier_export
+
+
+SAMPLES = [
+    {"question": "What is a join?", "answer": "A detailed explanation of joins.", "quality": "excellent"},
+    {"question": "What is an index?", "answer": "No idea.", "quality": "insufficient"},
+    {"question": "What is a view?", "answer": "A detailed stored query.", "quality": "adequate"},
+]
+
+
+class _KeywordClassifier:
+    def __init__(self):
+        self.batches = []
+
+    def predict(self, texts):
+        self.batches.append(len(texts))
+        return ["excellent" if "detailed" in text else "insufficient" for text in texts]
+
+
+class TestClassifierExport(unittest.TestCase):
+
+    def test_benchmark_classifier_measures_accuracy_and_batches(self):
+        classifier = _KeywordClassifier()
+        result = classifier_export.benchmark_classifier(classifier, SAMPLES, batch_size=2)
+        self.assertAlmostEqual(result["accuracy"], 2 / 3)
+        self.assertGreater(result["throughput"], 0)
+        self.assertLessEqual(result["p50_ms"], result["p95_ms"])
+        # Warm-up, one call per sample for latency, then batches of two
+        self.assertEqual(classifier.batches, [1, 1, 1, 1, 2, 1])
+
+    def test_benchmark_reports_backends_that_fail_to_load(self):
+        def load(backend):
+            if backend == "onnx":
+                raise ImportError("No module named 'onnxruntime'")
+            return _KeywordClassifier()
+
+        with patch.object(classifier_export.answer_classifier, 'load_classifier', side_effect=load):
+            results = classifier_export.benchmark(SAMPLES)
+        self.assertIn("accuracy", results["torch"])
+        self.assertEqual(results["onnx"], {"error": "No module named 'onnxruntime'"})
+        table = classifier_export.format_results(results)
+        self.assertIn("onnx     unavailable: No module named 'onnxruntime'", table)
+        self.assertEqual(len(table.splitlines()), 3)
+
+    def test_main_benchmark_reads_test_data(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "test_data.json")
+            with open(path, "w") as f:
+                json.dump(SAMPLES, f)
+            with patch.object(classifier_export.answer_classifier, 'load_classifier',
+                              side_effect=lambda backend: _KeywordClassifier()), \
+                    patch('builtins.print'):
+                results = classifier_export.main(["benchmark", "--test-data", path, "--batch-size", "3"])
+        self.assertEqual(set(results), {"torch", "onnx"})
+
+
+if __name__ == '__main__':
+    unittest.main()
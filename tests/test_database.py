@@ -184,6 +184,37 @@ class TestDatabaseModule(unittest.TestCase):
         interviews_empty = database.get_user_interviews(no_interviews_user_id)
         self.assertEqual(len(interviews_empty), 0)
 
+    def test_get_user_question_texts(self):
+        user_id = database.create_user("repeatuser", "repeat@example.com", "pass")
+        other_id = database.create_user("otheruser", "other@example.com", "pass")
+        database.save_interview(user_id, "Role1", "D1", "Easy", ["Q1?", "Q2?"], ["R"], [{}], "F1", 5)
+        database.save_interview(other_id, "Role1", "D1", "Easy", ["Other?"], ["R"], [{}], "F1", 5)
+        database.save_interview(user_id, "Role2", "D2", "Hard", ["Q3?"], [], [], "F2", 8)
+
+        self.assertEqual(database.get_user_question_texts(user_id), ["Q1?", "Q2?", "Q3?"])
+
+    def test_get_interview_config_counts(self):
+        user_id = database.create_user("countuser", "count@example.com", "pass")
+        for role, description, difficulty in [("Role1", "D1", "Easy"), ("Role1", "D1", "Easy"), ("Role2", "D2", "Hard")]:
+            database.save_interview(user_id, role, description, difficulty, ["Q?"], [], [])
+
+        configs = database.get_interview_config_counts()
+        self.assertEqual([(c["job_role"], c["difficulty"], c["count"]) for c in configs],
+                         [("Role1", "Easy", 2), ("Role2", "Hard", 1)])
+        self.assertEqual(database.get_interview_config_counts(since="9999-01-01"), [])
+
+    def test_update_interview_feedback(self):
+        user_id = database.create_user("rescoreuser", "rescore@example.com", "pass")
+        interview_id = database.save_interview(
+            user_id, "Role", "Desc", "Easy", ["Q1?", "Q2?"], ["A1", "A2"], [{"score": 3}, {"score": 4}], None, 3.5
+        )
+
+        self.assertTrue(database.update_interview_feedback(interview_id, [{"score": 9}, None], 9.0))
+
+        details = database.get_interview_details(interview_id)
+        self.assertEqual(details["feedback"], [{"score": 9}, {"score": 4}])
+        self.assertEqual(details["interview"]["overall_score"], 9.0)
+
     def test_get_interview_details(self):
         user_id = database.create_user("detailuser", "detail@example.com", "pass")
         questions = ["Q1?", "Q2?"]
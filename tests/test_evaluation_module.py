@@ -1,10 +1,18 @@
 import unittest
 from unittest.mock import patch
+import os
 import json
-from src import evaluation_module
+import tempfile
+from src import answer_classifier, evaluation_module, genai_client, llm_cache, llm_metrics, prompt_budget
 
 class TestEvaluationModule(unittest.TestCase):
 
+    def setUp(self):
+        # Failure paths below expect the placeholders, not a local classifier verdict
+        patcher = patch.object(answer_classifier, 'ENABLED', False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
     def test_parse_feedback_from_text(self):
         valid_json_text = '{"score": 8, "strengths": "Clear", "areas_for_improvement": "More detail", "sample_answer": "A good answer."}'
         expected_dict = {"score": 8, "strengths": "Clear", "areas_for_improvement": "More detail", "sample_answer": "A good answer."}
@@ -54,6 +62,33 @@ class TestEvaluationModule(unittest.TestCase):
         self.assertEqual(evaluation["score"], "N/A (GenAI parsing error)")
         self.assertIn("Could not parse GenAI feedback", evaluation["strengths"])
 
+    @patch('src.evaluation_module.stream_text')
+    def test_stream_evaluation_yields_fields_early(self, mock_stream_text):
+        mock_stream_text.return_value = iter([
+            '{"score": 8, "strengths": "Clear"', ', "areas_for_improvement": "Depth", ',
+            '"sample_answer": "Start with', ' context."}'
+        ])
+        updates = list(evaluation_module.stream_evaluation("Q1", "R1", {"job_role": "Engineer"}))
+
+        self.assertEqual(updates[0], {"score": 8})
+        self.assertIn({"score": 8, "strengths": "Clear", "areas_for_improvement": "Depth",
+                       "sample_answer": "Start with"}, updates)
+        self.assertEqual(updates[-1], {"score": 8, "strengths": "Clear", "areas_for_improvement": "Depth",
+                                       "sample_answer": "Start with context."})
+
+    @patch('src.evaluation_module.stream_text')
+    def test_stream_evaluation_call_failure(self, mock_stream_text):
+        mock_stream_text.return_value = iter([])
+        updates = list(evaluation_module.stream_evaluation("Q1", "R1", {}))
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(updates[0]["score"], "N/A (GenAI call failed)")
+
+    @patch('src.evaluation_module.stream_text')
+    def test_stream_evaluation_parsing_failure(self, mock_stream_text):
+        mock_stream_text.return_value = iter(["Not ", "JSON"])
+        updates = list(evaluation_module.stream_evaluation("Q1", "R1", {}))
+        self.assertEqual(updates[-1]["score"], "N/A (GenAI parsing error)")
+
     @patch('src.evaluation_module.generate_text')
     def test_generate_overall_performance_success(self, mock_generate_text):
         overall_analysis_json = {
@@ -102,5 +137,149 @@ class TestEvaluationModule(unittest.TestCase):
             self.assertEqual(overall_perf["average_score"], 0)
             self.assertEqual(overall_perf["overall_analysis"], "Default")
 
+    @patch('src.evaluation_module.generate_text')
+    def test_evaluate_response_trims_long_response(self, mock_generate_text):
+        mock_generate_text.return_value = None
+        evaluation_module.evaluate_response("Q?", "rambling " * 2000, {"job_role": "Dev"})
+        prompt_messages = mock_generate_text.call_args[0][0]
+        self.assertLessEqual(sum(len(m["content"]) for m in prompt_messages) // 4,
+                             prompt_budget.PROMPT_BUDGETS["evaluate"])
+
+    @patch('src.evaluation_module.generate_text')
+    def test_generate_overall_performance_shares_budget(self, mock_generate_text):
+        mock_generate_text.return_value = None
+        questions = [f"Question {i}?" for i in range(10)]
+        responses = ["long answer " * 1000 for _ in questions]
+        feedback = [{"score": 5, "strengths": "ok", "areas_for_improvement": "more"} for _ in questions]
+        evaluation_module.generate_overall_performance(questions, responses, feedback, {"job_role": "Dev"})
+        prompt_user = mock_generate_text.call_args[0][0][1]["content"]
+        self.assertLessEqual(len(prompt_user) // 4, prompt_budget.PROMPT_BUDGETS["overall"])
+        self.assertIn("Q10: Question 9?", prompt_user)
+
+    @patch('src.evaluation_module.generate_text')
+    def test_evaluation_prompt_carries_job_description_summary(self, mock_generate_text):
+        mock_generate_text.return_value = None
+        job_description = "Senior engineer with Kafka and Kubernetes experience. " + "We value fun Fridays. " * 200
+        config = {"job_role": "Dev", "job_description": job_description}
+        evaluation_module.evaluate_response("Q?", "A", config)
+        prompt_user = mock_generate_text.call_args[0][0][1]["content"]
+        self.assertIn("Role Requirements: Seniority: senior. Skills: Kafka, Kubernetes.", prompt_user)
+        self.assertNotIn("Fridays", prompt_user)
+
+    @patch('src.evaluation_module.generate_text')
+    def test_parse_failures_are_counted(self, mock_generate_text):
+        mock_generate_text.return_value = "Not JSON"
+        before = llm_metrics.get_metrics().snapshot().get("evaluate", {}).get("parse_failures", 0)
+        evaluation_module.evaluate_response("Q?", "A", {})
+        after = llm_metrics.get_metrics().snapshot()["evaluate"]["parse_failures"]
+        self.assertEqual(after, before + 1)
+
+    @patch('src.evaluation_module.generate_text')
+    def test_evaluate_responses_in_one_call(self, mock_generate_text):
+        mock_generate_text.return_value = json.dumps([
+            {"index": 2, "score": 4, "strengths": "S2", "areas_for_improvement": "A2", "sample_answer": "SA2"},
+            {"index": 1, "score": 8, "strengths": "S1", "areas_for_improvement": "A1", "sample_answer": "SA1"},
+        ])
+        feedback = evaluation_module.evaluate_responses(["Q1?", "Q2?", "Q3?"], ["A1", "A2", None], {"job_role": "Dev"})
+
+        mock_generate_text.assert_called_once()
+        self.assertEqual(mock_generate_text.call_args.kwargs["call_site"], "evaluate_batch")
+        self.assertIn("Answer 2:\nInterview Question: 'Q2?'", mock_generate_text.call_args[0][0][1]["content"])
+        self.assertEqual([fb["score"] if fb else None for fb in feedback], [8, 4, None])
+        self.assertEqual(feedback[0]["sample_answer"], "SA1")
+
+    @patch('src.evaluation_module.generate_text')
+    def test_evaluate_responses_falls_back_per_item(self, mock_generate_text):
+        single = {"score": 6, "strengths": "S", "areas_for_improvement": "A", "sample_answer": "SA"}
+        mock_generate_text.side_effect = lambda messages, call_site, validate=None: (
+            '```json\n[{"score": 9, "strengths": "S1"}, "garbled"]\n```' if call_site == "evaluate_batch"
+            else json.dumps(single)
+        )
+        feedback = evaluation_module.evaluate_responses(["Q1?", "Q2?"], ["A1", "A2"], {})
+
+        self.assertEqual(feedback[0]["score"], 9)
+        self.assertEqual(feedback[0]["sample_answer"], "N/A (GenAI error)")
+        self.assertEqual(feedback[1], single)
+        self.assertEqual([c.kwargs["call_site"] for c in mock_generate_text.call_args_list], ["evaluate_batch", "evaluate"])
+
+        mock_generate_text.side_effect = lambda messages, call_site, validate=None: "Not JSON" if call_site == "evaluate_batch" \
+            else json.dumps(single)
+        self.assertEqual(evaluation_module.evaluate_responses(["Q1?", "Q2?"], ["A1", "A2"], {}), [single, single])
+
+    @patch('src.evaluation_module.generate_text', return_value=None)
+    def test_evaluate_responses_call_failure(self, mock_generate_text):
+        feedback = evaluation_module.evaluate_responses(["Q1?", "Q2?"], ["A1", "A2"], {})
+        self.assertEqual(feedback, [evaluation_module.CALL_FAILED_FEEDBACK] * 2)
+        mock_generate_text.assert_called_once()
+
+    @patch('src.evaluation_module.generate_text')
+    def test_evaluate_responses_splits_large_batches(self, mock_generate_text):
+        mock_generate_text.side_effect = lambda messages, call_site, validate=None: json.dumps(
+            [{"score": 5}] * messages[1]["content"].count("Interview Question:")
+        )
+        with patch.object(evaluation_module, 'MAX_BATCH_SIZE', 2):
+            feedback = evaluation_module.evaluate_responses(["Q?"] * 5, ["A"] * 5, {})
+        self.assertEqual(mock_generate_text.call_count, 3)
+        self.assertEqual([fb["score"] for fb in feedback], [5] * 5)
+
+    @patch('builtins.print')
+    def test_unparseable_feedback_is_not_served_from_cache(self, _):
+        good_feedback = {"score": 7, "strengths": "S", "areas_for_improvement": "A", "sample_answer": "X"}
+        replies = iter(['{"score": 7, "strengths": "cut off', json.dumps(good_feedback), "unused"])
+        with tempfile.TemporaryDirectory() as tmpdir, \
+                patch.object(llm_cache, 'CACHE_PATH', os.path.join(tmpdir, "cache.db")), \
+                patch.object(genai_client, '_protected_send', side_effect=lambda *args: next(replies)) as mock_send:
+            first = evaluation_module.evaluate_response("Q?", "An answer.", {})
+            second = evaluation_module.evaluate_response("Q?", "An answer.", {})
+            third = evaluation_module.evaluate_response("Q?", "An answer.", {})
+        self.assertEqual(first["score"], evaluation_module.PARSING_ERROR_FEEDBACK["score"])
+        self.assertEqual(second, good_feedback)
+        self.assertEqual(third, good_feedback)  # The parsed response was cached
+        self.assertEqual(mock_send.call_count, 2)
+
+class TestAnswerQualityClassifier(unittest.TestCase):
+
+    @patch('src.evaluation_module.answer_classifier.predict', return_value=["excellent"])
+    def test_classify_answer_quality(self, mock_predict):
+        self.assertEqual(evaluation_module.classify_answer_quality("A thorough answer.", "Q?"), "excellent")
+        mock_predict.assert_called_once_with(["Question: Q? Answer: A thorough answer."], True)
+        self.assertEqual(evaluation_module.classify_answer_quality("   "), "insufficient")
+
+    @patch('src.evaluation_module.answer_classifier.predict')
+    @patch('src.evaluation_module.stream_text')
+    @patch('src.evaluation_module.generate_text')
+    def test_blank_answer_gets_no_answer_feedback_by_rule(self, mock_generate_text, mock_stream_text, mock_predict):
+        self.assertEqual(evaluation_module.evaluate_response("Q?", "  \n ", {}), evaluation_module.NO_ANSWER_FEEDBACK)
+        self.assertEqual(list(evaluation_module.stream_evaluation("Q?", "", {})), [evaluation_module.NO_ANSWER_FEEDBACK])
+        self.assertEqual(evaluation_module.evaluate_responses(["Q1?", "Q2?"], ["   ", None], {}), [None, None])
+        feedback = evaluation_module._fallback_feedback("Q?", " ")
+        self.assertEqual(feedback["quality_source"], "rule")
+        self.assertIn("by rule", feedback["strengths"])
+        mock_generate_text.assert_not_called()
+        mock_stream_text.assert_not_called()
+        mock_predict.assert_not_called()
+
+    @patch('src.evaluation_module.answer_classifier.predict', return_value=None)
+    def test_classify_answer_quality_unavailable(self, _):
+        self.assertIsNone(evaluation_module.classify_answer_quality("An answer.", "Q?"))
+
+    @patch('src.evaluation_module.answer_classifier.predict', return_value=["adequate"])
+    @patch('src.evaluation_module.generate_text', return_value=None)
+    def test_api_failure_scored_by_classifier(self, _, __):
+        feedback = evaluation_module.evaluate_response("Q?", "An answer.", {})
+        self.assertEqual(feedback["score"], 6)
+        self.assertEqual(feedback["quality"], "adequate")
+        self.assertEqual(feedback["quality_source"], "classifier")
+        self.assertIn("local answer classifier", feedback["strengths"])
+        self.assertEqual(feedback["sample_answer"], evaluation_module.CALL_FAILED_FEEDBACK["sample_answer"])
+        self.assertTrue(evaluation_module.is_fallback_feedback(feedback))
+
+    def test_is_fallback_feedback(self):
+        self.assertTrue(evaluation_module.is_fallback_feedback(evaluation_module.CALL_FAILED_FEEDBACK))
+        self.assertTrue(evaluation_module.is_fallback_feedback(evaluation_module.PARSING_ERROR_FEEDBACK))
+        self.assertFalse(evaluation_module.is_fallback_feedback(evaluation_module.NO_ANSWER_FEEDBACK))
+        self.assertFalse(evaluation_module.is_fallback_feedback({"score": 7, "strengths": "Clear."}))
+        self.assertFalse(evaluation_module.is_fallback_feedback(None))
+
 if __name__ == '__main__':
     unittest.main()
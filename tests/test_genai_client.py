@@ -1,25 +1,433 @@
-import unittest
-from unittest.mock import patch
-
-# Assuming genai_client might be in src, adjust import if necessary
-# from src import genai_client
-
-class TestGenAIClient(unittest.TestCase):
-
-    @patch('requests.post') # Assuming it uses requests.post
-    def test_generate_text_placeholder(self, mock_post):
-        # This is a placeholder test.
-        # Replace with actual tests when genai_client.py content is known.
-        # Example:
-        # mock_response = mock_post.return_value
-        # mock_response.status_code = 200
-        # mock_response.json.return_value = {"choices": [{"message": {"content": "Generated text"}}]}
-        #
-        # messages = [{"role": "user", "content": "Hello"}]
-        # result = genai_client.generate_text(messages)
-        # self.assertEqual(result, "Generated text")
-        # mock_post.assert_called_once()
-        self.assertTrue(True, "Placeholder test for genai_client.generate_text")
-
-if __name__ == '__main__':
-    unittest.main()
+import unittest
+import asyncio
+from unittest.mock import patch
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+# Add src to sys.path to allow direct import of src modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import genai_client, llm_cache, llm_metrics, llm_providers, rate_limiter
+from src.resilience import CircuitBreaker
+
+
+def _mock_client(handler):
+    """Builds an httpx client whose requests are answered by handler."""
+    return httpx.Client(transport=httpx.MockTransport(handler))
+
+
+class _CompletionHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.dumps({"choices": [{"message": {"content": "pong"}}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestGenAIClient(unittest.TestCase):
+
+    def setUp(self):
+        genai_client.reset_pool_stats()
+        self.provider = llm_providers.MistralProvider(api_key='test-key')
+        for patcher in (
+            patch.dict(llm_providers._providers, {'mistral': self.provider}, clear=True),
+            patch.object(llm_providers, 'DEFAULT_PROVIDER', 'mistral'),
+            patch.object(llm_providers, 'CALL_SITE_ROUTES', {}),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        # Keep each test's cached responses in a throwaway database
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        cache_patcher = patch.object(llm_cache, 'CACHE_PATH', os.path.join(tmpdir.name, "cache.db"))
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+
+        # A generous limiter per test so budgets and 429 pauses do not leak between tests
+        self.limiter = rate_limiter.RateLimiter(requests_per_minute=60000, tokens_per_minute=1e9)
+        limiter_patcher = patch.dict(rate_limiter._limiters, {'mistral': self.limiter}, clear=True)
+        limiter_patcher.start()
+        self.addCleanup(limiter_patcher.stop)
+
+        llm_metrics.reset_metrics()
+        self.addCleanup(llm_metrics.reset_metrics)
+
+        # Fresh breakers and latency windows, created on demand with a low failure threshold
+        for resilience_patcher in (
+            patch.dict(genai_client._breakers, clear=True),
+            patch.dict(genai_client._latencies, clear=True),
+            patch.object(genai_client, 'BREAKER_FAILURES', 3),
+        ):
+            resilience_patcher.start()
+            self.addCleanup(resilience_patcher.stop)
+
+    def test_generate_text_success(self):
+        def handler(request):
+            payload = json.loads(request.content)
+            self.assertEqual(payload["model"], "mistral-tiny")
+            self.assertEqual(request.headers["Authorization"], "Bearer test-key")
+            return httpx.Response(200, json={"choices": [{"message": {"content": "Generated text"}}]})
+
+        with patch.object(genai_client, '_http_client', _mock_client(handler)):
+            result = genai_client.generate_text([{"role": "user", "content": "Hello"}])
+        self.assertEqual(result, "Generated text")
+        self.assertEqual(genai_client.get_pool_stats()["requests"], 1)
+
+    @patch('builtins.print')
+    def test_generate_text_http_error(self, mock_print):
+        handler = lambda request: httpx.Response(500, json={"error": "boom"})
+        with patch.object(genai_client, '_http_client', _mock_client(handler)):
+            self.assertIsNone(genai_client.generate_text([{"role": "user", "content": "Hello"}]))
+
+    @patch('builtins.print')
+    def test_generate_text_timeout(self, mock_print):
+        def handler(request):
+            raise httpx.ReadTimeout("too slow", request=request)
+
+        with patch.object(genai_client, '_http_client', _mock_client(handler)):
+            self.assertIsNone(genai_client.generate_text([{"role": "user", "content": "Hello"}]))
+
+    @patch('builtins.print')
+    def test_generate_text_missing_key(self, mock_print):
+        with patch.object(self.provider, 'api_key', None):
+            self.assertIsNone(genai_client.generate_text([{"role": "user", "content": "Hello"}]))
+        mock_print.assert_any_call("Error: MISTRAL_API_KEY environment variable not set.")
+
+    def test_pool_reuses_keepalive_connections(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _CompletionHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+        client = genai_client._build_http_client(pool_size=2, connect_timeout=1, read_timeout=5)
+        self.addCleanup(client.close)
+        with patch.object(self.provider, 'base_url', url), patch.object(genai_client, '_http_client', client):
+            for _ in range(3):
+                self.assertEqual(genai_client.generate_text([{"role": "user", "content": "ping"}]), "pong")
+            stats = genai_client.get_pool_stats()
+
+        self.assertEqual(stats["requests"], 3)
+        self.assertEqual(stats["new_connections"], 1)
+        self.assertEqual(stats["reused_connections"], 2)
+        self.assertEqual(stats["open_connections"], 1)
+
+    def test_configure_http_client_applies_timeouts(self):
+        self.addCleanup(genai_client.configure_http_client,
+                        genai_client.POOL_SIZE, genai_client.CONNECT_TIMEOUT, genai_client.READ_TIMEOUT)
+        genai_client.configure_http_client(pool_size=4, connect_timeout=2.0, read_timeout=9.0)
+        client = genai_client.get_http_client()
+        self.assertEqual(client.timeout.connect, 2.0)
+        self.assertEqual(client.timeout.read, 9.0)
+        self.assertEqual(genai_client.get_pool_stats()["pool_size"], 4)
+
+    def test_stream_text_yields_deltas(self):
+        events = [
+            {"choices": [{"delta": {"role": "assistant", "content": ""}}]},
+            {"choices": [{"delta": {"content": "Hel"}}]},
+            {"choices": [{"delta": {"content": "lo"}}]},
+        ]
+        body = "".join(f"data: {json.dumps(event)}\n\n" for event in events) + "data: [DONE]\n\n"
+
+        def handler(request):
+            self.assertTrue(json.loads(request.content)["stream"])
+            return httpx.Response(200, text=body, headers={"Content-Type": "text/event-stream"})
+
+        with patch.object(genai_client, '_http_client', _mock_client(handler)):
+            deltas = list(genai_client.stream_text([{"role": "user", "content": "Hi"}]))
+        self.assertEqual(deltas, ["Hel", "lo"])
+
+    @patch('builtins.print')
+    def test_stream_text_error_yields_nothing(self, mock_print):
+        handler = lambda request: httpx.Response(429, json={"message": "rate limited"})
+        with patch.object(genai_client, '_http_client', _mock_client(handler)):
+            self.assertEqual(list(genai_client.stream_text([{"role": "user", "content": "Hi"}])), [])
+        mock_print.assert_any_call("Response content: {'message': 'rate limited'}")
+
+    def test_generate_text_served_from_cache(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200, json={"choices": [{"message": {"content": "Generated text"}}]})
+
+        messages = [{"role": "user", "content": "Cache me"}]
+        with patch.object(genai_client, '_http_client', _mock_client(handler)):
+            first = genai_client.generate_text(messages, call_site="question_gen")
+            second = genai_client.generate_text(messages, call_site="question_gen")
+            streamed = list(genai_client.stream_text(messages, call_site="question_gen"))
+        self.assertEqual(first, second)
+        self.assertEqual(streamed, ["Generated text"])
+        self.assertEqual(len(calls), 1)
+
+    @patch('builtins.print')
+    def test_failed_generation_is_not_cached(self, mock_print):
+        responses = iter([httpx.Response(500), httpx.Response(200, json={"choices": [{"message": {"content": "ok"}}]})])
+        messages = [{"role": "user", "content": "Retry me"}]
+        with patch.object(genai_client, '_http_client', _mock_client(lambda request: next(responses))):
+            self.assertIsNone(genai_client.generate_text(messages, call_site="evaluate"))
+            self.assertEqual(genai_client.generate_text(messages, call_site="evaluate"), "ok")
+
+    def test_rejected_response_is_not_cached(self):
+        replies = iter(["not json", '{"ok": true}', "unused"])
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            content = next(replies)
+            if json.loads(request.content).get("stream"):
+                body = f"data: {json.dumps({'choices': [{'delta': {'content': content}}]})}\n\ndata: [DONE]\n\n"
+                return httpx.Response(200, text=body, headers={"Content-Type": "text/event-stream"})
+            return httpx.Response(200, json={"choices": [{"message": {"content": content}}]})
+
+        messages = [{"role": "user", "content": "Validate me"}]
+        validate = lambda text: text.startswith("{")
+        with patch.object(genai_client, '_http_client', _mock_client(handler)):
+            self.assertEqual(genai_client.generate_text(messages, call_site="evaluate", validate=validate), "not json")
+            self.assertEqual(list(genai_client.stream_text(messages, call_site="evaluate", validate=validate)),
+                             ['{"ok": true}'])
+            self.assertEqual(genai_client.generate_text(messages, call_site="evaluate", validate=validate),
+                             '{"ok": true}')
+        self.assertEqual(len(calls), 2)
+
+    def test_zero_ttl_call_site_bypasses_cache(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200, json={"choices": [{"message": {"content": "fresh"}}]})
+
+        with patch.dict(llm_cache.CALL_SITE_TTLS, {"nocache": 0}), \
+                patch.object(genai_client, '_http_client', _mock_client(handler)):
+            for _ in range(2):
+                genai_client.generate_text([{"role": "user", "content": "x"}], call_site="nocache")
+        self.assertEqual(len(calls), 2)
+
+    def test_concurrent_identical_calls_are_coalesced(self):
+        for call_site in ("question_gen", None):
+            with self.subTest(call_site=call_site):
+                self._assert_coalesced(call_site)
+
+    def _assert_coalesced(self, call_site):
+        release = threading.Event()
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            release.wait(2)
+            return httpx.Response(200, json={"choices": [{"message": {"content": "shared"}}]})
+
+        genai_client._inflight.reset_stats()
+        messages = [{"role": "user", "content": "Same prompt"}]
+        results = []
+        with patch.object(genai_client, '_http_client', _mock_client(handler)):
+            threads = [
+                threading.Thread(target=lambda: results.append(genai_client.generate_text(messages, call_site=call_site)))
+                for _ in range(4)
+            ]
+            for thread in threads:
+                thread.start()
+            for _ in range(200):
+                if genai_client.get_coalescing_stats()["coalesced"] == 3:
+                    break
+                time.sleep(0.01)
+            release.set()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(results, ["shared"] * 4)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(genai_client.get_coalescing_stats()["coalesced"], 3)
+
+    @patch('builtins.print')
+    def test_generate_text_retries_after_429(self, mock_print):
+        responses = iter([
+            httpx.Response(429, headers={"Retry-After": "0"}),
+            httpx.Response(200, json={"choices": [{"message": {"content": "ok"}}], "usage": {"total_tokens": 12}}),
+        ])
+        with patch.object(genai_client, '_http_client', _mock_client(lambda request: next(responses))):
+            self.assertEqual(genai_client.generate_text([{"role": "user", "content": "Hi"}]), "ok")
+        stats = self.limiter.stats()
+        self.assertEqual(stats["throttled"], 1)
+        self.assertEqual(stats["acquired"], 2)
+
+    @patch('builtins.print')
+    def test_circuit_breaker_fails_fast(self, mock_print):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503)
+
+        with patch.object(genai_client, '_http_client', _mock_client(handler)):
+            for _ in range(5):
+                self.assertIsNone(genai_client.generate_text([{"role": "user", "content": "Hi"}]))
+            self.assertEqual(list(genai_client.stream_text([{"role": "user", "content": "Hi"}])), [])
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(genai_client.get_resilience_stats()["breaker"]["state"], CircuitBreaker.OPEN)
+        mock_print.assert_any_call("Circuit breaker open: skipping Mistral API call.")
+
+    @patch('builtins.print')
+    def test_slow_failing_call_is_hedged(self, _):
+        first_call = threading.Event()
+
+        def handler(request):
+            if not first_call.is_set():
+                first_call.set()
+                time.sleep(0.3)
+                return httpx.Response(500, json={"error": "slow and failing"})
+            return httpx.Response(200, json={"choices": [{"message": {"content": "fast"}}]})
+
+        with patch.object(genai_client, '_http_client', _mock_client(handler)), \
+                patch.object(genai_client, '_hedge_delay', return_value=0.05), \
+                patch.dict(genai_client._hedge_stats, {"hedged": 0, "hedge_wins": 0}):
+            result = genai_client.generate_text([{"role": "user", "content": "Hi"}])
+            stats = genai_client.get_resilience_stats()
+        self.assertEqual(result, "fast")
+        self.assertEqual((stats["hedged"], stats["hedge_wins"]), (1, 1))
+
+    def test_hedge_delay_follows_latency_percentile(self):
+        self.assertIsNone(genai_client._hedge_delay(self.provider))
+        latency = genai_client._latency_for(self.provider)
+        for i in range(genai_client.HEDGE_MIN_SAMPLES):
+            latency.record(float(i + 1))
+        self.assertEqual(genai_client._hedge_delay(self.provider), latency.percentile(genai_client.HEDGE_PERCENTILE))
+
+    def test_call_site_route_picks_provider_and_model(self):
+        google = llm_providers.GoogleGenAIProvider(api_key='g-key')
+
+        def handler(request):
+            self.assertEqual(request.url.path, "/v1beta/models/gemini-test:generateContent")
+            self.assertEqual(request.headers["x-goog-api-key"], "g-key")
+            return httpx.Response(200, json={
+                "candidates": [{"content": {"parts": [{"text": "From Gemini"}]}}],
+                "usageMetadata": {"totalTokenCount": 7},
+            })
+
+        with patch.dict(llm_providers._providers, {'google': google}), \
+                patch.object(llm_providers, 'CALL_SITE_ROUTES', {'evaluate': ('google', 'gemini-test')}), \
+                patch.object(genai_client, '_http_client', _mock_client(handler)):
+            result = genai_client.generate_text([{"role": "user", "content": "Hi"}], call_site="evaluate")
+        self.assertEqual(result, "From Gemini")
+
+    @patch('builtins.print')
+    def test_breakers_are_per_provider(self, mock_print):
+        other = llm_providers.OpenAICompatibleProvider(base_url="http://other.test/v1")
+
+        def handler(request):
+            if request.url.host == "other.test":
+                return httpx.Response(200, json={"choices": [{"message": {"content": "ok"}}]})
+            return httpx.Response(503)
+
+        with patch.dict(llm_providers._providers, {'openai': other}), \
+                patch.object(genai_client, '_http_client', _mock_client(handler)):
+            for _ in range(3):
+                genai_client.generate_text([{"role": "user", "content": "Hi"}])
+            self.assertEqual(genai_client.generate_text([{"role": "user", "content": "Hi"}], provider="openai"), "ok")
+        self.assertEqual(genai_client.get_resilience_stats()["breaker"]["state"], CircuitBreaker.OPEN)
+        self.assertEqual(genai_client.get_resilience_stats("openai")["breaker"]["state"], CircuitBreaker.CLOSED)
+
+    @patch('builtins.print')
+    def test_calls_are_recorded_in_metrics(self, mock_print):
+        responses = iter([
+            httpx.Response(200, json={"choices": [{"message": {"content": "ok"}}],
+                                      "usage": {"prompt_tokens": 11, "completion_tokens": 4, "total_tokens": 15}}),
+            httpx.Response(500),
+        ])
+        messages = [{"role": "user", "content": "Metrics"}]
+        with patch.object(genai_client, '_http_client', _mock_client(lambda request: next(responses))):
+            genai_client.generate_text(messages, call_site="evaluate")
+            genai_client.generate_text(messages, call_site="evaluate")  # Served from the cache
+            genai_client.generate_text([{"role": "user", "content": "Other"}], call_site="overall")
+
+        snapshot = llm_metrics.get_metrics().snapshot()
+        self.assertEqual(snapshot["evaluate"]["requests"], {"mistral:cached": 1, "mistral:ok": 1})
+        self.assertEqual(snapshot["evaluate"]["tokens"], {"completion": 4, "prompt": 11})
+        self.assertEqual(snapshot["evaluate"]["latency"]["count"], 2)
+        self.assertEqual(snapshot["overall"]["requests"], {"mistral:error": 1})
+        self.assertEqual(snapshot["overall"]["errors"], {"http_500": 1})
+
+    def test_agenerate_many_preserves_order_and_bounds_concurrency(self):
+        in_flight = {"now": 0, "peak": 0}
+
+        async def handler(request):
+            in_flight["now"] += 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+            prompt = json.loads(request.content)["messages"][0]["content"]
+            # Later prompts finish first so ordering has to come from gather
+            await asyncio.sleep(0.01 * (5 - int(prompt)))
+            in_flight["now"] -= 1
+            return httpx.Response(200, json={"choices": [{"message": {"content": f"answer {prompt}"}}]})
+
+        async def run():
+            client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            semaphore = asyncio.Semaphore(2)
+            try:
+                batch = [[{"role": "user", "content": str(i)}] for i in range(5)]
+                return await genai_client.agenerate_many(batch, client=client, semaphore=semaphore)
+            finally:
+                await client.aclose()
+
+        results = asyncio.run(run())
+        self.assertEqual(results, [f"answer {i}" for i in range(5)])
+        self.assertEqual(in_flight["peak"], 2)
+
+    @patch('builtins.print')
+    def test_agenerate_text_failure_returns_none(self, mock_print):
+        async def run():
+            client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(503)))
+            try:
+                return await genai_client.agenerate_text([{"role": "user", "content": "Hi"}], client=client)
+            finally:
+                await client.aclose()
+                await genai_client.aclose_http_client()
+
+        self.assertIsNone(asyncio.run(run()))
+    def test_cancelled_agenerate_text_releases_half_open_breaker(self):
+        now = [0.0]
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=lambda: now[0])
+        genai_client._breakers['mistral'] = breaker
+        breaker.record_failure()
+        now[0] = 10.0  # Half-open: the next call is the trial
+
+        async def hang(request):
+            await asyncio.sleep(60)
+
+        async def run():
+            client = httpx.AsyncClient(transport=httpx.MockTransport(hang))
+            task = asyncio.create_task(
+                genai_client.agenerate_text([{"role": "user", "content": "Hi"}], client=client)
+            )
+            try:
+                await asyncio.sleep(0.05)
+                task.cancel()
+                with self.assertRaises(asyncio.CancelledError):
+                    await task
+            finally:
+                await client.aclose()
+                await genai_client.aclose_http_client()
+
+        asyncio.run(run())
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        now[0] = 20.0
+        self.assertTrue(breaker.allow_request())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+import os
+import sys
+import threading
+
+# Add src to sys.path to allow direct import of src modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import inference_queue
+
+
+class TestInferenceQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.batches = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def _predict(self, items):
+        self.release.wait(5)
+        self.batches.append(list(items))
+        return [item * 2 for item in items]
+
+    def _queue(self, **kwargs):
+        batch_queue = inference_queue.InferenceQueue(self._predict, **kwargs)
+        self.addCleanup(batch_queue.close, 5)
+        return batch_queue
+
+    def test_requests_within_wait_window_share_a_batch(self):
+        batch_queue = self._queue(max_batch_size=8, max_wait=1.0)
+        futures = [batch_queue.submit(number) for number in range(3)]
+        batch_queue.close(5)
+        self.assertEqual([future.result(5) for future in futures], [0, 2, 4])
+        self.assertEqual(self.batches, [[0, 1, 2]])
+
+    def test_batch_size_is_bounded(self):
+        self.release.clear()  # Hold the worker on its first batch while the rest queue up
+        batch_queue = self._queue(max_batch_size=2, max_wait=0)
+        futures = batch_queue.submit_many(range(5))
+        self.release.set()
+        self.assertEqual([future.result(5) for future in futures], [0, 2, 4, 6, 8])
+        self.assertTrue(all(len(batch) <= 2 for batch in self.batches))
+        stats = batch_queue.stats()
+        self.assertEqual(stats["requests"], 5)
+        self.assertEqual(stats["largest_batch"], 2)
+
+    def test_concurrent_callers_get_their_own_results(self):
+        batch_queue = self._queue(max_batch_size=16, max_wait=0.05)
+        results = {}
+
+        def caller(number):
+            results[number] = batch_queue.predict([number, number + 100], timeout=5)
+
+        threads = [threading.Thread(target=caller, args=(number,)) for number in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(results, {number: [number * 2, (number + 100) * 2] for number in range(8)})
+        self.assertLess(len(self.batches), 16)
+
+    def test_predict_error_fails_the_whole_batch(self):
+        def failing_predict(items):
+            raise ValueError("model crashed")
+
+        batch_queue = inference_queue.InferenceQueue(failing_predict, max_wait=0.5)
+        self.addCleanup(batch_queue.close, 5)
+        futures = batch_queue.submit_many(["a", "b"])
+        for future in futures:
+            with self.assertRaises(ValueError):
+                future.result(5)
+
+    def test_submit_after_close_raises(self):
+        batch_queue = self._queue()
+        self.assertEqual(batch_queue.predict([1], timeout=5), [2])
+        batch_queue.close(5)
+        with self.assertRaises(RuntimeError):
+            batch_queue.submit(1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+import ast
+import os
+import sys
+from unittest.mock import patch
+
+# Add src to sys.path to allow direct import of src modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import jd_analysis
+
+JD = (
+    "Senior Backend Engineer. We are looking for an engineer with 5+ years of experience building scalable "
+    "microservices in Python and Golang. You will design REST APIs, own our PostgreSQL and Redis data layer, "
+    "and deploy on AWS with Docker and Kubernetes. We offer free snacks and a rapidly growing team."
+)
+
+
+class TestJDAnalysis(unittest.TestCase):
+
+    def setUp(self):
+        jd_analysis.clear_analysis_cache()
+
+    def test_topics_match_dataset_generator_taxonomy(self):
+        path = os.path.join(os.path.dirname(__file__), '..', 'dataset_generator.py')
+        with open(path, encoding='utf-8') as f:
+            tree = ast.parse(f.read())
+        topics = next(ast.literal_eval(node.value) for node in tree.body
+                      if isinstance(node, ast.Assign) and getattr(node.targets[0], 'id', None) == 'TOPICS')
+        self.assertEqual(list(jd_analysis.TOPIC_KEYWORDS), topics)
+
+    def test_analysis_extracts_skills_seniority_and_topics(self):
+        analysis = jd_analysis.analyze_job_description(JD)
+        self.assertEqual(analysis["seniority"], "senior")
+        self.assertEqual(analysis["years"], 5)
+        for skill in ("Python", "Go", "PostgreSQL", "Redis", "AWS", "Docker", "Kubernetes", "REST"):
+            self.assertIn(skill, analysis["skills"])
+        self.assertNotIn("Java", analysis["skills"])
+        for topic in ("Databases", "DevOps", "System Design"):
+            self.assertIn(topic, analysis["topics"])
+        self.assertNotIn("API Design", jd_analysis.map_topics("We offer a rapidly growing team."))
+        self.assertNotIn("snacks", analysis["highlights"])
+
+    def test_seniority_from_years_when_no_title(self):
+        self.assertEqual(jd_analysis.extract_seniority("Requires 2-3 years of SQL."), ("mid-level", 2))
+        self.assertEqual(jd_analysis.extract_seniority("Entry-level analyst role."), ("junior", None))
+        self.assertEqual(jd_analysis.extract_seniority("You will lead by example."), (None, None))
+
+    def test_analysis_is_cached_by_normalized_text(self):
+        with patch.object(jd_analysis, '_analyze', wraps=jd_analysis._analyze) as mock_analyze:
+            first = jd_analysis.analyze_job_description(JD)
+            first["skills"].append("Mutated")  # Callers get copies
+            second = jd_analysis.analyze_job_description("  " + JD.upper().replace(". ", ".\n\n"))
+        mock_analyze.assert_called_once()
+        self.assertNotIn("Mutated", second["skills"])
+        self.assertEqual(jd_analysis.get_analysis_stats(), {"hits": 1, "misses": 1, "entries": 1})
+        self.assertIsNone(jd_analysis.analyze_job_description("   "))
+
+    def test_summary_is_compact(self):
+        summary = jd_analysis.summarize_job_description(JD)
+        self.assertTrue(summary.startswith("Seniority: senior (5+ years). Skills: "))
+        self.assertLess(len(summary), len(JD))
+        self.assertIn("Highlights: ", jd_analysis.summarize_job_description(JD, highlights=True))
+        self.assertEqual(jd_analysis.summarize_job_description(""), "")
+
+
+if __name__ == '__main__':
+    unittest.main()
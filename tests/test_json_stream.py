@@ -0,0 +1,52 @@
+import unittest
+import sys
+import os
+
+# Add src to sys.path to allow direct import of src modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.json_stream import IncrementalJSONParser
+
+class TestIncrementalJSONParser(unittest.TestCase):
+
+    def _feed_all(self, parser, chunks):
+        members = []
+        for chunk in chunks:
+            members.extend(parser.feed(chunk))
+        return members
+
+    def test_object_members_complete_before_end(self):
+        parser = IncrementalJSONParser()
+        self.assertEqual(parser.feed('{"score": 8, "stren'), [("score", 8)])
+        self.assertEqual(parser.feed('gths": "Clear, concise", "sample'), [("strengths", "Clear, concise")])
+        self.assertEqual(parser.feed('_answer": "Long"}'), [("sample_answer", "Long")])
+        self.assertTrue(parser.done)
+
+    def test_partial_string_value(self):
+        parser = IncrementalJSONParser()
+        parser.feed('{"score": 7, "sample_answer": "First line\\nSecond \\"quoted')
+        self.assertEqual(parser.partial(), ("sample_answer", 'First line\nSecond "quoted'))
+        parser.feed('"}')
+        self.assertIsNone(parser.partial())
+
+    def test_partial_ignores_dangling_escape(self):
+        parser = IncrementalJSONParser()
+        parser.feed('{"strengths": "abc\\')
+        self.assertEqual(parser.partial(), ("strengths", "abc"))
+
+    def test_nested_values_and_code_fence(self):
+        chunks = ['```json\n{"key_strengths": ["a", "b, c"], ', '"meta": {"x": [1, {"y": 2}]}}', '\n```']
+        members = self._feed_all(IncrementalJSONParser(), chunks)
+        self.assertEqual(members, [("key_strengths", ["a", "b, c"]), ("meta", {"x": [1, {"y": 2}]})])
+
+    def test_array_elements_are_indexed(self):
+        chunks = ['["What is ', 'a closure?", "Explain [brackets]"', ', "Last"]']
+        members = self._feed_all(IncrementalJSONParser(), chunks)
+        self.assertEqual(members, [(0, "What is a closure?"), (1, "Explain [brackets]"), (2, "Last")])
+
+    def test_malformed_member_is_skipped(self):
+        members = self._feed_all(IncrementalJSONParser(), ['{"a": nope, "b": 2}'])
+        self.assertEqual(members, [("b", 2)])
+
+if __name__ == '__main__':
+    unittest.main()
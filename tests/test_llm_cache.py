@@ -0,0 +1,64 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import tempfile
+
+# Add src to sys.path to allow direct import of src modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import llm_cache
+
+class TestLLMCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        patcher = patch.object(llm_cache, 'CACHE_PATH', os.path.join(self.tmpdir.name, "cache.db"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        llm_cache.reset_cache_stats()
+
+    def test_make_key_is_stable_and_content_addressed(self):
+        messages = [{"role": "user", "content": "Hi"}]
+        key = llm_cache.make_key("mistral-tiny", messages, {"temperature": 0.7, "max_tokens": 10})
+        self.assertEqual(key, llm_cache.make_key("mistral-tiny", list(messages), {"max_tokens": 10, "temperature": 0.7}))
+        self.assertNotEqual(key, llm_cache.make_key("mistral-small", messages, {"temperature": 0.7, "max_tokens": 10}))
+        self.assertNotEqual(key, llm_cache.make_key("mistral-tiny", [{"role": "user", "content": "Hi!"}]))
+
+    def test_put_get_and_counters(self):
+        self.assertIsNone(llm_cache.get("k1"))
+        llm_cache.put("k1", "cached text", ttl=60, call_site="evaluate")
+        self.assertEqual(llm_cache.get("k1"), "cached text")
+
+        stats = llm_cache.get_cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["writes"]), (1, 1, 1))
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+    def test_expired_entry_is_a_miss(self):
+        with patch('src.llm_cache.time.time', return_value=1000.0):
+            llm_cache.put("k1", "old", ttl=10)
+        with patch('src.llm_cache.time.time', return_value=1011.0):
+            self.assertIsNone(llm_cache.get("k1"))
+        self.assertEqual(llm_cache.get_cache_stats()["expired"], 1)
+
+    def test_lru_eviction(self):
+        with patch.object(llm_cache, 'MAX_ENTRIES', 2):
+            with patch('src.llm_cache.time.time', side_effect=[1.0, 2.0, 3.0, 4.0]):
+                llm_cache.put("a", "A", ttl=1e12)
+                llm_cache.put("b", "B", ttl=1e12)
+                llm_cache.get("a")  # "a" is now more recently used than "b"
+                llm_cache.put("c", "C", ttl=1e12)
+
+        self.assertEqual(llm_cache.get("a"), "A")
+        self.assertIsNone(llm_cache.get("b"))
+        self.assertEqual(llm_cache.get("c"), "C")
+        self.assertEqual(llm_cache.get_cache_stats()["evictions"], 1)
+
+    def test_ttl_for_call_site(self):
+        self.assertEqual(llm_cache.ttl_for("question_gen"), llm_cache.CALL_SITE_TTLS["question_gen"])
+        self.assertEqual(llm_cache.ttl_for("unknown"), llm_cache.DEFAULT_TTL)
+        self.assertEqual(llm_cache.ttl_for(None), 0)
+
+if __name__ == '__main__':
+    unittest.main()
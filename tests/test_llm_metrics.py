@@ -0,0 +1,77 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+
+import httpx
+
+# Add src to sys.path to allow direct import of src modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.llm_metrics import LLMMetrics, dump_metrics, start_metrics_server
+from src import llm_metrics
+
+class TestLLMMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.metrics = LLMMetrics(buckets=(0.5, 1.0))
+
+    def test_histogram_and_counters(self):
+        self.metrics.record_call("evaluate", "mistral", 0.2, "ok")
+        self.metrics.record_call("evaluate", "mistral", 0.7, "ok")
+        self.metrics.record_call("evaluate", "mistral", 3.0, "error")
+        self.metrics.record_call(None, "mistral", 0.1, "cached")
+        self.metrics.record_tokens("evaluate", 120, 80)
+        self.metrics.record_tokens("evaluate", 30, None)
+        self.metrics.record_error("evaluate", "timeout")
+        self.metrics.record_parse_failure("evaluate")
+
+        snapshot = self.metrics.snapshot()
+        evaluate = snapshot["evaluate"]
+        self.assertEqual(evaluate["requests"], {"mistral:error": 1, "mistral:ok": 2})
+        self.assertEqual(evaluate["latency"]["buckets"], {"0.5": 1, "1.0": 2, "+Inf": 3})
+        self.assertEqual(evaluate["latency"]["p50"], 1.0)
+        self.assertAlmostEqual(evaluate["latency"]["sum"], 3.9)
+        self.assertEqual(evaluate["tokens"], {"completion": 80, "prompt": 150})
+        self.assertEqual(evaluate["errors"], {"timeout": 1})
+        self.assertEqual(evaluate["parse_failures"], 1)
+        self.assertEqual(snapshot["unlabelled"]["requests"], {"mistral:cached": 1})
+
+    def test_prometheus_format(self):
+        self.metrics.record_call("overall", "google", 0.7, "ok")
+        self.metrics.record_parse_failure("overall")
+        text = self.metrics.to_prometheus()
+        self.assertIn('genai_request_duration_seconds_bucket{call_site="overall",le="0.5"} 0', text)
+        self.assertIn('genai_request_duration_seconds_bucket{call_site="overall",le="+Inf"} 1', text)
+        self.assertIn('genai_requests_total{call_site="overall",provider="google",outcome="ok"} 1', text)
+        self.assertIn('genai_parse_failures_total{call_site="overall"} 1', text)
+        self.assertIn("# TYPE genai_tokens_total counter", text)
+
+    def test_reset(self):
+        self.metrics.record_error("evaluate", "http_500")
+        self.metrics.reset()
+        self.assertEqual(self.metrics.snapshot(), {})
+
+    def test_exporters(self):
+        llm_metrics.reset_metrics()
+        self.addCleanup(llm_metrics.reset_metrics)
+        llm_metrics.record_call("question_gen", "mistral", 0.3, "ok")
+
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        path = os.path.join(tmpdir.name, "metrics.json")
+        dump_metrics(path)
+        with open(path) as f:
+            self.assertEqual(json.load(f)["question_gen"]["latency"]["count"], 1)
+
+        server = start_metrics_server(0)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        self.assertIn('call_site="question_gen"', httpx.get(f"{base}/metrics").text)
+        self.assertIn("question_gen", httpx.get(f"{base}/metrics.json").json())
+        self.assertEqual(httpx.get(f"{base}/other").status_code, 404)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+import os
+import sys
+
+# Add src to sys.path to allow direct import of src modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from unittest.mock import patch
+
+from src import llm_providers
+from src.llm_providers import GoogleGenAIProvider, MistralProvider, OpenAICompatibleProvider
+
+MESSAGES = [
+    {"role": "system", "content": "Be brief."},
+    {"role": "user", "content": "Hello"},
+]
+
+class TestLLMProviders(unittest.TestCase):
+
+    def test_mistral_request(self):
+        provider = MistralProvider(api_key="m-key")
+        url, headers, payload = provider.build_request(MESSAGES, "mistral-small")
+        self.assertEqual(url, "https://api.mistral.ai/v1/chat/completions")
+        self.assertEqual(headers["Authorization"], "Bearer m-key")
+        self.assertEqual(payload, {"model": "mistral-small", "messages": MESSAGES})
+        self.assertTrue(provider.requests_per_minute)
+
+    def test_openai_compatible_works_without_key(self):
+        provider = OpenAICompatibleProvider(api_key="", base_url="http://localhost:8080/v1/")
+        self.assertTrue(provider.is_configured())
+        url, headers, payload = provider.build_request(MESSAGES, "local", stream=True)
+        self.assertEqual(url, "http://localhost:8080/v1/chat/completions")
+        self.assertNotIn("Authorization", headers)
+        self.assertTrue(payload["stream"])
+        self.assertIsNone(provider.requests_per_minute)
+
+    def test_openai_response_parsing(self):
+        provider = OpenAICompatibleProvider()
+        data = {"choices": [{"message": {"content": "Hi"}}], "usage": {"total_tokens": 9}}
+        self.assertEqual(provider.extract_content(data), "Hi")
+        self.assertEqual(provider.usage_tokens(data), 9)
+        self.assertIsNone(provider.extract_content({"choices": []}))
+        self.assertEqual(provider.extract_delta({"choices": [{"delta": {"content": "H"}}]}), "H")
+
+    def test_google_request_and_parsing(self):
+        provider = GoogleGenAIProvider(api_key="g-key")
+        self.assertFalse(GoogleGenAIProvider(api_key="").is_configured())
+        conversation = MESSAGES + [{"role": "assistant", "content": "Hi!"}]
+        url, headers, payload = provider.build_request(conversation, "gemini-x", stream=True)
+        self.assertTrue(url.endswith("/models/gemini-x:streamGenerateContent?alt=sse"))
+        self.assertEqual(headers["x-goog-api-key"], "g-key")
+        self.assertEqual(payload["systemInstruction"], {"parts": [{"text": "Be brief."}]})
+        self.assertEqual([c["role"] for c in payload["contents"]], ["user", "model"])
+
+        data = {"candidates": [{"content": {"parts": [{"text": "A"}, {"text": "B"}]}}],
+                "usageMetadata": {"totalTokenCount": 5}}
+        self.assertEqual(provider.extract_content(data), "AB")
+        self.assertEqual(provider.usage_tokens(data), 5)
+        self.assertIsNone(provider.extract_content({"candidates": []}))
+
+    def test_parse_routes(self):
+        routes = llm_providers.parse_routes("question_gen=mistral:mistral-small, evaluate=google,,bad")
+        self.assertEqual(routes, {"question_gen": ("mistral", "mistral-small"), "evaluate": ("google", None)})
+
+    def test_resolve_route_precedence(self):
+        mistral = MistralProvider(api_key="k")
+        google = GoogleGenAIProvider(api_key="k")
+        with patch.dict(llm_providers._providers, {"mistral": mistral, "google": google}, clear=True), \
+                patch.object(llm_providers, "DEFAULT_PROVIDER", "mistral"), \
+                patch.object(llm_providers, "CALL_SITE_ROUTES", {"evaluate": ("google", "gemini-pro")}):
+            self.assertEqual(llm_providers.resolve_route(), (mistral, "mistral-tiny"))
+            self.assertEqual(llm_providers.resolve_route("evaluate"), (google, "gemini-pro"))
+            self.assertEqual(llm_providers.resolve_route("evaluate", model="gemini-lite"), (google, "gemini-lite"))
+            self.assertEqual(llm_providers.resolve_route("evaluate", provider="mistral"), (mistral, "mistral-tiny"))
+
+    def test_unknown_provider(self):
+        with self.assertRaises(ValueError):
+            llm_providers.get_provider("nope")
+
+if __name__ == '__main__':
+    unittest.main()
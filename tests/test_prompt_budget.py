@@ -0,0 +1,58 @@
+import unittest
+import os
+import sys
+
+# Add src to sys.path to allow direct import of src modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from unittest.mock import patch
+
+from src import prompt_budget
+from src.rate_limiter import estimate_tokens
+
+FILLER = "Our office has a lovely view and free snacks on Fridays. "
+
+class TestPromptBudget(unittest.TestCase):
+
+    def test_short_text_is_unchanged(self):
+        self.assertEqual(prompt_budget.compact_text("Short answer.", 100), "Short answer.")
+        self.assertIsNone(prompt_budget.compact_text(None, 100))
+
+    def test_truncate_keeps_start_within_budget(self):
+        text = "word " * 500
+        compacted = prompt_budget.compact_response(text, 50)
+        self.assertTrue(compacted.endswith(prompt_budget.TRUNCATION_MARKER))
+        self.assertTrue(text.startswith(compacted[:-len(prompt_budget.TRUNCATION_MARKER)]))
+        self.assertLessEqual(estimate_tokens(compacted), 50)
+
+    def test_job_description_keeps_key_sentences(self):
+        jd = (FILLER * 20 + "You must have 5 years of experience with Python and distributed systems. "
+              + FILLER * 20 + "Strong knowledge of Kubernetes is required.")
+        compacted = prompt_budget.compact_job_description(jd, 40)
+        self.assertLessEqual(estimate_tokens(compacted), 40)
+        self.assertIn("5 years of experience with Python", compacted)
+        self.assertIn("Kubernetes", compacted)
+        self.assertLess(compacted.index("Python"), compacted.index("Kubernetes"))
+
+    def test_share_budget_has_floor(self):
+        with patch.dict(prompt_budget.PROMPT_BUDGETS, {"overall": 1000}):
+            self.assertEqual(prompt_budget.share_budget("overall", "x" * 400, 9), 100)
+            self.assertEqual(prompt_budget.share_budget("overall", "x" * 4000, 5), prompt_budget.MIN_FIELD_TOKENS)
+
+    def test_enforce_prompt_budget_trims_longest_user_message(self):
+        messages = [
+            {"role": "system", "content": "Return JSON. " * 10},
+            {"role": "user", "content": "long " * 400},
+        ]
+        with patch.dict(prompt_budget.PROMPT_BUDGETS, {"evaluate": 200}), patch('builtins.print'):
+            fitted = prompt_budget.enforce_prompt_budget(messages, "evaluate")
+        self.assertEqual(fitted[0], messages[0])
+        self.assertLessEqual(prompt_budget.messages_tokens(fitted), 200)
+        self.assertEqual(len(messages[1]["content"]), 2000)  # Input is not modified
+
+    def test_prompt_within_budget_is_returned_as_is(self):
+        messages = [{"role": "user", "content": "Hello"}]
+        self.assertIs(prompt_budget.enforce_prompt_budget(messages, "evaluate"), messages)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+import os
+import sys
+import tempfile
+import threading
+from unittest.mock import patch
+
+# Add src to sys.path to allow direct import of src modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import question_bank
+
+CONFIG = {"job_role": "Backend Engineer", "difficulty": "Hard", "job_description": "Design APIs. Scale databases."}
+
+class TestQuestionBank(unittest.TestCase):
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        patcher = patch.object(question_bank, 'DB_PATH', os.path.join(tmpdir.name, "bank.db"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        question_bank.reset_bank_stats()
+
+    def test_bucket_key_is_normalized(self):
+        messy = {"job_role": "  backend   ENGINEER ", "difficulty": "hard",
+                 "job_description": "Scale databases.\n\nDesign APIs. Design APIs."}
+        self.assertEqual(question_bank.bucket_key(messy), question_bank.bucket_key(CONFIG))
+        other = dict(CONFIG, job_description="Write frontends.")
+        self.assertNotEqual(question_bank.bucket_key(other), question_bank.bucket_key(CONFIG))
+        self.assertEqual(question_bank.jd_fingerprint(None), "")
+
+    def test_take_is_all_or_nothing_and_consumes(self):
+        self.assertEqual(question_bank.add_questions(CONFIG, ["Q1?", "Q2?", "Q2?", " ", "Q3?"]), 3)
+        self.assertEqual(question_bank.take_questions(CONFIG, 4), [])
+        self.assertEqual(question_bank.take_questions(CONFIG, 2), ["Q1?", "Q2?"])
+        self.assertEqual(question_bank.count_questions(CONFIG), 1)
+        stats = question_bank.get_bank_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    def test_concurrent_takes_never_share_questions(self):
+        question_bank.add_questions(CONFIG, [f"Q{i}?" for i in range(20)])
+        taken = []
+
+        def take():
+            taken.extend(question_bank.take_questions(CONFIG, 5))
+
+        threads = [threading.Thread(target=take) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sorted(taken), sorted(f"Q{i}?" for i in range(20)))
+
+    def test_refill_tops_up_to_target(self):
+        batches = iter([[f"A{i}?" for i in range(10)], [f"B{i}?" for i in range(10)], ["never"]])
+        with patch.object(question_bank, 'TARGET_SIZE', 15):
+            future = question_bank.refill_if_low(CONFIG, lambda config, n: next(batches))
+            future.result(timeout=5)
+        self.assertEqual(question_bank.count_questions(CONFIG), 20)
+        self.assertEqual(question_bank.get_bank_stats()["refilled_questions"], 20)
+
+    def test_refill_skipped_above_watermark_and_deduplicated(self):
+        question_bank.add_questions(CONFIG, [f"Q{i}?" for i in range(question_bank.LOW_WATERMARK)])
+        self.assertIsNone(question_bank.refill_if_low(CONFIG, lambda config, n: []))
+
+        release = threading.Event()
+
+        def slow_generate(config, n):
+            release.wait(5)
+            return []
+
+        first = question_bank.schedule_refill(CONFIG, slow_generate)
+        self.assertIsNone(question_bank.schedule_refill(CONFIG, slow_generate))
+        release.set()
+        first.result(timeout=5)
+        question_bank.schedule_refill(CONFIG, lambda config, n: []).result(timeout=5)
+
+    @patch('builtins.print')
+    def test_failed_refill_is_reported_and_released(self, mock_print):
+        def failing(config, n):
+            raise RuntimeError("boom")
+
+        question_bank.schedule_refill(CONFIG, failing).result(timeout=5)
+        question_bank.schedule_refill(CONFIG, lambda config, n: []).result(timeout=5)
+        self.assertTrue(any("refill failed" in str(c) for c in mock_print.call_args_list))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+import os
+import sys
+from unittest.mock import patch
+
+# Add src to sys.path to allow direct import of src modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import question_dedup
+
+PAST = [
+    "What is the difference between a process and a thread?",
+    "How would you design a URL shortener that handles millions of requests per day?",
+    "Explain how database indexing improves query performance.",
+]
+
+
+class TestQuestionDedup(unittest.TestCase):
+
+    def setUp(self):
+        question_dedup.reset_indexes()
+        question_dedup.reset_dedup_stats()
+        self.addCleanup(question_dedup.reset_indexes)
+        patcher = patch.object(question_dedup.database, 'get_user_question_texts', return_value=list(PAST))
+        self.get_history = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_exact_and_reworded_repeats_are_duplicates(self):
+        index = question_dedup.QuestionIndex(PAST)
+        self.assertTrue(index.is_duplicate("what is the difference between a process and a thread"))
+        self.assertTrue(index.is_duplicate("Can you explain the difference between a process and a thread?"))
+        self.assertTrue(index.is_duplicate(
+            "How would you design a URL shortener that handles millions of requests each day?"
+        ))
+        self.assertFalse(index.is_duplicate("How do you handle disagreements within your team?"))
+
+    def test_batched_build_matches_incremental_adds(self):
+        batched = question_dedup.QuestionIndex(PAST + ["Describe the CAP theorem."])
+        incremental = question_dedup.QuestionIndex()
+        for question in PAST + ["Describe the CAP theorem."]:
+            incremental.add(question)
+        self.assertEqual(batched._buckets, incremental._buckets)
+        self.assertEqual(len(batched), 4)
+
+    def test_filter_new_catches_repeats_within_the_list(self):
+        index = question_dedup.QuestionIndex(PAST)
+        fresh, duplicates = index.filter_new(["What is a deadlock?", "What is a deadlock?", PAST[0]])
+        self.assertEqual(fresh, ["What is a deadlock?"])
+        self.assertEqual(duplicates, ["What is a deadlock?", PAST[0]])
+
+    def test_user_index_loaded_once_and_recorded_questions_added(self):
+        question_dedup.record_questions(7, ["What is a deadlock?"])
+        index = question_dedup.get_user_index(7)
+        self.assertTrue(index.is_duplicate(PAST[2]))
+        self.assertTrue(index.is_duplicate("What is a deadlock?"))
+        self.get_history.assert_called_once_with(7)
+
+    def test_duplicates_replaced_by_generated_questions(self):
+        calls = []
+
+        def generate_fn(n, avoid):
+            calls.append((n, list(avoid)))
+            return [PAST[1], "What is a deadlock?"]
+
+        questions = question_dedup.dedup_questions(
+            7, ["What is eventual consistency?", PAST[0]], 2, generate_fn
+        )
+        self.assertEqual(questions, ["What is eventual consistency?", "What is a deadlock?"])
+        self.assertEqual(calls, [(1, ["What is eventual consistency?", PAST[0]])])
+        stats = question_dedup.get_dedup_stats()
+        self.assertEqual((stats["checked"], stats["duplicates"], stats["replaced"]), (2, 1, 1))
+
+    def test_duplicates_kept_when_no_replacement(self):
+        def failing_generate(n, avoid):
+            raise RuntimeError("API down")
+
+        questions = question_dedup.dedup_questions(7, [PAST[0], "What is a deadlock?"], 2, failing_generate)
+        self.assertEqual(questions, ["What is a deadlock?", PAST[0]])
+        self.assertEqual(question_dedup.get_dedup_stats()["repeated"], 1)
+
+    def test_streaming_yields_fresh_questions_before_source_finishes(self):
+        def source():
+            yield "What is a deadlock?"
+            raise AssertionError("source read past the first question")
+
+        stream = question_dedup.iter_new_questions(7, source(), 2)
+        self.assertEqual(next(stream), "What is a deadlock?")
+        stream.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,14 +2,28 @@ import unittest
 from unittest.mock import patch
 import sys
 import os
+import tempfile
+import threading
 
 # Add src to sys.path to allow direct import of src modules
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src import question_module
+from src import question_module, question_bank, question_dedup, question_pool, question_retrieval
 
 class TestQuestionModule(unittest.TestCase):
 
+    def setUp(self):
+        # These tests exercise the LLM path and its placeholder fallback; the bank
+        # and dataset retrieval have their own tests below
+        for patcher in (
+            patch.object(question_bank, 'ENABLED', False),
+            patch.object(question_pool, 'ENABLED', False),
+            patch.object(question_module, 'QUESTION_SOURCE', 'llm'),
+            patch.object(question_retrieval, 'retrieve_questions', return_value=[]),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
     def test_parse_questions_from_text(self):
         text_response_1 = "1. Question one?\n2. Question two?\n3. Question three."
         expected_1 = ["Question one?", "Question two?", "Question three."]
@@ -32,6 +46,9 @@ class TestQuestionModule(unittest.TestCase):
         text_response_single_line = "Just one question here."
         self.assertEqual(question_module.parse_questions_from_text(text_response_single_line), ["Just one question here."])
 
+        text_response_double_digits = "9. Q9\n10. Q10\n11) Q11"
+        self.assertEqual(question_module.parse_questions_from_text(text_response_double_digits), ["Q9", "Q10", "Q11"])
+
         text_response_with_empty_lines = "\n1. Q1\n\n2. Q2\n"
         expected_empty_lines = ["Q1", "Q2"]
         self.assertEqual(question_module.parse_questions_from_text(text_response_with_empty_lines), expected_empty_lines)
@@ -83,6 +100,388 @@ class TestQuestionModule(unittest.TestCase):
         questions_fallback = question_module.generate_questions(config, num_questions=2)
         self.assertEqual(len(questions_fallback), 2)
 
+    @patch('src.question_module.generate_text')
+    def test_generate_questions_compacts_long_job_description(self, mock_generate_text):
+        mock_generate_text.return_value = "1. Q1"
+        long_jd = "We have a nice office with plants. " * 500 + "You must know Rust."
+        config = {"job_role": "Developer", "difficulty": "Medium", "job_description": long_jd}
+
+        question_module.generate_questions(config, num_questions=1)
+        prompt = mock_generate_text.call_args[0][0][0]["content"]
+        self.assertLess(len(prompt), len(long_jd) // 4)
+        self.assertIn("You must know Rust.", prompt)
+
+    @patch('src.question_module.generate_text')
+    def test_generate_questions_sends_job_description_summary(self, mock_generate_text):
+        mock_generate_text.return_value = "1. Q1"
+        config = {"job_role": "Developer", "difficulty": "Medium",
+                  "job_description": "Junior role. You will build React front-ends and Node.js services."}
+        question_module.generate_questions(config, num_questions=1)
+        prompt = mock_generate_text.call_args[0][0][0]["content"]
+        self.assertIn("The job description summary is: Seniority: junior. Skills: React, Node.js.", prompt)
+
+    @patch('src.question_module.stream_text')
+    def test_iter_questions_yields_each_question_as_its_line_completes(self, mock_stream_text):
+        received = []
+
+        def deltas(*args, **kwargs):
+            for delta in ["1. What is", " a closure?\n2. Explain", " async/await.\n3. Why", " use types?"]:
+                received.append(delta)
+                yield delta
+
+        mock_stream_text.side_effect = deltas
+        config = {"job_role": "Developer", "difficulty": "Medium"}
+        questions = question_module.iter_questions(config, num_questions=3)
+
+        self.assertEqual(next(questions), "What is a closure?")
+        self.assertEqual(len(received), 2)  # The first question is out before the rest of the response
+        self.assertEqual(list(questions), ["Explain async/await.", "Why use types?"])
+
+    @patch('builtins.print')
+    @patch('src.question_module.stream_text', side_effect=lambda *args, **kwargs: (d for d in []))
+    def test_iter_questions_falls_back_when_stream_fails(self, mock_stream_text, mock_print):
+        config = {"job_role": "Software Engineer", "difficulty": "Medium"}
+        questions = list(question_module.iter_questions(config, num_questions=2))
+        self.assertEqual(questions[0], "Tell me about a challenging project you worked on.")
+        self.assertEqual(len(questions), 2)
+
+    @patch('src.question_module.iter_questions')
+    def test_question_stream_collects_questions_in_background(self, mock_iter_questions):
+        release = threading.Event()
+
+        def slow_questions(*args):
+            yield "Q1"
+            release.wait(5)
+            yield "Q2"
+
+        mock_iter_questions.side_effect = slow_questions
+        stream = question_module.QuestionStream({"job_role": "Developer"}, num_questions=3)
+
+        self.assertTrue(stream.wait_for(1, timeout=5))
+        self.assertEqual(stream.questions, ["Q1"])
+        self.assertFalse(stream.done)
+        self.assertEqual(stream.expected_count(), 3)
+
+        release.set()
+        self.assertFalse(stream.wait_for(3, timeout=5))  # Ends with fewer questions than requested
+        self.assertTrue(stream.done)
+        self.assertEqual(stream.questions, ["Q1", "Q2"])
+        self.assertEqual(stream.expected_count(), 2)
+
+    @patch('src.question_module.iter_questions')
+    def test_question_stream_cancel_stops_generation(self, mock_iter_questions):
+        released = threading.Event()
+        closed = threading.Event()
+
+        def questions(*args):
+            try:
+                yield "Q1"
+                released.wait(5)
+                yield "Q2"
+                yield "Q3"
+            finally:
+                closed.set()
+
+        mock_iter_questions.side_effect = questions
+        stream = question_module.QuestionStream({"job_role": "Developer"}, num_questions=3)
+        self.assertTrue(stream.wait_for(1, timeout=5))
+        stream.cancel()
+        released.set()
+        self.assertTrue(closed.wait(5))
+        self.assertTrue(stream.cancelled)
+        self.assertEqual(stream.questions, ["Q1"])
+
+
+
+class TestQuestionModuleWithBank(unittest.TestCase):
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        for patcher in (
+            patch.object(question_bank, 'ENABLED', True),
+            patch.object(question_pool, 'ENABLED', False),
+            patch.object(question_bank, 'DB_PATH', os.path.join(tmpdir.name, "bank.db")),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.config = {"job_role": "Data Engineer", "difficulty": "Medium", "job_description": "Build pipelines."}
+
+    @patch('src.question_module.question_bank.refill_if_low')
+    @patch('src.question_module.generate_text')
+    def test_generate_questions_served_from_bank(self, mock_generate_text, mock_refill):
+        question_bank.add_questions(self.config, ["Banked 1?", "Banked 2?", "Banked 3?"])
+        questions = question_module.generate_questions(self.config, num_questions=2)
+        self.assertEqual(questions, ["Banked 1?", "Banked 2?"])
+        mock_generate_text.assert_not_called()
+        mock_refill.assert_called_once_with(self.config, question_module._generate_for_bank)
+
+    @patch('src.question_module.generate_text')
+    def test_empty_bank_generates_and_refills_in_background(self, mock_generate_text):
+        mock_generate_text.side_effect = lambda messages, call_site, validate=None: (
+            "1. Live?" if call_site == "question_gen" else "\n".join(f"{i}. Banked {i}?" for i in range(1, 11))
+        )
+        refills = []
+        real_refill_if_low = question_bank.refill_if_low
+        with patch.object(question_bank, 'refill_if_low',
+                          side_effect=lambda *args: refills.append(real_refill_if_low(*args))):
+            questions = question_module.generate_questions(self.config, num_questions=1)
+            refills[0].result(timeout=5)
+
+        self.assertEqual(questions, ["Live?"])
+        self.assertEqual(question_bank.count_questions(self.config), 10)
+        self.assertEqual([c.kwargs["call_site"] for c in mock_generate_text.call_args_list][:2],
+                         ["question_gen", "question_bank"])
+
+
+class _FixedStream:
+    """Stands in for a finished QuestionStream."""
+
+    def __init__(self, questions):
+        self.questions = list(questions)
+        self.cancelled = False
+
+    def wait_for(self, count, timeout=None):
+        return len(self.questions) >= count
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class TestAdaptiveInterview(unittest.TestCase):
+
+    def setUp(self):
+        self.config = {"job_role": "Developer", "difficulty": "Medium"}
+        self.release = threading.Event()
+        self.release.set()
+        self.calls = []
+
+        def generate(config, num_questions, call_site, examples, avoid):
+            self.calls.append((config["difficulty"], list(avoid)))
+            self.release.wait(5)
+            return [f"{config['difficulty']} question {len(self.calls)}?"]
+
+        patcher = patch.object(question_module, '_generate_with_llm', side_effect=generate)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _wait_for_candidates(self, interview):
+        for future in list(interview._candidates.values()):
+            future.result(timeout=5)
+
+    def test_next_difficulty(self):
+        self.assertEqual(question_module.next_difficulty("Medium", 9), "Hard")
+        self.assertEqual(question_module.next_difficulty("Hard", "9"), "Hard")
+        self.assertEqual(question_module.next_difficulty("Medium", 3), "Easy")
+        self.assertEqual(question_module.next_difficulty("Medium", 6), "Medium")
+        self.assertEqual(question_module.next_difficulty("Medium", "N/A (GenAI call failed)"), "Medium")
+
+    def test_score_picks_prefetched_question_and_discards_the_other(self):
+        interview = question_module.AdaptiveInterview(self.config, 3, _FixedStream(["Base 1?", "Base 2?", "Base 3?"]))
+        self.assertEqual(interview.questions, ["Base 1?"])
+        self._wait_for_candidates(interview)
+        self.assertEqual(sorted(c[0] for c in self.calls), ["Easy", "Hard"])
+        self.assertEqual(self.calls[0][1], ["Base 1?"])  # Asked questions are not repeated
+
+        hard_question = interview._candidates["Hard"].result()[0]
+        self.assertEqual(interview.advance(9), hard_question)
+        self.assertEqual(interview.difficulties, ["Medium", "Hard"])
+        self.assertEqual(interview.stats["discarded"], 1)
+
+        # From Hard, a middling score keeps the level with a prefetched Hard question;
+        # easier means back to Medium, which the stream already covers
+        self._wait_for_candidates(interview)
+        self.assertEqual(set(interview._candidates), {"Hard"})
+        interview.advance(6)
+        self.assertEqual(interview.difficulties, ["Medium", "Hard", "Hard"])
+        self.assertTrue(interview.done)
+        self.assertIsNone(interview.advance(9))
+        self.assertEqual(interview.expected_count(), 3)
+
+    def test_middling_score_uses_streamed_question(self):
+        interview = question_module.AdaptiveInterview(self.config, 3, _FixedStream(["Base 1?", "Base 2?"]))
+        self.assertEqual(interview.advance(6), "Base 2?")
+        self.assertEqual(interview.difficulties, ["Medium", "Medium"])
+        self._wait_for_candidates(interview)
+        self.assertEqual(interview.advance(5), None)  # Streamed questions ran out
+        self.assertTrue(interview.done)
+        self.assertEqual(interview.expected_count(), 2)
+
+    def test_candidate_not_ready_is_never_waited_for(self):
+        self.release.clear()
+        interview = question_module.AdaptiveInterview(self.config, 3, _FixedStream(["Base 1?", "Base 2?", "Base 3?"]))
+        self.assertEqual(interview.advance(10), "Base 2?")
+        self.assertEqual(interview.difficulty, "Hard")
+        self.assertEqual(interview.stats["not_ready"], 1)
+        self.release.set()
+        interview.cancel()
+
+
+class TestQuestionModuleWithPool(unittest.TestCase):
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        for patcher in (
+            patch.object(question_bank, 'ENABLED', False),
+            patch.object(question_pool, 'ENABLED', True),
+            patch.object(question_pool, 'DB_PATH', os.path.join(tmpdir.name, "pool.db")),
+            patch.object(question_dedup, 'ENABLED', False),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.config = {"job_role": "Data Engineer", "difficulty": "Medium", "job_description": "Build pipelines."}
+
+    @patch('src.question_module.generate_text')
+    def test_first_request_seeds_pool_and_later_ones_sample_it(self, mock_generate_text):
+        live = [f"Live {i}?" for i in range(1, 6)]
+        mock_generate_text.side_effect = lambda messages, call_site, validate=None: (
+            "\n".join(f"{i}. {q}" for i, q in enumerate(live, 1)) if call_site == "question_gen"
+            else "\n".join(f"{i}. Pooled {i}?" for i in range(1, 31))
+        )
+        refreshes = []
+        real_schedule_refresh = question_pool.schedule_refresh
+        with patch.object(question_pool, 'schedule_refresh',
+                          side_effect=lambda *args: refreshes.append(real_schedule_refresh(*args))):
+            self.assertEqual(question_module.generate_questions(self.config, num_questions=5, user_id=1), live)
+            self.assertEqual(refreshes, [])
+
+            # Another user is served the seeded questions, which tops the pool up for the next interview
+            self.assertEqual(sorted(question_module.generate_questions(self.config, num_questions=5, user_id=2)), live)
+            refreshes[0].result(timeout=5)
+
+        self.assertEqual([c.kwargs["call_site"] for c in mock_generate_text.call_args_list],
+                         ["question_gen", "question_pool"])
+        refresh_prompt = mock_generate_text.call_args_list[1].args[0][-1]["content"]
+        self.assertTrue(all(q in refresh_prompt for q in live))
+
+        mock_generate_text.reset_mock()
+        questions = question_module.generate_questions(self.config, num_questions=5, user_id=2)
+        mock_generate_text.assert_not_called()
+        self.assertTrue(all(q.startswith("Pooled ") for q in questions))
+        key = question_pool.find_pool(self.config)
+        self.assertEqual(question_pool.pool_size(key), question_pool.POOL_SIZE)
+
+    @patch('src.question_module.generate_text')
+    def test_cold_config_with_pool_and_bank_makes_one_llm_call(self, mock_generate_text):
+        mock_generate_text.side_effect = lambda messages, call_site, validate=None: (
+            "1. Live?" if call_site == "question_gen" else "\n".join(f"{i}. Stocked {i}?" for i in range(1, 31))
+        )
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        with patch.object(question_bank, 'ENABLED', True), \
+                patch.object(question_bank, 'DB_PATH', os.path.join(tmpdir.name, "bank.db")), \
+                patch.object(question_pool, 'schedule_refresh') as mock_refresh:
+            self.assertEqual(question_module.generate_questions(self.config, num_questions=1, user_id=1), ["Live?"])
+            self.assertEqual(question_bank.count_questions(self.config), 0)
+        # The live generation seeds the pool: no separate pool build, bank take or refill
+        mock_refresh.assert_not_called()
+        self.assertEqual([c.kwargs["call_site"] for c in mock_generate_text.call_args_list], ["question_gen"])
+        self.assertEqual(question_pool.pool_questions(question_pool.find_pool(self.config)), ["Live?"])
+
+    @patch('src.question_module.stream_text')
+    def test_streamed_questions_seed_the_pool(self, mock_stream_text):
+        mock_stream_text.side_effect = lambda *args, **kwargs: (chunk for chunk in ["1. Streamed one?\n2. Streamed two?\n"])
+        questions = list(question_module.iter_questions(self.config, num_questions=2, source="llm", user_id=1))
+        self.assertEqual(questions, ["Streamed one?", "Streamed two?"])
+        self.assertEqual(question_pool.pool_questions(question_pool.find_pool(self.config)), questions)
+
+
+class TestQuestionModuleWithDedup(unittest.TestCase):
+
+    def setUp(self):
+        for patcher in (
+            patch.object(question_bank, 'ENABLED', False),
+            patch.object(question_pool, 'ENABLED', False),
+            patch.object(question_dedup, 'ENABLED', True),
+            patch.object(question_module, 'QUESTION_SOURCE', 'llm'),
+            patch.object(question_dedup.database, 'get_user_question_texts',
+                         return_value=["How do you design a rate limiter?"]),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        question_dedup.reset_indexes()
+        self.addCleanup(question_dedup.reset_indexes)
+        self.config = {"job_role": "Backend Engineer", "difficulty": "Hard", "job_description": ""}
+
+    @patch('src.question_module.generate_text')
+    def test_repeated_question_is_replaced(self, mock_generate_text):
+        mock_generate_text.side_effect = lambda messages, call_site, validate=None: (
+            "1. How would you design a rate limiter?\n2. What is idempotency?" if call_site == "question_gen"
+            else "1. How do you version a public API?"
+        )
+        questions = question_module.generate_questions(self.config, num_questions=2, user_id=4)
+        self.assertEqual(questions, ["What is idempotency?", "How do you version a public API?"])
+        self.assertEqual(mock_generate_text.call_args.kwargs["call_site"], "question_dedup")
+        self.assertIn("rate limiter", mock_generate_text.call_args.args[0][-1]["content"])
+
+    @patch('src.question_module.generate_text', return_value=None)
+    @patch('src.question_module.stream_text')
+    def test_streaming_skips_repeats_and_keeps_them_without_replacement(self, mock_stream_text, _):
+        mock_stream_text.return_value = (delta for delta in ["1. How do you design a rate limiter?\n",
+                                                             "2. What is idempotency?\n"])
+        questions = list(question_module.iter_questions(self.config, num_questions=2, user_id=4))
+        self.assertEqual(questions, ["What is idempotency?", "How do you design a rate limiter?"])
+
+    @patch('src.question_module.generate_text', return_value="1. How do you design a rate limiter?")
+    def test_anonymous_users_are_not_checked(self, _):
+        questions = question_module.generate_questions(self.config, num_questions=1)
+        self.assertEqual(questions, ["How do you design a rate limiter?"])
+
+
+class TestQuestionModuleWithRetrieval(unittest.TestCase):
+
+    def setUp(self):
+        index = question_retrieval.QuestionIndex.build([
+            "How do you tune a PostgreSQL query that uses the wrong index?",
+            "Explain database sharding and when you would shard PostgreSQL.",
+            "How do you mentor junior designers?",
+        ])
+        for patcher in (
+            patch.object(question_bank, 'ENABLED', False),
+            patch.object(question_pool, 'ENABLED', False),
+            patch.object(question_retrieval, '_index', index),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.config = {"job_role": "Database Engineer", "difficulty": "Hard", "job_description": "PostgreSQL tuning"}
+
+    @patch('src.question_module.generate_text')
+    def test_retrieval_mode_skips_llm(self, mock_generate_text):
+        questions = question_module.generate_questions(self.config, num_questions=2, source="retrieval")
+        self.assertEqual(len(questions), 2)
+        self.assertTrue(all("PostgreSQL" in q for q in questions))
+        mock_generate_text.assert_not_called()
+
+    @patch('src.question_module.stream_text')
+    @patch('src.question_module.generate_text')
+    def test_retrieval_mode_makes_no_llm_calls_when_streaming_either(self, mock_generate_text, mock_stream_text):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        with patch.object(question_bank, 'ENABLED', True), \
+                patch.object(question_bank, 'DB_PATH', os.path.join(tmpdir.name, "bank.db")), \
+                patch.object(question_bank, 'refill_if_low') as mock_refill:
+            generated = question_module.generate_questions(self.config, num_questions=2, source="retrieval")
+            streamed = list(question_module.iter_questions(self.config, num_questions=2, source="retrieval"))
+        self.assertEqual(streamed, generated)
+        mock_refill.assert_not_called()
+        mock_generate_text.assert_not_called()
+        mock_stream_text.assert_not_called()
+
+    @patch('src.question_module.generate_text')
+    def test_seeded_mode_puts_examples_in_prompt(self, mock_generate_text):
+        mock_generate_text.return_value = "1. New question?"
+        questions = question_module.generate_questions(self.config, num_questions=1, source="seeded")
+        self.assertEqual(questions, ["New question?"])
+        prompt = mock_generate_text.call_args[0][0][0]["content"]
+        self.assertIn("- How do you tune a PostgreSQL query", prompt)
+        self.assertNotIn("mentor", prompt)
+
+    @patch('src.question_module.generate_text', return_value=None)
+    def test_api_failure_falls_back_to_retrieval(self, mock_generate_text):
+        questions = question_module.generate_questions(self.config, num_questions=2, source="llm")
+        self.assertEqual(len(questions), 2)
+        self.assertTrue(all("PostgreSQL" in q for q in questions))
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import os
+import sys
+
+# Add src to sys.path to allow direct import of src modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.question_parser import QuestionParser, clean_line, iter_parsed_questions, parse_questions
+
+
+def chunked(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class TestQuestionParser(unittest.TestCase):
+
+    def test_numbering_past_nine(self):
+        text = "\n".join(f"{i}{'.' if i % 2 else ')'} Question {i}?" for i in range(1, 13))
+        self.assertEqual(parse_questions(text), [f"Question {i}?" for i in range(1, 13)])
+
+    def test_bullets_markdown_and_preamble(self):
+        text = (
+            "Here are 5 interview questions:\n\n## Technical\n**1. What is a closure?**\n"
+            "- How does garbage collection work?\n* Q3: What is a race condition?\n"
+            "• Question 4 - How do you profile a slow endpoint?\n[5] What is CAP?\n```\n"
+        )
+        self.assertEqual(parse_questions(text), [
+            "What is a closure?", "How does garbage collection work?", "What is a race condition?",
+            "How do you profile a slow endpoint?", "What is CAP?",
+        ])
+
+    def test_bold_category_labels_are_stripped(self):
+        self.assertEqual(clean_line("- **Databases:** How do you index a table?"), "How do you index a table?")
+        self.assertEqual(clean_line("2. **System Design**: How would you shard a queue?"),
+                         "How would you shard a queue?")
+        self.assertEqual(clean_line("__Networking:__ What is a TCP handshake?"), "What is a TCP handshake?")
+        self.assertEqual(clean_line("**Databases:**"), "")  # A label on its own line is a heading
+        self.assertEqual(clean_line("- What does **idempotent** mean: in HTTP?"), "What does idempotent mean: in HTTP?")
+
+    def test_json_array_and_objects(self):
+        self.assertEqual(
+            parse_questions('```json\n["What is a \\"closure\\"?", "What is CAP?"]\n```'),
+            ['What is a "closure"?', "What is CAP?"]
+        )
+        self.assertEqual(
+            parse_questions('{"questions": [{"id": 1, "question": "What is CAP?", "difficulty": "Hard"},'
+                            ' {"question": "What is a closure?"}]}'),
+            ["What is CAP?", "What is a closure?"]
+        )
+
+    def test_stream_split_anywhere_gives_same_questions(self):
+        for text in ("1. What is CAP?\n2. What is a closure?\n10) Why Rust?",
+                     '["What is CAP?", "What is a closure?", "Why Rust?"]'):
+            expected = parse_questions(text)
+            self.assertEqual(len(expected), 3)
+            for size in range(1, 8):
+                self.assertEqual(list(iter_parsed_questions(chunked(text, size))), expected)
+
+    def test_questions_emitted_as_soon_as_complete(self):
+        parser = QuestionParser()
+        self.assertEqual(parser.feed("1. What is CAP?\n2. What is"), ["What is CAP?"])
+        self.assertEqual(parser.feed(" a closure?\n"), ["What is a closure?"])
+        self.assertEqual(parser.close(), [])
+
+        parser = QuestionParser()
+        self.assertEqual(parser.feed('["What is CAP?", "What'), ["What is CAP?"])
+        self.assertEqual(parser.feed(' is a closure?"]'), ["What is a closure?"])
+
+    def test_clean_line_keeps_unnumbered_questions(self):
+        self.assertEqual(clean_line("Question one without number."), "Question one without number.")
+        self.assertEqual(clean_line("   "), "")
+        self.assertEqual(parse_questions(None), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import unittest
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+
+# Add src to sys.path to allow direct import of src modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import question_pool
+
+CONFIG = {"job_role": "Backend Engineer", "difficulty": "Hard",
+          "job_description": "Design and scale Python microservices on Kubernetes with PostgreSQL and Redis"}
+POOL = [f"Pooled question {i}?" for i in range(10)]
+
+
+class TestQuestionPool(unittest.TestCase):
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        patcher = patch.object(question_pool, 'DB_PATH', os.path.join(tmpdir.name, "pool.db"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        question_pool.reset_pool_stats()
+
+    def test_miss_generates_nothing_and_the_callers_questions_seed_the_pool(self):
+        generate_fn = lambda config, n, avoid: [f"Q{i}?" for i in range(n)]
+        with patch.object(question_pool, 'schedule_refresh') as mock_refresh:
+            self.assertEqual(question_pool.sample_questions(CONFIG, 3, user_id=1, generate_fn=generate_fn), [])
+        mock_refresh.assert_not_called()
+
+        self.assertEqual(question_pool.add_to_pool(CONFIG, POOL[:3]), 3)
+        self.assertEqual(sorted(question_pool.sample_questions(CONFIG, 3, user_id=2)), POOL[:3])
+        stats = question_pool.get_pool_stats()
+        self.assertEqual((stats["misses"], stats["hits"], stats["refreshes"]), (1, 1, 0))
+
+    @patch.object(question_pool, 'POOL_SIZE', 10)
+    def test_users_do_not_see_repeats_until_pool_is_used_up(self):
+        question_pool.add_to_pool(CONFIG, POOL)
+        generate_fn = lambda config, n, avoid: []
+        seen = []
+        with patch.object(question_pool, 'schedule_refresh') as mock_refresh:
+            for _ in range(3):
+                seen += question_pool.sample_questions(CONFIG, 3, user_id=7, generate_fn=generate_fn)
+            self.assertEqual(len(set(seen)), 9)
+            mock_refresh.assert_called_once()  # One unseen question left: refresh before the next cycle
+
+            # The next interview finishes the pool and starts a new cycle
+            nxt = question_pool.sample_questions(CONFIG, 3, user_id=7, generate_fn=generate_fn)
+        self.assertEqual(len(set(nxt)), 3)
+        self.assertIn((set(POOL) - set(seen)).pop(), nxt)
+
+        # Another user has their own history
+        self.assertEqual(len(set(question_pool.sample_questions(CONFIG, 9, user_id=8))), 9)
+
+    def test_similar_job_description_shares_pool(self):
+        question_pool.add_to_pool(CONFIG, POOL)
+        similar = dict(CONFIG, job_description=CONFIG["job_description"] + " and Redis.")
+        different = dict(CONFIG, job_description="Build iOS apps in Swift")
+        other_role = dict(CONFIG, job_role="Data Scientist")
+        self.assertEqual(question_pool.find_pool(similar), question_pool.find_pool(CONFIG))
+        self.assertIsNone(question_pool.find_pool(different))
+        self.assertIsNone(question_pool.find_pool(other_role))
+
+    def test_pool_smaller_than_request_is_not_served(self):
+        question_pool.add_to_pool(CONFIG, POOL[:2])
+        self.assertEqual(question_pool.sample_questions(CONFIG, 3), [])
+
+    def test_user_who_has_seen_a_growing_pool_is_not_given_repeats(self):
+        question_pool.add_to_pool(CONFIG, POOL[:3])
+        self.assertEqual(len(question_pool.sample_questions(CONFIG, 3, user_id=5)), 3)
+        self.assertEqual(question_pool.sample_questions(CONFIG, 3, user_id=5), [])
+
+        question_pool.add_to_pool(CONFIG, POOL[3:6])
+        self.assertEqual(sorted(question_pool.sample_questions(CONFIG, 3, user_id=5)), POOL[3:6])
+
+    @patch.object(question_pool, 'POOL_SIZE', 10)
+    def test_pool_is_capped_by_evicting_oldest_questions(self):
+        question_pool.add_to_pool(CONFIG, POOL)
+        key = question_pool.find_pool(CONFIG)
+        served = question_pool.sample_questions(CONFIG, 9, user_id=5)
+
+        fresh = [f"Fresh question {i}?" for i in range(4)]
+        self.assertEqual(question_pool.add_to_pool(CONFIG, fresh, key), 4)
+        self.assertEqual(question_pool.pool_questions(key), POOL[4:] + fresh)
+        self.assertEqual(question_pool.get_pool_stats()["evicted"], 4)
+
+        # Only the history of questions still in the pool is kept
+        conn = question_pool._connect()
+        try:
+            history = {row[0] for row in conn.execute("SELECT question_text FROM question_pool_served")}
+        finally:
+            conn.close()
+        self.assertEqual(history, set(served) - set(POOL[:4]))
+
+    def test_refresh_avoids_questions_already_in_pool(self):
+        question_pool.add_to_pool(CONFIG, POOL)
+        requests = []
+
+        def generate_fn(config, n, avoid):
+            requests.append((n, avoid))
+            return [f"Fresh question {i}?" for i in range(n)]
+        question_pool.schedule_refresh(CONFIG, generate_fn).result(timeout=5)
+        self.assertEqual(requests, [(question_pool.POOL_SIZE, POOL)])
+        self.assertEqual(question_pool.pool_size(question_pool.find_pool(CONFIG)), question_pool.POOL_SIZE)
+
+    @patch('builtins.print')
+    def test_failed_refresh_is_reported_and_released(self, mock_print):
+        def failing(config, n, avoid):
+            raise RuntimeError("boom")
+        question_pool.schedule_refresh(CONFIG, failing).result(timeout=5)
+        self.assertIn("boom", mock_print.call_args[0][0])
+        future = question_pool.schedule_refresh(CONFIG, lambda config, n, avoid: [])
+        self.assertIsNotNone(future)
+        future.result(timeout=5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+import csv
+import os
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+import numpy as np
+
+# Add src to sys.path to allow direct import of src modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import question_retrieval
+from src.question_retrieval import QuestionIndex
+
+QUESTIONS = [
+    "Explain the difference between L1 and L2 regularization in linear regression.",
+    "How would you design a rate limiter for a REST API?",
+    "Describe how garbage collection works in the JVM.",
+    "How do you prevent overfitting when training a neural network?",
+]
+
+class TestQuestionRetrieval(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def _write_dataset(self, questions):
+        path = os.path.join(self.tmpdir.name, "dataset.csv")
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=["question", "answer", "quality", "gold_answer"])
+            writer.writeheader()
+            for question in questions:
+                for quality in ("Excellent", "Adequate"):  # Each question appears once per answer quality
+                    writer.writerow({"question": question, "answer": "...", "quality": quality, "gold_answer": "..."})
+        return path
+
+    def test_tokenize_drops_stop_words(self):
+        self.assertEqual(question_retrieval.tokenize("Can you explain the C++ and C# memory model?"),
+                         ["c++", "c#", "memory", "model"])
+
+    def test_search_ranks_by_similarity(self):
+        index = QuestionIndex.build(QUESTIONS)
+        results = index.search("machine learning engineer: regularization and overfitting", k=3)
+        self.assertEqual({q for q, _ in results}, {QUESTIONS[0], QUESTIONS[3]})
+        self.assertTrue(all(0 < score <= 1.0001 for _, score in results))
+        self.assertEqual(index.search("regularization", k=5, exclude=[QUESTIONS[0]]), [])
+        self.assertEqual(index.search("", k=5), [])
+
+    def test_role_dominates_long_unrelated_description(self):
+        index = QuestionIndex.build(QUESTIONS)
+        config = {
+            "job_role": "Machine learning engineer: regularization",
+            "job_description": "Our team owns the public REST API and its gateway. " * 20,
+        }
+        with patch.object(question_retrieval, 'get_index', return_value=index):
+            self.assertEqual(question_retrieval.retrieve_questions(config, 1), [QUESTIONS[0]])
+            with patch.object(question_retrieval, 'ROLE_WEIGHT', 0.2):
+                self.assertEqual(question_retrieval.retrieve_questions(config, 1), [QUESTIONS[1]])
+        # Repeating the description does not shift the balance
+        short_config = dict(config, job_description="Our team owns the public REST API and its gateway.")
+        self.assertTrue(np.allclose(question_retrieval.build_query_vector(index, config),
+                                    question_retrieval.build_query_vector(index, short_config)))
+        query = question_retrieval.build_query_vector(index, {"job_role": "", "job_description": ""})
+        self.assertFalse(query.any())
+
+    def test_index_is_persisted_and_rebuilt_when_dataset_changes(self):
+        dataset_path = self._write_dataset(QUESTIONS)
+        index_path = os.path.join(self.tmpdir.name, "index.npz")
+        self.assertEqual(question_retrieval.load_questions(dataset_path), QUESTIONS)
+
+        with patch.object(question_retrieval, 'DATASET_PATH', dataset_path), \
+                patch.object(question_retrieval, 'INDEX_PATH', index_path), \
+                patch.object(question_retrieval, '_index', None):
+            config = {"job_role": "Backend Engineer", "job_description": "Design REST API rate limiter"}
+            self.assertEqual(question_retrieval.retrieve_questions(config, 1), [QUESTIONS[1]])
+            self.assertTrue(os.path.exists(index_path))
+
+            question_retrieval.reset_index()
+            with patch.object(QuestionIndex, 'build', side_effect=AssertionError("should load from disk")):
+                self.assertEqual(question_retrieval.retrieve_questions(config, 1), [QUESTIONS[1]])
+
+            question_retrieval.reset_index()
+            self._write_dataset(QUESTIONS + ["How do you design an idempotent REST API endpoint?"])
+            os.utime(dataset_path, (time.time() + 10, time.time() + 10))
+            self.assertEqual(len(question_retrieval.get_index().questions), 5)
+            question_retrieval.reset_index()
+
+    @patch('builtins.print')
+    def test_missing_dataset_returns_nothing(self, mock_print):
+        with patch.object(question_retrieval, 'DATASET_PATH', os.path.join(self.tmpdir.name, "missing.csv")), \
+                patch.object(question_retrieval, '_index', None):
+            self.assertEqual(question_retrieval.retrieve_questions({"job_role": "Dev"}, 3), [])
+
+if __name__ == '__main__':
+    unittest.main()
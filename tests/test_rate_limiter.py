@@ -0,0 +1,91 @@
+import unittest
+from unittest.mock import patch
+import asyncio
+import os
+import sys
+
+# Add src to sys.path to allow direct import of src modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import rate_limiter
+from src.rate_limiter import RateLimiter
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestRateLimiter(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def test_request_budget(self):
+        # 60 rpm with a 2 second burst allows 2 immediate requests, then one per second
+        limiter = RateLimiter(60, 1e9, burst_seconds=2, clock=self.clock)
+        self.assertEqual(limiter.reserve(), 0.0)
+        self.assertEqual(limiter.reserve(), 0.0)
+        self.assertAlmostEqual(limiter.reserve(), 1.0)
+        self.clock.now = 1.0
+        self.assertEqual(limiter.reserve(), 0.0)
+
+    def test_token_budget(self):
+        # 600 tokens per minute = 10 per second, bucket holds 100
+        limiter = RateLimiter(1e6, 600, burst_seconds=10, clock=self.clock)
+        self.assertEqual(limiter.reserve(80), 0.0)
+        self.assertAlmostEqual(limiter.reserve(50), 3.0)
+        # Real usage was lower than estimated, so tokens are refunded
+        limiter.record_usage(80, 30)
+        self.assertEqual(limiter.reserve(50), 0.0)
+
+    def test_oversized_request_does_not_deadlock(self):
+        limiter = RateLimiter(1e6, 600, burst_seconds=10, clock=self.clock)
+        self.assertEqual(limiter.reserve(10_000), 0.0)
+
+    def test_throttling_pauses_and_slows_down(self):
+        limiter = RateLimiter(60, 1e9, burst_seconds=10, clock=self.clock)
+        limiter.report_throttled("5")
+        self.assertAlmostEqual(limiter.reserve(), 5.0)
+        self.assertEqual(limiter.stats()["rate_factor"], 0.5)
+
+        self.clock.now = 5.0
+        # The bucket was drained during the pause and refilled at half rate (2.5 requests)
+        self.assertEqual(limiter.reserve(), 0.0)
+        self.assertEqual(limiter.reserve(), 0.0)
+        self.assertAlmostEqual(limiter.reserve(), 1.0)
+        limiter.record_usage(10, 10)
+        self.assertGreater(limiter.stats()["rate_factor"], 0.5)
+
+    def test_throttle_without_retry_after_uses_default_pause(self):
+        limiter = RateLimiter(60, 1e9, clock=self.clock)
+        limiter.report_throttled(None)
+        self.assertAlmostEqual(limiter.reserve(), rate_limiter.DEFAULT_THROTTLE_PAUSE)
+
+    @patch('src.rate_limiter.time.sleep')
+    def test_acquire_sleeps_until_budget_available(self, mock_sleep):
+        limiter = RateLimiter(60, 1e9, burst_seconds=1, clock=self.clock)
+        limiter.acquire()
+        mock_sleep.side_effect = lambda seconds: setattr(self.clock, "now", self.clock.now + seconds)
+        limiter.acquire()
+        mock_sleep.assert_called_once()
+        self.assertEqual(limiter.stats()["waits"], 1)
+
+    def test_aacquire(self):
+        limiter = RateLimiter(60000, 1e9)
+        asyncio.run(limiter.aacquire(10))
+        self.assertEqual(limiter.stats()["acquired"], 1)
+
+    def test_parse_retry_after(self):
+        self.assertEqual(rate_limiter.parse_retry_after("3"), 3.0)
+        self.assertIsNone(rate_limiter.parse_retry_after(None))
+        self.assertIsNone(rate_limiter.parse_retry_after("soon"))
+        self.assertEqual(rate_limiter.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+
+    def test_estimate_request_tokens(self):
+        messages = [{"role": "user", "content": "x" * 400}]
+        self.assertEqual(rate_limiter.estimate_request_tokens(messages, max_tokens=50), 150)
+
+if __name__ == '__main__':
+    unittest.main()
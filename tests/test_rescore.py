@@ -0,0 +1,69 @@
+import unittest
+import os
+import sys
+import json
+import tempfile
+from unittest.mock import patch
+
+# Add src to sys.path to allow direct import of src modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import database, rescore
+
+
+class TestRescore(unittest.TestCase):
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        patcher = patch.object(database, 'DB_PATH', os.path.join(tmpdir.name, "app.db"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        database.init_db()
+        self.user_id = database.create_user("rescore", "rescore@example.com", "pass")
+        self.interview_id = database.save_interview(
+            self.user_id, "Engineer", "Python", "Medium", ["Q1?", "Q2?", "Q3?"], ["A1", "A2", None],
+            [{"score": 2}, {"score": 2}, None], None, 2.0
+        )
+
+    @patch('src.evaluation_module.generate_text')
+    def test_rescore_user_history_with_one_call_per_interview(self, mock_generate_text):
+        mock_generate_text.return_value = json.dumps([{"score": 7}, {"score": 9}])
+
+        scores = rescore.main(["--user-id", str(self.user_id)])
+
+        self.assertEqual(scores, {self.interview_id: 8.0})
+        mock_generate_text.assert_called_once()
+        details = database.get_interview_details(self.interview_id)
+        self.assertEqual([fb["score"] if fb else None for fb in details["feedback"]], [7, 9, None])
+        self.assertEqual(details["interview"]["overall_score"], 8.0)
+
+    @patch('builtins.print')
+    @patch('src.evaluation_module.classify_answer_quality', return_value="good")
+    @patch('src.evaluation_module.generate_text', return_value=None)
+    def test_failed_rescore_keeps_stored_feedback(self, mock_generate_text, mock_classify, mock_print):
+        self.assertEqual(rescore.rescore_interview(self.interview_id), 2.0)
+
+        details = database.get_interview_details(self.interview_id)
+        self.assertEqual(details["feedback"], [{"score": 2}, {"score": 2}, None])
+        self.assertEqual(details["interview"]["overall_score"], 2.0)
+        self.assertIn("keeping their stored feedback", mock_print.call_args_list[-1][0][0])
+
+    @patch('builtins.print')
+    @patch('src.evaluation_module.generate_text')
+    def test_partly_failed_rescore_only_replaces_evaluated_answers(self, mock_generate_text, mock_print):
+        # The batch lacks the second answer, whose own evaluation then fails
+        mock_generate_text.side_effect = [json.dumps({"feedback": [{"score": 8}]}), None]
+        with patch('src.evaluation_module.classify_answer_quality', return_value=None):
+            self.assertEqual(rescore.rescore_interview(self.interview_id), 5.0)
+
+        details = database.get_interview_details(self.interview_id)
+        self.assertEqual([fb["score"] if fb else None for fb in details["feedback"]], [8, 2, None])
+
+    def test_average_score_ignores_non_numeric(self):
+        self.assertEqual(rescore.average_score([{"score": 6}, {"score": "N/A (GenAI call failed)"}, None]), 6.0)
+        self.assertIsNone(rescore.average_score([None]))
+
+
+if __name__ == '__main__':
+    unittest.main()
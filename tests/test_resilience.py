@@ -0,0 +1,123 @@
+import unittest
+import os
+import sys
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Add src to sys.path to allow direct import of src modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.resilience import CircuitBreaker, LatencyTracker, hedged_call
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestLatencyTracker(unittest.TestCase):
+
+    def test_percentiles_over_window(self):
+        tracker = LatencyTracker(window=100)
+        self.assertIsNone(tracker.percentile(95))
+        for value in range(1, 101):
+            tracker.record(value / 100)
+        self.assertEqual(tracker.percentile(50), 0.51)
+        self.assertEqual(tracker.percentile(100), 1.0)
+        tracker.record(5.0)  # Oldest sample drops out of the window
+        self.assertEqual(tracker.count(), 100)
+        self.assertEqual(tracker.percentile(100), 5.0)
+
+class TestHedgedCall(unittest.TestCase):
+
+    def setUp(self):
+        self.executor = ThreadPoolExecutor(max_workers=4)
+        self.addCleanup(self.executor.shutdown, wait=True)
+
+    def test_fast_call_is_not_hedged(self):
+        self.assertEqual(hedged_call(lambda: "ok", self.executor, 1.0), ("ok", False, False))
+
+    def test_no_delay_runs_inline(self):
+        self.assertEqual(hedged_call(lambda: "ok", self.executor, None), ("ok", False, False))
+
+    def test_slow_failing_call_is_rescued_by_hedge(self):
+        attempts = []
+
+        def call():
+            attempts.append(threading.current_thread())
+            if len(attempts) == 1:
+                time.sleep(0.3)
+                return None
+            return "hedge"
+
+        self.assertEqual(hedged_call(call, self.executor, 0.02), ("hedge", True, True))
+        self.assertIs(attempts[0], threading.current_thread())  # The primary ran on the caller's thread
+
+    def test_calls_are_not_capped_by_the_hedge_pool(self):
+        executor = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(executor.shutdown, wait=True)
+        barrier = threading.Barrier(3, timeout=2)
+        results = []
+
+        def caller():
+            # Three concurrent primaries only finish if none waits for the one hedge worker
+            results.append(hedged_call(lambda: barrier.wait() is not None and "ok", executor, 1.0))
+
+        threads = [threading.Thread(target=caller) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(results, [("ok", False, False)] * 3)
+
+    def test_failed_hedge_waits_for_primary(self):
+        attempts = []
+
+        def call():
+            attempts.append(1)
+            if len(attempts) == 1:
+                time.sleep(0.1)
+                return "primary"
+            return None
+
+        self.assertEqual(hedged_call(call, self.executor, 0.02), ("primary", True, False))
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def test_opens_after_threshold_and_recovers(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+        breaker.record_failure()
+        self.assertTrue(breaker.allow_request())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(breaker.allow_request())
+
+        clock.now = 10.0
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertTrue(breaker.allow_request())
+        self.assertFalse(breaker.allow_request())  # Only one trial call at a time
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        self.assertEqual(breaker.stats()["rejected"], 2)
+
+    def test_failed_trial_reopens(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+        breaker.record_failure()
+        clock.now = 10.0
+        self.assertTrue(breaker.allow_request())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+    def test_success_resets_failure_count(self):
+        breaker = CircuitBreaker(failure_threshold=2)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import os
+import sys
+import threading
+import time
+
+# Add src to sys.path to allow direct import of src modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.singleflight import SingleFlight
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+class TestSingleFlight(unittest.TestCase):
+
+    def _run_concurrently(self, flight, key, fn, callers):
+        results = [None] * callers
+        errors = [None] * callers
+
+        def worker(i):
+            try:
+                results[i] = flight.do(key, fn)
+            except Exception as e:
+                errors[i] = e
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(callers)]
+        for thread in threads:
+            thread.start()
+        return threads, results, errors
+
+    def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        executions = []
+
+        def slow_call():
+            executions.append(1)
+            release.wait(2)
+            return "shared"
+
+        threads, results, errors = self._run_concurrently(flight, "k", slow_call, 5)
+        _wait_for(lambda: flight.stats()["coalesced"] == 4)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, ["shared"] * 5)
+        self.assertEqual(len(executions), 1)
+        self.assertEqual(flight.stats(), {"executions": 1, "coalesced": 4, "in_flight": 0})
+
+    def test_errors_are_shared_with_waiters(self):
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def failing_call():
+            release.wait(2)
+            raise RuntimeError("upstream down")
+
+        threads, results, errors = self._run_concurrently(flight, "k", failing_call, 3)
+        _wait_for(lambda: flight.stats()["coalesced"] == 2)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertTrue(all(isinstance(e, RuntimeError) for e in errors))
+
+    def test_sequential_calls_run_again(self):
+        flight = SingleFlight()
+        counter = iter(range(10))
+        self.assertEqual(flight.do("k", lambda: next(counter)), 0)
+        self.assertEqual(flight.do("k", lambda: next(counter)), 1)
+        self.assertEqual(flight.stats()["coalesced"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
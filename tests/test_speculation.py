@@ -0,0 +1,193 @@
+import unittest
+import os
+import sys
+import tempfile
+import threading
+import time
+from unittest.mock import patch, MagicMock
+
+# Add src to sys.path to allow direct import of src modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import question_bank, question_dedup, question_module, question_pool, question_retrieval, speculation
+
+JD = "Build and operate Python services on AWS. " * 5
+CONFIG = {"job_role": "Backend Engineer", "difficulty": "Medium", "job_description": JD}
+
+
+def wait_until(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+class TestSpeculation(unittest.TestCase):
+
+    def setUp(self):
+        speculation.reset_speculation_stats()
+        patcher = patch.object(speculation.question_module, 'QuestionStream',
+                               side_effect=lambda *args, **kwargs: MagicMock(error=None))
+        self.mock_stream_cls = patcher.start()
+        self.addCleanup(patcher.stop)
+        for store_patcher in (
+            patch.object(speculation.question_module, 'has_stored_questions', return_value=False),
+            patch.object(speculation.question_module, 'restock_after_generation'),
+        ):
+            store_patcher.start()
+            self.addCleanup(store_patcher.stop)
+        self.speculator = speculation.SpeculativeQuestions(debounce_seconds=0.05)
+        self.addCleanup(self.speculator.cancel)
+
+    def test_is_ready_needs_role_difficulty_and_long_description(self):
+        self.assertTrue(speculation.is_ready(CONFIG))
+        self.assertFalse(speculation.is_ready(dict(CONFIG, job_role=" ")))
+        self.assertFalse(speculation.is_ready(dict(CONFIG, job_description="Too short")))
+
+    def test_submit_reuses_matching_speculation(self):
+        self.speculator.update(CONFIG, 5, user_id=3)
+        self.speculator.update(dict(CONFIG), 5, user_id=3)  # Unchanged inputs on a rerun
+        self.assertTrue(wait_until(lambda: self.mock_stream_cls.call_count == 1))
+
+        stream = self.speculator.take(CONFIG, 5, user_id=3)
+        self.assertIsNotNone(stream)
+        self.mock_stream_cls.assert_called_once_with(CONFIG, 5, user_id=3, speculative=True)
+        stream.cancel.assert_not_called()
+        # The generated questions restock the stores once the stream has finished
+        speculation.question_module.restock_after_generation.assert_not_called()
+        stream.add_done_callback.call_args[0][0](stream)
+        speculation.question_module.restock_after_generation.assert_called_once_with(CONFIG, stream.generated)
+        stats = speculation.get_speculation_stats()
+        self.assertEqual((stats["started"], stats["hits"], stats["hit_rate"]), (1, 1, 1.0))
+
+    def test_changed_inputs_are_debounced_and_cancel_running_speculation(self):
+        self.speculator.update(CONFIG, 5)
+        self.speculator.update(dict(CONFIG, difficulty="Hard"), 5)  # Before the debounce expires
+        self.assertTrue(wait_until(lambda: self.mock_stream_cls.call_count == 1))
+        self.assertEqual(self.mock_stream_cls.call_args[0][0]["difficulty"], "Hard")
+
+        running = self.speculator._stream
+        self.speculator.update(dict(CONFIG, job_description="short"), 5)
+        running.cancel.assert_called_once()
+        self.assertEqual(speculation.get_speculation_stats()["cancelled"], 1)
+
+    def test_submit_with_other_configuration_misses(self):
+        self.speculator.update(CONFIG, 5)
+        self.assertTrue(wait_until(lambda: self.mock_stream_cls.call_count == 1))
+        running = self.speculator._stream
+
+        self.assertIsNone(self.speculator.take(CONFIG, 3))
+        running.cancel.assert_called_once()
+        speculation.question_module.restock_after_generation.assert_not_called()
+        stats = speculation.get_speculation_stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["hit_rate"]), (0, 1, 0.0))
+
+    def test_submit_by_another_user_misses(self):
+        self.speculator.update(CONFIG, 5, user_id=3)
+        self.assertTrue(wait_until(lambda: self.mock_stream_cls.call_count == 1))
+        running = self.speculator._stream
+
+        self.assertIsNone(self.speculator.take(CONFIG, 5, user_id=4))
+        running.cancel.assert_called_once()
+        self.assertEqual(speculation.get_speculation_stats()["misses"], 1)
+
+    def test_submit_before_debounce_expires_misses_and_starts_nothing(self):
+        self.speculator.update(CONFIG, 5)
+        self.assertIsNone(self.speculator.take(CONFIG, 5))
+        time.sleep(0.1)
+        self.mock_stream_cls.assert_not_called()
+
+
+class TestSpeculationLeavesStoresUntouched(unittest.TestCase):
+    """Runs real question streams against throwaway pool and bank databases."""
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+        self.stream_started = threading.Event()
+        speculation.reset_speculation_stats()
+
+        def slow_stream(*args, **kwargs):
+            self.stream_started.set()
+            yield "1. Speculated one?\n"
+            self.release.wait(5)
+            yield "2. Speculated two?\n"
+
+        for patcher in (
+            patch.object(question_pool, 'DB_PATH', os.path.join(tmpdir.name, "pool.db")),
+            patch.object(question_bank, 'DB_PATH', os.path.join(tmpdir.name, "bank.db")),
+            patch.object(question_dedup, 'ENABLED', False),
+            patch.object(question_module, 'QUESTION_SOURCE', 'llm'),
+            patch.object(question_retrieval, 'retrieve_questions', return_value=[]),
+            patch.object(question_module, 'stream_text', side_effect=slow_stream),
+            patch.object(question_module, 'generate_text', return_value=None),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.speculator = speculation.SpeculativeQuestions(debounce_seconds=0.01)
+        self.addCleanup(self.speculator.cancel)
+
+    def _speculate_and_cancel(self):
+        self.speculator.update(CONFIG, 5, user_id=3)
+        self.assertTrue(self.stream_started.wait(5))
+        stream = self.speculator._stream
+        self.speculator.cancel()
+        self.release.set()
+        self.assertTrue(wait_until(lambda: stream.done))
+
+    def _served_count(self):
+        conn = question_pool._connect()
+        try:
+            return conn.execute("SELECT COUNT(*) FROM question_pool_served").fetchone()[0]
+        finally:
+            conn.close()
+
+    def test_cancelled_speculation_leaves_pool_untouched(self):
+        with patch.object(question_pool, 'ENABLED', True), patch.object(question_bank, 'ENABLED', False), \
+                patch.object(question_module, 'has_stored_questions', return_value=False), \
+                patch.object(question_pool, 'schedule_refresh') as mock_refresh:
+            question_pool.add_to_pool(CONFIG, [f"Pooled {i}?" for i in range(30)])
+            self._speculate_and_cancel()
+        self.assertEqual(self._served_count(), 0)
+        mock_refresh.assert_not_called()
+
+    def test_cancelled_speculation_leaves_bank_untouched(self):
+        with patch.object(question_pool, 'ENABLED', False), patch.object(question_bank, 'ENABLED', True), \
+                patch.object(question_module, 'has_stored_questions', return_value=False), \
+                patch.object(question_bank, 'refill_if_low') as mock_refill:
+            question_bank.add_questions(CONFIG, [f"Banked {i}?" for i in range(20)])
+            self._speculate_and_cancel()
+            self.assertEqual(question_bank.count_questions(CONFIG), 20)
+        mock_refill.assert_not_called()
+
+    def test_claimed_speculation_seeds_pool_once_finished(self):
+        with patch.object(question_pool, 'ENABLED', True), patch.object(question_bank, 'ENABLED', False), \
+                patch.object(question_pool, 'schedule_refresh') as mock_refresh:
+            self.speculator.update(CONFIG, 2, user_id=3)
+            self.assertTrue(self.stream_started.wait(5))
+            stream = self.speculator.take(CONFIG, 2, user_id=3)
+            self.assertIsNone(question_pool.find_pool(CONFIG))
+
+            self.release.set()
+            self.assertTrue(wait_until(lambda: question_pool.find_pool(CONFIG) is not None))
+        self.assertEqual(stream.questions, ["Speculated one?", "Speculated two?"])
+        self.assertEqual(question_pool.pool_questions(question_pool.find_pool(CONFIG)), stream.questions)
+        mock_refresh.assert_not_called()
+
+    def test_configuration_served_from_pool_is_not_speculated_on(self):
+        with patch.object(question_pool, 'ENABLED', True):
+            question_pool.add_to_pool(CONFIG, [f"Pooled {i}?" for i in range(30)])
+            self.speculator.update(CONFIG, 5, user_id=3)
+            time.sleep(0.1)
+            self.assertIsNone(self.speculator.take(CONFIG, 5, user_id=3))
+        self.assertFalse(self.stream_started.is_set())
+        self.assertEqual(self._served_count(), 0)
+        # Counted apart from the misses, so the hit rate only covers speculated configurations
+        stats = speculation.get_speculation_stats()
+        self.assertEqual((stats["stored"], stats["misses"], stats["hit_rate"]), (1, 0, 0.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+import json
+import os
+import sys
+
+import httpx
+
+# Add src to sys.path to allow direct import of src modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import genai_client
+from src.llm_providers import OpenAICompatibleProvider
+from src.standin_server import StandInServer, canned_completion
+from src.question_module import parse_questions_from_text
+
+class TestStandInServer(unittest.TestCase):
+
+    def setUp(self):
+        self.client = httpx.Client(timeout=5)
+        self.addCleanup(self.client.close)
+
+    def _start(self, **config):
+        server = StandInServer(**config).start()
+        self.addCleanup(server.stop)
+        return server
+
+    def test_canned_questions_are_deterministic(self):
+        messages = [{"role": "user", "content": "Generate 3 interview questions for a candidate applying for the role of 'Data Engineer'."}]
+        text = canned_completion(messages)
+        self.assertEqual(text, canned_completion(messages))
+        self.assertEqual(len(parse_questions_from_text(text)), 3)
+
+    def test_canned_feedback_is_json(self):
+        messages = [{"role": "system", "content": "Respond with 'score', 'strengths', 'areas_for_improvement', 'sample_answer'."}]
+        feedback = json.loads(canned_completion(messages))
+        self.assertIn(feedback["score"], range(4, 10))
+
+    def test_completion_endpoint(self):
+        server = self._start()
+        response = self.client.post(f"{server.base_url}/chat/completions",
+                                    json={"model": "m", "messages": [{"role": "user", "content": "Hello"}]})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertTrue(data["choices"][0]["message"]["content"])
+        self.assertIn("total_tokens", data["usage"])
+
+    def test_streaming_endpoint(self):
+        server = self._start()
+        messages = [{"role": "user", "content": "Hello there"}]
+        deltas = []
+        with self.client.stream("POST", f"{server.base_url}/chat/completions",
+                                json={"model": "m", "messages": messages, "stream": True}) as response:
+            for line in response.iter_lines():
+                if line.startswith("data:") and line != "data: [DONE]":
+                    deltas.append(json.loads(line[5:])["choices"][0]["delta"]["content"])
+        self.assertGreater(len(deltas), 1)
+        self.assertEqual("".join(deltas), canned_completion(messages))
+
+    def test_error_injection(self):
+        server = self._start(error_rate=1.0, error_status=429)
+        response = self.client.post(f"{server.base_url}/chat/completions", json={"messages": []})
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.headers["Retry-After"], "1")
+
+    def test_latency_injection(self):
+        server = self._start(latency_ms=50)
+        response = self.client.post(f"{server.base_url}/chat/completions", json={"messages": []})
+        self.assertGreaterEqual(response.elapsed.total_seconds(), 0.05)
+
+    def test_genai_client_against_stand_in(self):
+        server = self._start()
+        provider = OpenAICompatibleProvider(api_key="", base_url=server.base_url)
+        messages = [{"role": "user", "content": "Generate 2 interview questions for a candidate applying for the role of 'QA'."}]
+        text = genai_client.generate_text(messages, provider=provider)
+        self.assertEqual(text, canned_completion(messages))
+        self.assertEqual("".join(genai_client.stream_text(messages, provider=provider)), text)
+
+if __name__ == '__main__':
+    unittest.main()
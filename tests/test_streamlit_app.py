@@ -4,6 +4,7 @@ import sys
 import os
 from datetime import datetime
 import json
+import threading
 
 # Add src to sys.path to allow direct import of streamlit_app
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -43,6 +44,7 @@ class MockStreamlit:
         self.stop = MagicMock()
         self.divider = MagicMock()
         self.expander = MagicMock(return_value=MagicMock(__enter__=MagicMock(), __exit__=MagicMock()))
+        self.empty = MagicMock()
         self.set_page_config = MagicMock()
         
         # Mock form and form elements
@@ -55,6 +57,7 @@ class MockStreamlit:
         
         self.select_slider = MagicMock()
         self.slider = MagicMock()
+        self.checkbox = MagicMock(return_value=False)
         self.button = MagicMock(return_value=False)  # Default to False for buttons
         
         # Create columns that return the right number based on the input
@@ -266,8 +269,8 @@ class TestStreamlitApp(unittest.TestCase):
     # For columns unpacking issues, our improved mock now returns the right number of columns
 
     # --- Test display_setup_page ---
-    @patch('src.streamlit_app.question_module.generate_questions')
-    def test_display_setup_page_generate_questions_success(self, mock_generate_questions):
+    @patch('src.streamlit_app.question_module.iter_questions')
+    def test_display_setup_page_generate_questions_success(self, mock_iter_questions):
         # Set up form submission
         mock_st.form_submit_button.return_value = True
         
@@ -283,7 +286,7 @@ class TestStreamlitApp(unittest.TestCase):
         mock_st.slider.return_value = 3
         
         # Generate questions result
-        mock_generate_questions.return_value = ["Q1", "Q2", "Q3"]
+        mock_iter_questions.return_value = (q for q in ["Q1", "Q2", "Q3"])
         
         # Test callback
         mock_go_to_interview = MagicMock()
@@ -296,6 +299,167 @@ class TestStreamlitApp(unittest.TestCase):
 
         # Check expected behavior
         self.assertEqual(mock_st.session_state["interview_config"]["job_role"], "Job Role")
-        mock_generate_questions.assert_called_once()
-        self.assertEqual(len(mock_st.session_state["questions"]), 3)
+        mock_iter_questions.assert_called_once()
+        self.assertTrue(mock_st.session_state["question_stream"].wait_for(3, timeout=5))
+        self.assertEqual(mock_st.session_state["questions"], ["Q1", "Q2", "Q3"])
         mock_st.success.assert_called_once()
+
+    @patch('src.streamlit_app.question_module.QuestionStream')
+    def test_display_setup_page_reuses_speculative_questions(self, mock_question_stream):
+        mock_st.text_input.side_effect = None
+        mock_st.text_input.return_value = "Job Role"
+        mock_st.text_area.side_effect = None
+        mock_st.text_area.return_value = "Job Description"
+        mock_st.select_slider.return_value = "Medium"
+        mock_st.slider.return_value = 5
+        mock_st.button.side_effect = None
+        mock_st.button.return_value = True
+        speculator = MagicMock()
+        speculator.take.return_value = MagicMock(questions=["Q1"], done=False)
+        mock_st.session_state["question_speculator"] = speculator
+
+        self.streamlit_app.display_setup_page(MagicMock())
+
+        config = {"job_role": "Job Role", "job_description": "Job Description", "difficulty": "Medium"}
+        speculator.update.assert_called_once_with(config, 5, None)
+        speculator.take.assert_called_once_with(config, 5, None)
+        mock_question_stream.assert_not_called()
+        self.assertEqual(mock_st.session_state["questions"], ["Q1"])
+
+    # --- Test display_interview_page ---
+    @patch('src.streamlit_app.background_evaluation.ENABLED', False)
+    @patch('src.streamlit_app.evaluation_module.classify_answer_quality', return_value="adequate")
+    @patch('src.streamlit_app.evaluation_module.stream_evaluation')
+    def test_display_interview_page_streams_feedback(self, mock_stream_evaluation, mock_classify):
+        mock_st.session_state["questions"] = ["Q1", "Q2"]
+        mock_st.session_state["interview_config"] = {"job_role": "Engineer"}
+        mock_st.form_submit_button.return_value = True
+        mock_st.text_area.side_effect = None
+        mock_st.text_area.return_value = "My answer"
+        final_feedback = {"score": 7, "strengths": "S", "areas_for_improvement": "A", "sample_answer": "SA"}
+        mock_stream_evaluation.return_value = iter([{"score": 7}, final_feedback])
+
+        self.streamlit_app.display_interview_page(MagicMock())
+
+        mock_stream_evaluation.assert_called_once_with("Q1", "My answer", {"job_role": "Engineer"})
+        mock_classify.assert_called_once_with("My answer", "Q1", wait=False)
+        mock_st.info.assert_any_call("**Quick assessment**: Adequate (local answer classifier)")
+        self.assertEqual(mock_st.empty.return_value.container.call_count, 2)
+        self.assertEqual(mock_st.session_state["responses"], ["My answer"])
+        self.assertEqual(mock_st.session_state["feedback"], [final_feedback])
+        self.assertEqual(mock_st.session_state["current_question_idx"], 1)
+        mock_st.rerun.assert_called()
+
+    @patch('src.streamlit_app.evaluation_module.stream_evaluation')
+    def test_display_interview_page_adapts_next_question_to_score(self, mock_stream_evaluation):
+        stream = MagicMock(spec=self.streamlit_app.question_module.AdaptiveInterview)
+        stream.questions = ["Q1"]
+        stream.difficulties = ["Medium"]
+        stream.done = False
+        stream.expected_count.return_value = 3
+        stream.advance.side_effect = lambda score: stream.questions.append("Harder Q2")
+        mock_st.session_state["question_stream"] = stream
+        mock_st.session_state["questions"] = stream.questions
+        mock_st.session_state["interview_config"] = {"job_role": "Engineer"}
+        mock_st.form_submit_button.return_value = True
+        mock_st.text_area.side_effect = None
+        mock_st.text_area.return_value = "My answer"
+        mock_stream_evaluation.return_value = iter([{"score": 9, "strengths": "S"}])
+
+        self.streamlit_app.display_interview_page(MagicMock())
+
+        mock_st.markdown.assert_any_call("*Difficulty: Medium*")
+        stream.advance.assert_called_once_with(9)
+        self.assertEqual(mock_st.session_state["current_question_idx"], 1)
+
+    @patch('src.streamlit_app.background_evaluation.ENABLED', True)
+    @patch('src.background_evaluation.evaluation_module.evaluate_response')
+    def test_display_interview_page_evaluates_in_background(self, mock_evaluate_response):
+        release = threading.Event()
+        final_feedback = {"score": 6, "strengths": "S", "areas_for_improvement": "A", "sample_answer": "SA"}
+        mock_evaluate_response.side_effect = lambda *args: release.wait(5) and final_feedback
+        mock_st.session_state["questions"] = ["Q1", "Q2"]
+        mock_st.session_state["interview_config"] = {"job_role": "Engineer"}
+        mock_st.form_submit_button.return_value = True
+        mock_st.text_area.side_effect = None
+        mock_st.text_area.return_value = "My answer"
+
+        self.streamlit_app.display_interview_page(MagicMock())
+
+        # Moved on before the evaluation finished
+        self.assertEqual(mock_st.session_state["current_question_idx"], 1)
+        self.assertEqual(mock_st.session_state["feedback"], [None])
+        evaluations = mock_st.session_state["evaluations"]
+        self.assertEqual(evaluations.pending(), [0])
+
+        release.set()
+        self.assertTrue(evaluations.wait(timeout=5))
+        mock_st.form_submit_button.return_value = False
+        self.streamlit_app.display_interview_page(MagicMock())
+        self.assertEqual(mock_st.session_state["feedback"], [final_feedback])
+        mock_evaluate_response.assert_called_once_with("Q1", "My answer", {"job_role": "Engineer"})
+
+    @patch('src.streamlit_app.database.save_interview', return_value=None)
+    @patch('src.streamlit_app.evaluation_module.generate_overall_performance', return_value=None)
+    def test_display_results_page_waits_for_outstanding_evaluations(self, mock_overall, mock_save):
+        evaluations = MagicMock()
+        evaluations.pending.return_value = [1]
+        evaluations.collect.side_effect = lambda feedback: feedback.__setitem__(1, {"score": 8})
+        mock_st.session_state["evaluations"] = evaluations
+        mock_st.session_state["interview_config"] = {"job_role": "Engineer", "difficulty": "Easy"}
+        mock_st.session_state["questions"] = ["Q1", "Q2"]
+        mock_st.session_state["responses"] = ["A1", "A2"]
+        mock_st.session_state["feedback"] = [{"score": 6}, None]
+
+        self.streamlit_app.display_results_page(MagicMock(), MagicMock())
+
+        evaluations.wait.assert_called_once_with()
+        mock_st.markdown.assert_any_call("**Average Score**: 7.0 / 10 (based on 2 evaluated questions)")
+
+    @patch('src.streamlit_app.evaluation_module.stream_evaluation')
+    @patch('src.streamlit_app.background_evaluation.BackgroundEvaluations.submit')
+    def test_display_interview_page_defers_evaluation_to_the_end(self, mock_submit, mock_stream_evaluation):
+        mock_st.session_state["questions"] = ["Q1", "Q2"]
+        mock_st.session_state["interview_config"] = {"job_role": "Engineer"}
+        mock_st.session_state["evaluate_at_end"] = True
+        mock_st.form_submit_button.return_value = True
+        mock_st.text_area.side_effect = None
+        mock_st.text_area.return_value = "My answer"
+
+        self.streamlit_app.display_interview_page(MagicMock())
+
+        mock_submit.assert_not_called()
+        mock_stream_evaluation.assert_not_called()
+        self.assertEqual(mock_st.session_state["responses"], ["My answer"])
+        self.assertEqual(mock_st.session_state["current_question_idx"], 1)
+
+    @patch('src.streamlit_app.evaluation_module.generate_overall_performance', return_value=None)
+    @patch('src.streamlit_app.evaluation_module.evaluate_responses')
+    def test_display_results_page_evaluates_all_answers_at_end(self, mock_evaluate_responses, mock_overall):
+        mock_evaluate_responses.return_value = [{"score": 6}, {"score": 8}]
+        mock_st.session_state["evaluate_at_end"] = True
+        mock_st.session_state["interview_config"] = {"job_role": "Engineer", "difficulty": "Easy"}
+        mock_st.session_state["questions"] = ["Q1", "Q2"]
+        mock_st.session_state["responses"] = ["A1", "A2"]
+        mock_st.session_state["feedback"] = [None, None]
+
+        self.streamlit_app.display_results_page(MagicMock(), MagicMock())
+
+        mock_evaluate_responses.assert_called_once_with(["Q1", "Q2"], ["A1", "A2"], {"job_role": "Engineer", "difficulty": "Easy"})
+        self.assertEqual(mock_st.session_state["feedback"], [{"score": 6}, {"score": 8}])
+        mock_st.markdown.assert_any_call("**Average Score**: 7.0 / 10 (based on 2 evaluated questions)")
+
+    def test_display_interview_page_waits_for_question_still_generating(self):
+        stream = MagicMock(questions=["Q1"], done=False)
+        stream.wait_for.side_effect = lambda count: stream.questions.append("Q2")
+        stream.expected_count.return_value = 3
+        mock_st.session_state["question_stream"] = stream
+        mock_st.session_state["questions"] = stream.questions
+        mock_st.session_state["current_question_idx"] = 1
+        mock_st.form_submit_button.return_value = False
+
+        self.streamlit_app.display_interview_page(MagicMock())
+
+        stream.wait_for.assert_called_once_with(2)
+        mock_st.progress.assert_called_once_with(2 / 3, text="Question 2 of 3")
+        mock_st.markdown.assert_any_call("### Question: Q2")
@@ -0,0 +1,75 @@
+import unittest
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+
+# Add src to sys.path to allow direct import of src modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import database, question_bank, question_pool, warm_up
+
+
+class TestWarmUp(unittest.TestCase):
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        db_path = os.path.join(tmpdir.name, "app.db")
+        for patcher in (
+            patch.object(database, 'DB_PATH', db_path),
+            patch.object(question_pool, 'DB_PATH', db_path),
+            patch.object(question_bank, 'DB_PATH', db_path),
+            patch.object(question_pool, 'ENABLED', True),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        database.init_db()
+        user_id = database.create_user("warm", "warm@example.com", "pass")
+        interviews = [("Data Engineer", "Medium", "Pipelines")] * 3 + [("data engineer ", "Medium", "")] \
+            + [("Designer", "Easy", "")] * 2 + [("Tester", "Hard", "")]
+        for role, difficulty, description in interviews:
+            database.save_interview(user_id, role, description, difficulty, ["Q?"], [], [])
+
+    def test_top_configs_merges_role_spellings(self):
+        configs = warm_up.top_configs(2)
+        self.assertEqual([(c["job_role"], c["difficulty"], c["count"]) for c in configs],
+                         [("Data Engineer", "Medium", 4), ("Designer", "Easy", 2)])
+        self.assertEqual(configs[0]["job_description"], "Pipelines")
+
+    @patch('src.question_module.generate_text')
+    def test_warm_up_fills_pools_within_budget(self, mock_generate_text):
+        mock_generate_text.return_value = "\n".join(f"{i}. Warm question {i}?" for i in range(1, 31))
+        summary = warm_up.warm_up(top_n=3, max_calls=2)
+
+        self.assertEqual(mock_generate_text.call_count, 2)
+        self.assertEqual((summary["configs"], summary["warmed"], summary["calls"]), (3, 2, 2))
+        data_engineer = {"job_role": "Data Engineer", "difficulty": "Medium", "job_description": "Pipelines"}
+        self.assertEqual(question_pool.pool_size(question_pool.find_pool(data_engineer)), 30)
+        self.assertIsNone(question_pool.find_pool({"job_role": "Tester", "difficulty": "Hard"}))
+
+        # Full pools cost nothing on the next run
+        mock_generate_text.reset_mock()
+        self.assertEqual(warm_up.warm_up(top_n=2, max_calls=5)["calls"], 0)
+        mock_generate_text.assert_not_called()
+
+    @patch('src.question_module.generate_text')
+    def test_warm_up_fills_bank_when_pools_disabled(self, mock_generate_text):
+        mock_generate_text.side_effect = [
+            "\n".join(f"{i}. Banked {batch}-{i}?" for i in range(1, 11)) for batch in range(10)
+        ]
+        with patch.object(question_pool, 'ENABLED', False), patch.object(question_bank, 'ENABLED', True):
+            summary = warm_up.warm_up(top_n=1, max_calls=10)
+        config = {"job_role": "Data Engineer", "difficulty": "Medium", "job_description": "Pipelines"}
+        self.assertEqual(question_bank.count_questions(config), question_bank.TARGET_SIZE)
+        self.assertEqual(summary["calls"], question_bank.TARGET_SIZE // question_bank.REFILL_BATCH)
+
+    @patch('src.question_module.generate_text')
+    def test_dry_run_makes_no_calls(self, mock_generate_text):
+        summary = warm_up.main(["--top", "2", "--dry-run"])
+        mock_generate_text.assert_not_called()
+        self.assertEqual((summary["configs"], summary["calls"]), (2, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()